@@ -12,8 +12,41 @@ CONFIG = {
     },
     # --- Runtime / pacing ---
     "runtime": {
-        "cycle_seconds": 120,         # GUI refresh + headless sleep between cycles
+        "cycle_seconds": 120,         # GUI refresh + headless period between cycle starts
+        "cycle_budget_seconds": None, # cycles longer than this count as over budget (None = cycle_seconds)
+        "overrun_policy": "skip",     # cycle ran past the next tick: "skip" | "coalesce" | "immediate"
         "manager_wait_seconds": 3,   # pause after Manager.Connect() before reading
+        # "summary": server-wide SummaryGet per symbol (reconnect each cycle)
+        # "pump":    persistent connection, exposure aggregated per client group
+        #            from the position pump and filtered by connection.manager_group
+        "manager_exposure_source": "summary",
+        # Background tick polling into a shared price table (data_access/price_feed.py);
+        # rows older than stale_seconds fall back to a synchronous tick read
+        "price_feed": {"enabled": False, "poll_seconds": 0.05, "stale_seconds": 10.0},
+        # Skip indicators/gating for symbols whose manager net (lots), terminal position
+        # (lots) and mid (relative move) are within these epsilons of the last
+        # computed decision and whose newest trend bar is unchanged; legs that tried
+        # to trade are always recomputed. Costs one single-bar read per symbol.
+        "change_detection": {"enabled": False, "net_epsilon": 0.0, "position_epsilon": 0.0,
+                             "mid_rel_epsilon": 0.0002},
+        # Write exposure tables, account metrics and the daily summary on a worker after
+        # the orders are out (the worker makes no MT5 calls); the dashboards' history
+        # sparklines then trail the decision table by up to one report
+        "deferred_reporting": False,
+        # Cycles of per-symbol net/position/target/PnL kept in memory for the dashboards' sparklines
+        "history_cycles": 240,
+        # Per-symbol execution breaker: consecutive order failures of one retcode class
+        # (market closed, off quotes, no money, invalid, transient) pause the symbol with
+        # exponential backoff, then one half-open probe (trade_logic/breaker.py). Opt-in
+        "circuit_breaker": {"enabled": False, "max_backoff_seconds": 3600.0},
+        # Token bucket in front of every order_send, shared per terminal account; risk-guard
+        # closes jump the queue. Orders still waiting after max_wait_seconds are not sent. Opt-in
+        "order_rate_limit": {"enabled": False, "per_second": 20.0, "burst": 40.0,
+                             "per_symbol_per_second": None, "per_symbol_burst": 2.0,
+                             "max_wait_seconds": 5.0},
+        # TradingEngine.acycle(): per-symbol tick / symbol info / bar reads run concurrently
+        # on a dedicated pool of this many threads (the sync cycle() is unaffected)
+        "async_reads": {"max_workers": 8},
     },
     
     # --- Trade Management ---
@@ -35,6 +68,15 @@ CONFIG = {
         "close_on_opposite_trend": False,
         "allow_trades_on_neutral_trend": True,
         "allow_trades_on_opposite_trend": True,
+
+        # Execution ordering: approved legs go out largest USD notional first.
+        # With a cap, the rest are queued and re-decided next cycle (0 = no cap).
+        "max_legs_per_cycle": 0,
+
+        # Lot rounding of each delta to the min lot: "floor" drops sub-lot remainders;
+        # "nearest" rounds each leg; "joint" picks up/down for all legs together so the
+        # remainders net out per currency (residual reported as payload["residual_usd"])
+        "lot_rounding": "floor",
     },
 
     # --- Risk Management ---
@@ -44,6 +86,15 @@ CONFIG = {
         "daily_loss_limit": -5000.0,  # Daily loss limit in account currency
         "max_loss_per_trade": 2000.0, # Safety cap used by margin/risk guards
         "auto_close_on_daily_loss_limit": False,
+
+        # Portfolio pre-trade limits, evaluated once per cycle over all legs.
+        # None/0 disables a limit. USD figures are projected (current + delta).
+        "max_net_usd_per_currency": None,   # default net cap for every currency
+        "currency_net_usd_caps": {},        # per-currency overrides, e.g. {"JPY": 2_000_000}
+        "max_gross_usd_exposure": None,     # portfolio gross notional
+        "max_projected_margin": None,       # absolute, account currency
+        "max_margin_pct_of_equity": None,   # e.g. 0.5 -> projected margin <= 50% equity
+        "margin_cache_seconds": 3600,       # margin-per-lot table refresh
     },
 
     # --- Indicator Settings (trend filters only) ---
@@ -73,9 +124,26 @@ CONFIG = {
         
     # --- Files / Outputs ---
     "outputs": {
-        "csv_dir_by_date": True
+        "csv_dir_by_date": True,
+        # SQLite (WAL) store mirroring trades/rejections/metrics/summaries; None disables
+        # (e.g. "trade_store.sqlite3")
+        "sqlite_path": None,
+        # Rejections are run-length encoded per (symbol, reason); while a symbol
+        # stays blocked, a heartbeat row is written at most this often
+        "rejection_heartbeat_seconds": 900,
+        # Order intents are fsync'd here before each send and reconciled on
+        # restart; an unconfirmed intent blocks its symbol until resolved or
+        # older than intent_settle_seconds. None disables (e.g. "order_intents.jsonl")
+        "intent_journal_path": None,
+        "intent_settle_seconds": 30,
     },
     
+    # --- Structured logging ---
+    "logging": {
+        "queue": True,          # handlers run on a listener thread; callers only enqueue
+        "sample_every": {},     # e.g. {"cycle_done": 10} -> log every 10th event
+    },
+
     "routing": {
         # Convert non-USD crosses (e.g., EURJPY) into USD legs to match currency exposures
         "consolidate_to_usd": True,  # set False to keep trading original pairs
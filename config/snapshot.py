@@ -0,0 +1,384 @@
+"""
+Compiled, immutable configuration snapshot.
+
+`CONFIG` / `SYMBOL_CONFIG` stay the editable source of truth. The engine works
+from a `ConfigSnapshot` compiled from them: validated once, nested keys
+resolved into flat frozen records, per-symbol parameters (mapping, min lot,
+multiplier, caps) pre-merged. The records only depend on the standard
+library, so loading config never pulls in numpy or the MetaTrader5 package.
+
+`ConfigStore` watches the config files and swaps in a freshly compiled
+snapshot between cycles when they change on disk, so a running engine picks
+up edits without a restart. A broken edit is rejected and the previous
+snapshot stays live. Hot reload covers what the engine reads from the
+snapshot: trade_management, risk_management, routing, limit_orders,
+indicators, the symbol universe/mapping/metadata, and runtime price_feed,
+change_detection, deferred_reporting, circuit_breaker, order_rate_limit,
+async_reads and outputs.rejection_heartbeat_seconds. These are read once at
+startup from the module-level dicts and need a restart:
+
+    connection.*                       (main, TerminalClient)
+    runtime.cycle_seconds, cycle_budget_seconds, overrun_policy,
+        manager_wait_seconds, manager_exposure_source, history_cycles
+    outputs.sqlite_path, intent_journal_path, intent_settle_seconds
+    logging.*                          (trade_logging.logger)
+    symbols for the Manager side       (ManagerClient summaries, pump filter)
+
+    from config.snapshot import ConfigStore
+    store = ConfigStore.from_modules()
+    cfg = store.refresh()          # call between cycles
+    cfg.symbols["EURUSD"].min_lot
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import runpy
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+# trade_management.lot_rounding values understood by trade_logic.decision
+ROUNDING_MODES = ("floor", "nearest", "joint")
+
+
+class ConfigError(ValueError):
+    """Raised when CONFIG/SYMBOL_CONFIG fail validation."""
+
+
+# -------------------- frozen records --------------------
+
+@dataclass(frozen=True, slots=True)
+class SymbolParams:
+    symbol: str
+    terminal_symbol: str
+    min_lot: float           # metadata fallback; terminal volume_min wins at runtime
+    contract_size: float
+    pip_size: float
+    multiplier: float
+    max_position_size: float
+
+
+@dataclass(frozen=True, slots=True)
+class TradeParams:
+    follow_position: bool
+    multiplier: float
+    max_position_size: float
+    allow_trades_on_neutral_trend: bool
+    allow_trades_on_opposite_trend: bool
+    max_legs_per_cycle: int          # 0 = send every approved leg
+    lot_rounding: str                # one of ROUNDING_MODES
+
+
+@dataclass(frozen=True, slots=True)
+class RoutingParams:
+    consolidate_to_usd: bool
+    usd_pairs: Tuple[str, ...]
+    use_original_for_usd_pairs: bool
+    skip_below_min: bool
+
+
+@dataclass(frozen=True, slots=True)
+class LimitOrderParams:
+    use_limit_orders: bool
+    enable_partial_limit: bool
+    market_order_percentage: float
+    limit_offset_points: float
+
+
+@dataclass(frozen=True)
+class RiskLimits:
+    max_net_usd_per_currency: Optional[float] = None     # default cap for every currency
+    currency_net_usd_caps: Mapping[str, float] = field(default_factory=dict)  # per-currency overrides
+    max_gross_usd_exposure: Optional[float] = None        # portfolio gross notional (USD)
+    max_projected_margin: Optional[float] = None          # absolute, account currency
+    max_margin_pct_of_equity: Optional[float] = None      # e.g. 0.5 -> 50% of equity
+    margin_cache_seconds: float = 3600.0
+
+    @classmethod
+    def from_config(cls, risk_cfg: Mapping) -> "RiskLimits":
+        def _opt(key):
+            v = risk_cfg.get(key)
+            return None if v in (None, 0, 0.0) else float(v)
+
+        return cls(
+            max_net_usd_per_currency=_opt("max_net_usd_per_currency"),
+            currency_net_usd_caps={str(k).upper(): float(v) for k, v in (risk_cfg.get("currency_net_usd_caps") or {}).items()},
+            max_gross_usd_exposure=_opt("max_gross_usd_exposure"),
+            max_projected_margin=_opt("max_projected_margin"),
+            max_margin_pct_of_equity=_opt("max_margin_pct_of_equity"),
+            margin_cache_seconds=float(risk_cfg.get("margin_cache_seconds", 3600.0)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return any((
+            self.max_net_usd_per_currency is not None,
+            bool(self.currency_net_usd_caps),
+            self.max_gross_usd_exposure is not None,
+            self.max_projected_margin is not None,
+            self.max_margin_pct_of_equity is not None,
+        ))
+
+    def currency_cap(self, ccy: str) -> float:
+        cap = self.currency_net_usd_caps.get(ccy, self.max_net_usd_per_currency)
+        return float("inf") if cap is None else float(cap)
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    version: int
+    loaded_at: float
+    source: str
+    trade: TradeParams
+    routing: RoutingParams
+    limit_orders: LimitOrderParams
+    risk: RiskLimits
+    daily_loss_limit: float
+    auto_close_on_daily_loss_limit: bool
+    symbols: Mapping[str, SymbolParams]
+    currency_to_usd_pair: Mapping[str, str]
+    raw: Mapping[str, Any] = field(repr=False)  # deep copy of CONFIG for rarely-read keys
+
+    @property
+    def symbol_mapping(self) -> Mapping[str, str]:
+        return MappingProxyType({s: p.terminal_symbol for s, p in self.symbols.items()})
+
+    def params(self, symbol: str) -> SymbolParams:
+        """Resolved parameters; symbols outside the universe get trade-level defaults."""
+        p = self.symbols.get(symbol)
+        if p is not None:
+            return p
+        t = self.trade
+        return SymbolParams(symbol, symbol, 0.01, 100000.0, 0.0001, t.multiplier, t.max_position_size)
+
+
+# -------------------- compile / validate --------------------
+
+def _deep_freeze(obj):
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _deep_freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_deep_freeze(v) for v in obj)
+    return obj
+
+
+def compile_config(config: Mapping, symbol_config: Mapping, *, version: int = 0, source: str = "") -> ConfigSnapshot:
+    """Validate and compile the config dicts. Raises ConfigError listing every problem found."""
+    problems: list[str] = []
+
+    def _num(section: Mapping, key: str, default=None, *, lo=None, hi=None, name=None) -> float:
+        label = name or key
+        v = section.get(key, default)
+        try:
+            v = float(v)
+        except (TypeError, ValueError):
+            problems.append(f"{label}: expected a number, got {v!r}")
+            return float(default or 0.0)
+        if lo is not None and v < lo:
+            problems.append(f"{label}: {v} < {lo}")
+        if hi is not None and v > hi:
+            problems.append(f"{label}: {v} > {hi}")
+        return v
+
+    tm = config.get("trade_management", {}) or {}
+    rm = config.get("risk_management", {}) or {}
+    ro = config.get("routing", {}) or {}
+    lo = config.get("limit_orders", {}) or {}
+
+    use_fixed = bool(tm.get("use_fixed_multiplier", False))
+    mult = _num(tm, "fixed_multiplier" if use_fixed else "trade_size_multiplier", 1.0, lo=0.0)
+    max_pos = _num(tm, "max_position_size", 0.0, lo=0.0)
+    trade = TradeParams(
+        follow_position=bool(tm.get("follow_position", False)),
+        multiplier=mult,
+        max_position_size=max_pos,
+        allow_trades_on_neutral_trend=bool(tm.get("allow_trades_on_neutral_trend", True)),
+        allow_trades_on_opposite_trend=bool(tm.get("allow_trades_on_opposite_trend", True)),
+        max_legs_per_cycle=int(_num(tm, "max_legs_per_cycle", 0, lo=0)),
+        lot_rounding=str(tm.get("lot_rounding", "floor")),
+    )
+    if trade.lot_rounding not in ROUNDING_MODES:
+        problems.append(f"lot_rounding: expected one of {ROUNDING_MODES}, got {trade.lot_rounding!r}")
+    routing = RoutingParams(
+        consolidate_to_usd=bool(ro.get("consolidate_to_usd", False)),
+        usd_pairs=tuple(str(s).upper() for s in ro.get("usd_pairs", ())),
+        use_original_for_usd_pairs=bool(ro.get("use_original_for_usd_pairs", True)),
+        skip_below_min=bool(ro.get("skip_below_min", True)),
+    )
+    limit_orders = LimitOrderParams(
+        use_limit_orders=bool(lo.get("use_limit_orders", False)),
+        enable_partial_limit=bool(lo.get("enable_partial_limit", False)),
+        market_order_percentage=_num(lo, "market_order_percentage", 1.0, lo=0.0, hi=1.0),
+        limit_offset_points=_num(lo, "limit_offset_points", 0.0, lo=0.0),
+    )
+    daily_loss_limit = _num(rm, "daily_loss_limit", float("-inf"))
+    try:
+        risk = RiskLimits.from_config(rm)
+    except (TypeError, ValueError) as e:
+        problems.append(f"risk_management: {e}")
+        risk = RiskLimits()
+
+    mapping = symbol_config.get("symbol_mapping", {}) or {}
+    meta = symbol_config.get("metadata", {}) or {}
+    symbols: Dict[str, SymbolParams] = {}
+    for sym in symbol_config.get("symbols", []) or []:
+        if not isinstance(sym, str) or not sym:
+            problems.append(f"symbols: invalid entry {sym!r}")
+            continue
+        m = meta.get(sym, {}) or {}
+        name = f"metadata[{sym}]"
+        symbols[sym] = SymbolParams(
+            symbol=sym,
+            terminal_symbol=str(mapping.get(sym, sym)),
+            min_lot=_num(m, "min_lot", 0.01, lo=1e-8, name=f"{name}.min_lot"),
+            contract_size=_num(m, "contract_size", 100000.0, lo=1e-8, name=f"{name}.contract_size"),
+            pip_size=_num(m, "pip_size", 0.0001, lo=0.0, name=f"{name}.pip_size"),
+            multiplier=_num(m, "multiplier", mult, lo=0.0, name=f"{name}.multiplier"),
+            max_position_size=_num(m, "max_position_size", max_pos, lo=0.0, name=f"{name}.max_position_size"),
+        )
+
+    c2u: Dict[str, str] = {}
+    for ccy, pair in (symbol_config.get("currency_to_usd_pair", {}) or {}).items():
+        ccy, pair = str(ccy).upper(), str(pair).upper()
+        if pair not in (ccy + "USD", "USD" + ccy):
+            problems.append(f"currency_to_usd_pair[{ccy}]: {pair} is not a {ccy}/USD pair")
+            continue
+        c2u[ccy] = pair
+
+    if problems:
+        raise ConfigError("invalid configuration:\n  - " + "\n  - ".join(problems))
+
+    return ConfigSnapshot(
+        version=version,
+        loaded_at=time.time(),
+        source=source,
+        trade=trade,
+        routing=routing,
+        limit_orders=limit_orders,
+        risk=risk,
+        daily_loss_limit=daily_loss_limit,
+        auto_close_on_daily_loss_limit=bool(rm.get("auto_close_on_daily_loss_limit", False)),
+        symbols=MappingProxyType(symbols),
+        currency_to_usd_pair=MappingProxyType(c2u),
+        raw=_deep_freeze(copy.deepcopy(dict(config))),
+    )
+
+
+# -------------------- store / hot reload --------------------
+
+_HERE = os.path.dirname(__file__)
+DEFAULT_CONFIG_PATH = os.path.join(_HERE, "config.py")
+DEFAULT_SYMBOL_CONFIG_PATH = os.path.join(_HERE, "symbol_config.py")
+
+
+class ConfigStore:
+    """
+    Holds the live snapshot. `refresh()` is cheap (two stat calls, rate-limited)
+    and swaps in a recompiled snapshot when either config file changed.
+    Readers grab `store.current` once per cycle; the swap is a single
+    attribute rebind, so a cycle never sees a half-applied config.
+    """
+
+    def __init__(self, snapshot: ConfigSnapshot,
+                 paths: Sequence[str] = (DEFAULT_CONFIG_PATH, DEFAULT_SYMBOL_CONFIG_PATH),
+                 check_interval: float = 1.0):
+        self._current = snapshot
+        self._base = snapshot  # last compiled snapshot, before overrides
+        self._paths = tuple(paths)
+        self._mtimes = self._stat()
+        self._check_interval = float(check_interval)
+        self._last_check = time.monotonic()
+        self._overrides: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.last_error: Optional[str] = None
+
+    @classmethod
+    def from_modules(cls, **kwargs) -> "ConfigStore":
+        """Compile from the already-imported CONFIG/SYMBOL_CONFIG dicts."""
+        from config import CONFIG, SYMBOL_CONFIG
+        return cls(compile_config(CONFIG, SYMBOL_CONFIG, source="modules"), **kwargs)
+
+    @property
+    def current(self) -> ConfigSnapshot:
+        return self._current
+
+    @property
+    def base(self) -> ConfigSnapshot:
+        """The snapshot as compiled from the config files, without overrides."""
+        return self._base
+
+    def _stat(self) -> Tuple[float, ...]:
+        out = []
+        for p in self._paths:
+            try:
+                out.append(os.stat(p).st_mtime_ns)
+            except OSError:
+                out.append(0)
+        return tuple(out)
+
+    def _load_from_disk(self) -> ConfigSnapshot:
+        cfg = runpy.run_path(self._paths[0])["CONFIG"]
+        sym = runpy.run_path(self._paths[1])["SYMBOL_CONFIG"] if len(self._paths) > 1 else {}
+        return compile_config(cfg, sym, version=self._current.version + 1, source="disk")
+
+    def refresh(self, force: bool = False) -> ConfigSnapshot:
+        """Reload if the files changed; return the snapshot to use for the next cycle."""
+        now = time.monotonic()
+        if not force and now - self._last_check < self._check_interval:
+            return self._current
+        self._last_check = now
+        mtimes = self._stat()
+        if not force and mtimes == self._mtimes:
+            return self._current
+        with self._lock:
+            self._mtimes = mtimes
+            try:
+                base = self._load_from_disk()
+                snap = self._apply_overrides(base)
+            except Exception as e:  # keep the last good snapshot
+                self.last_error = str(e)
+                return self._current
+            self.last_error = None
+            self._base = base
+            self._current = snap
+        return snap
+
+    def override(self, section: str, **fields) -> ConfigSnapshot:
+        """
+        Replace fields of one frozen section (e.g. `override("routing", consolidate_to_usd=False)`).
+        Overrides are pinned over every file reload until `clear_override` drops
+        them; the engine sees them from its next cycle.
+        """
+        with self._lock:
+            self._overrides.setdefault(section, {}).update(fields)
+            self._current = self._apply_overrides(self._base)
+            return self._current
+
+    def clear_override(self, section: Optional[str] = None, *fields: str) -> ConfigSnapshot:
+        """
+        Drop overrides so the file values apply again: all of them, one section,
+        or only the named fields of a section.
+        """
+        with self._lock:
+            if section is None:
+                self._overrides.clear()
+            elif fields:
+                sec = self._overrides.get(section, {})
+                for f in fields:
+                    sec.pop(f, None)
+                if not sec:
+                    self._overrides.pop(section, None)
+            else:
+                self._overrides.pop(section, None)
+            self._current = self._apply_overrides(self._base)
+            return self._current
+
+    def _apply_overrides(self, snap: ConfigSnapshot) -> ConfigSnapshot:
+        if not self._overrides:
+            return snap
+        changes = {sec: replace(getattr(snap, sec), **f) for sec, f in self._overrides.items()}
+        return replace(snap, **changes)
@@ -1,3 +1,4 @@
 from .data_access import ManagerClient, TerminalClient
+from .exposure import GroupExposureAggregator, group_matches
 
-__all__ = ["ManagerClient", "TerminalClient"]
+__all__ = ["ManagerClient", "TerminalClient", "GroupExposureAggregator", "group_matches"]
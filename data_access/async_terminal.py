@@ -0,0 +1,86 @@
+"""
+Awaitable terminal reads.
+
+`AsyncTerminalClient` wraps a `TerminalClient` and runs its blocking MT5 IPC
+calls on a dedicated thread pool of `max_workers` threads, so an event loop
+can await them and the independent per-symbol reads (tick, symbol info, bars)
+overlap instead of running one after another. At most `max_workers` calls
+are in flight at once; the rest wait in the pool's queue.
+
+Order sends are deliberately not wrapped: they stay on the engine's
+synchronous path behind the rate limiter, intent journal and breakers.
+
+    aterm = AsyncTerminalClient(TerminalClient(), max_workers=8)
+    snap = await aterm.read_snapshot(["EURUSD.ecn", "GBPUSD.ecn"], bars=300, timeframe=5)
+    snap.ticks["EURUSD.ecn"], snap.rates["GBPUSD.ecn"], snap.positions
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ReadSnapshot:
+    """Read-side terminal state for one cycle, keyed by terminal symbol (None = read failed)."""
+    ticks: Dict[str, Any]
+    infos: Dict[str, Any]
+    rates: Dict[str, Any]
+    positions: Optional[Tuple] = None
+
+
+class AsyncTerminalClient:
+    def __init__(self, terminal, max_workers: int = 8):
+        self.term = terminal
+        self.max_workers = max(1, int(max_workers))
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="mt5-read")
+
+    async def _call(self, fn: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+    async def _each(self, fn: Callable, symbols: list, *args) -> Dict[str, Any]:
+        """fn(symbol, *args) for every symbol concurrently; a failing read yields None."""
+        results = await asyncio.gather(*(self._call(fn, s, *args) for s in symbols), return_exceptions=True)
+        return {s: None if isinstance(r, Exception) else r for s, r in zip(symbols, results)}
+
+    # -------- single reads --------
+
+    async def symbol_info(self, symbol: str):
+        return await self._call(self.term.symbol_info, symbol)
+
+    async def symbol_info_tick(self, symbol: str):
+        return await self._call(self.term.symbol_info_tick, symbol)
+
+    async def copy_rates_from_pos(self, symbol: str, timeframe: int, start: int, count: int):
+        return await self._call(self.term.copy_rates_from_pos, symbol, timeframe, start, count)
+
+    async def positions_get(self):
+        return await self._call(self.term.positions_get)
+
+    async def orders_get(self):
+        return await self._call(self.term.orders_get)
+
+    async def account_info(self):
+        return await self._call(self.term.account_info)
+
+    # -------- batch --------
+
+    async def read_snapshot(self, symbols: Iterable[str], *, bars: int, timeframe: int,
+                            ticks: bool = True) -> ReadSnapshot:
+        """Ticks (unless ticks=False), symbol info and the last `bars` bars of every symbol, plus positions."""
+        symbols = list(dict.fromkeys(symbols))
+        tick_map, infos, rates, positions = await asyncio.gather(
+            self._each(self.term.symbol_info_tick, symbols) if ticks else asyncio.sleep(0, {}),
+            self._each(self.term.symbol_info, symbols),
+            self._each(self.term.copy_rates_from_pos, symbols, timeframe, 0, bars),
+            self.positions_get(),
+        )
+        return ReadSnapshot(tick_map, infos, rates, tuple(positions or ()))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -10,6 +10,7 @@ import MetaTrader5 as mt5
 
 from config import SYMBOL_CONFIG
 from config import CONFIG
+from data_access.rate_limit import OrderRateLimiter, order_rate_limiter, THROTTLED
 
 
 class ManagerClient:
@@ -56,6 +57,15 @@ class ManagerClient:
         return exposure_rows
 
 
+def net_lots_by_symbol(positions) -> dict:
+    """Net lots per terminal symbol from a positions_get() result."""
+    by_term = {}
+    for p in positions or ():
+        by_term[p.symbol] = by_term.get(p.symbol, 0.0) + (
+            p.volume if p.type == mt5.POSITION_TYPE_BUY else -p.volume)
+    return by_term
+
+
 class TerminalClient:
     """Thin wrapper over MetaTrader5 terminal functions used by the engine."""
 
@@ -80,6 +90,10 @@ class TerminalClient:
         net = sum(p.volume if p.type == mt5.POSITION_TYPE_BUY else -p.volume for p in positions)
         return round(net, 2)
 
+    def net_positions(self, positions=None) -> dict:
+        """Net lots per terminal symbol for the whole book, from one positions_get() (or an earlier result)."""
+        return net_lots_by_symbol(mt5.positions_get() if positions is None else positions)
+
     def get_mid_price(self, symbol: str):
         term_symbol = SYMBOL_CONFIG["symbol_mapping"].get(symbol, symbol)
         tick = mt5.symbol_info_tick(term_symbol)
@@ -94,7 +108,24 @@ class TerminalClient:
     def orders_get(self):
         return mt5.orders_get()
 
-    def order_send(self, request):
+    @property
+    def rate_limiter(self) -> OrderRateLimiter:
+        """Process-wide order limiter shared by every client of this account."""
+        return order_rate_limiter(str(CONFIG["connection"]["terminal_login"]))
+
+    def configure_rate_limit(self, cfg: dict) -> None:
+        self.rate_limiter.configure(
+            float(cfg.get("per_second", 20.0)), float(cfg.get("burst", 40.0)),
+            per_symbol_per_second=cfg.get("per_symbol_per_second"),
+            per_symbol_burst=float(cfg.get("per_symbol_burst", 2.0)),
+            max_wait=float(cfg.get("max_wait_seconds", 5.0)),
+            enabled=bool(cfg.get("enabled", False)),
+        )
+
+    def order_send(self, request, lane: str = "normal"):
+        """Rate-limited order_send; lane "risk" pre-empts "normal" and is never held back, a "normal" order past max wait gets THROTTLED."""
+        if self.rate_limiter.acquire(request.get("symbol"), lane) is None:
+            return THROTTLED
         return mt5.order_send(request)
 
     def symbol_info(self, symbol):
@@ -103,5 +134,14 @@ class TerminalClient:
     def symbol_info_tick(self, symbol):
         return mt5.symbol_info_tick(symbol)
 
+    def copy_rates_from_pos(self, symbol, timeframe, start, count):
+        return mt5.copy_rates_from_pos(symbol, timeframe, start, count)
+
+    def account_info(self):
+        return mt5.account_info()
+
+    def order_calc_margin(self, action, symbol, volume, price):
+        return mt5.order_calc_margin(action, symbol, volume, price)
+
     def select_symbol(self, symbol, select=True):
         return mt5.symbol_select(symbol, select)
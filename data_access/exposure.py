@@ -0,0 +1,203 @@
+"""
+Manager-group filtered exposure, maintained incrementally from the position pump.
+
+`ManagerClient.get_net_positions` reads server-wide `SummaryGet` per symbol,
+which can't be scoped to client groups. `GroupExposureAggregator` is a
+position sink (OnPositionAdd/Update/Delete) that keeps per-group, per-symbol
+buy/sell volumes up to date as positions change, so filtered totals are
+served in O(groups x symbols) without rescanning positions.
+
+Group masks follow MT5 conventions: comma-separated patterns with `*`
+wildcards, `!` to exclude — e.g. "real\\A-book\\*,!*\\test*".
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from fnmatch import fnmatchcase
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# MT5 Manager: position Volume is in 1/10000 lot, Action 0=buy 1=sell
+VOLUME_DIV = 10000.0
+POSITION_BUY = 0
+
+
+def group_matches(group: str, mask: str) -> bool:
+    """MT5-style group mask: comma-separated, `*` wildcard, `!` negation (exclusions win)."""
+    included = False
+    for raw in (mask or "*").split(","):
+        pat = raw.strip()
+        if not pat:
+            continue
+        if pat.startswith("!"):
+            if fnmatchcase(group.lower(), pat[1:].lower()):
+                return False
+        elif fnmatchcase(group.lower(), pat.lower()):
+            included = True
+    return included
+
+
+class GroupExposureAggregator:
+    """
+    Position- and user-pump sink. Subscribe it (`PositionSubscribe`,
+    `UserSubscribe`) first, then `seed` with the current positions, so nothing
+    changing in between is missed; pump callbacks may arrive on the SDK thread.
+    """
+
+    def __init__(self, group_of: Callable[[int], Optional[str]], symbols: Optional[Iterable[str]] = None):
+        """
+        group_of: login -> group name (e.g. lambda l: manager.UserGet(l).Group); cached per login
+        symbols: optional universe filter; other symbols are ignored
+        """
+        self._group_of = group_of
+        self._symbols = set(symbols) if symbols is not None else None
+        self._lock = threading.Lock()
+        self._login_group: Dict[int, str] = {}
+        # ticket -> (login, group, symbol, buy_lots, sell_lots)
+        self._positions: Dict[int, Tuple[int, str, str, float, float]] = {}
+        # tickets the pump touched while a seed is in flight; the seed must not override them
+        self._pumped: Optional[set] = None
+        # group -> symbol -> [buy_lots, sell_lots, positions]
+        self._totals: Dict[str, Dict[str, List[float]]] = {}
+        self._mask_cache: Dict[str, Tuple[str, ...]] = {}
+
+    # -------- pump sink --------
+
+    def OnPositionAdd(self, position) -> None:
+        self._apply(position, pumped=True)
+
+    def OnPositionUpdate(self, position) -> None:
+        self._apply(position, pumped=True)
+
+    def OnPositionDelete(self, position) -> None:
+        ticket = int(getattr(position, "Position"))
+        with self._lock:
+            if self._pumped is not None:
+                self._pumped.add(ticket)
+            self._remove(ticket)
+
+    def OnUserUpdate(self, user) -> None:
+        """Group moves re-bucket the login's open positions."""
+        login = int(getattr(user, "Login"))
+        group = getattr(user, "Group", None)
+        with self._lock:
+            self._login_group.pop(login, None)
+            if group is None:
+                return
+            self._login_group[login] = str(group)
+            moved = [(t, p) for t, p in self._positions.items() if p[0] == login and p[1] != group]
+            for ticket, (_, _, symbol, buy, sell) in moved:
+                self._remove(ticket)
+                self._add(ticket, login, str(group), symbol, buy, sell)
+
+    def OnUserDelete(self, user) -> None:
+        with self._lock:
+            self._login_group.pop(int(getattr(user, "Login")), None)
+
+    def seed(self, positions: Iterable) -> None:
+        """
+        Load a full position list (e.g. PositionGetByGroup) after subscribing.
+        Tickets the pump has already added, updated or deleted are left as the pump has them.
+        """
+        with self._lock:
+            self._pumped = set()
+        try:
+            for p in positions or ():
+                self._apply(p, pumped=False)
+        finally:
+            with self._lock:
+                self._pumped = None
+
+    # -------- internals --------
+
+    def _group(self, login: int) -> str:
+        """Cached group of `login`; a miss calls group_of (a Manager round-trip), so never hold the lock."""
+        g = self._login_group.get(login)
+        if g is None:
+            try:
+                g = self._group_of(login) or ""
+            except Exception:
+                g = ""
+            with self._lock:
+                g = self._login_group.setdefault(login, g)  # a concurrent OnUserUpdate wins
+        return g
+
+    def _remove(self, ticket: int) -> None:
+        old = self._positions.pop(ticket, None)
+        if old is None:
+            return
+        _, group, symbol, buy, sell = old
+        t = self._totals[group][symbol]
+        t[0] -= buy
+        t[1] -= sell
+        t[2] -= 1
+        if t[2] <= 0:
+            del self._totals[group][symbol]
+            if not self._totals[group]:
+                del self._totals[group]
+
+    def _add(self, ticket: int, login: int, group: str, symbol: str, buy: float, sell: float) -> None:
+        if group not in self._totals:
+            self._mask_cache.clear()  # new group may match cached masks
+        t = self._totals.setdefault(group, {}).setdefault(symbol, [0.0, 0.0, 0])
+        t[0] += buy
+        t[1] += sell
+        t[2] += 1
+        self._positions[ticket] = (login, group, symbol, buy, sell)
+
+    def _apply(self, position, pumped: bool) -> None:
+        ticket = int(getattr(position, "Position"))
+        symbol = str(getattr(position, "Symbol"))
+        if self._symbols is not None and symbol not in self._symbols:
+            return
+        lots = float(getattr(position, "Volume", 0)) / VOLUME_DIV
+        is_buy = int(getattr(position, "Action", POSITION_BUY)) == POSITION_BUY
+        buy, sell = (lots, 0.0) if is_buy else (0.0, lots)
+        login = int(getattr(position, "Login", 0))
+        group = self._group(login)
+        with self._lock:
+            if self._pumped is not None:
+                if not pumped and ticket in self._pumped:
+                    return  # the pump's view is newer than the snapshot
+                if pumped:
+                    self._pumped.add(ticket)
+            group = self._login_group.get(login, group)  # moved while we resolved it
+            self._remove(ticket)
+            self._add(ticket, login, group, symbol, buy, sell)
+
+    def _groups_for(self, mask: str) -> Tuple[str, ...]:
+        hit = self._mask_cache.get(mask)
+        if hit is None:
+            hit = tuple(g for g in self._totals if group_matches(g, mask))
+            self._mask_cache[mask] = hit
+        return hit
+
+    # -------- queries --------
+
+    def groups(self) -> List[str]:
+        with self._lock:
+            return sorted(self._totals)
+
+    def net_rows(self, mask: str = "*") -> List[dict]:
+        """
+        Filtered totals in the same shape as ManagerClient.get_net_positions:
+          symbol, net_volume, positions, buy_volume, sell_volume, timestamp
+        """
+        agg: Dict[str, List[float]] = {}
+        with self._lock:
+            for g in self._groups_for(mask):
+                for sym, (buy, sell, n) in self._totals.get(g, {}).items():
+                    a = agg.setdefault(sym, [0.0, 0.0, 0])
+                    a[0] += buy
+                    a[1] += sell
+                    a[2] += n
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return [{
+            "symbol": sym,
+            "net_volume": round(buy - sell, 2),
+            "positions": int(n),
+            "buy_volume": round(buy, 2),
+            "sell_volume": round(sell, 2),
+            "timestamp": now,
+        } for sym, (buy, sell, n) in agg.items()]
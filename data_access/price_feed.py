@@ -0,0 +1,151 @@
+"""
+Background tick feed with a shared latest-price table.
+
+A daemon thread polls `symbol_info_tick` for every mapped terminal symbol and
+publishes a compact `FeedTable` (bid/ask/time NumPy arrays). Each sweep
+builds a new table and swaps the reference, so readers (engine, consolidation,
+GUIs) never take a lock and never see a half-updated row.
+
+`time` is when the current tick was first received, on the feed's own clock,
+not the tick's server timestamp: MT5 stamps ticks in trade-server time, whose
+offset from local epoch (often +2/+3 h) would otherwise make every age
+meaningless. A tick counts as new when its `time_msc` (else `time`, else its
+prices) changes.
+
+    feed = PriceFeed(terminal, ["EURUSD.ecn", "USDJPY.ecn"], poll_seconds=0.05)
+    feed.start()
+    feed.table.mid("EURUSD.ecn"); feed.table.stale(max_age=5.0)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class FeedTable:
+    """Immutable snapshot; row i belongs to symbols[i]. time is the local receive time (0 = never ticked)."""
+    symbols: tuple
+    index: Dict[str, int]
+    bid: np.ndarray
+    ask: np.ndarray
+    time: np.ndarray
+    updated_at: float
+
+    @classmethod
+    def empty(cls, symbols: Iterable[str]) -> "FeedTable":
+        syms = tuple(dict.fromkeys(symbols))
+        n = len(syms)
+        return cls(syms, {s: i for i, s in enumerate(syms)},
+                   np.zeros(n), np.zeros(n), np.zeros(n), 0.0)
+
+    def row(self, symbol: str) -> Optional[tuple]:
+        """(bid, ask, time) for a terminal symbol, None if not tracked or never ticked."""
+        i = self.index.get(symbol)
+        if i is None or self.bid[i] <= 0 or self.ask[i] <= 0:
+            return None
+        return float(self.bid[i]), float(self.ask[i]), float(self.time[i])
+
+    def mid(self, symbol: str) -> Optional[float]:
+        r = self.row(symbol)
+        return (r[0] + r[1]) / 2 if r else None
+
+    def age(self, now: Optional[float] = None) -> np.ndarray:
+        """Seconds since each symbol's last tick (inf when it never ticked)."""
+        now = time.time() if now is None else now
+        return np.where(self.time > 0, np.maximum(now - self.time, 0.0), np.inf)
+
+    def stale_mask(self, max_age: float, now: Optional[float] = None) -> np.ndarray:
+        return self.age(now) > max_age
+
+    def stale(self, max_age: float, now: Optional[float] = None) -> List[str]:
+        return [self.symbols[i] for i in np.nonzero(self.stale_mask(max_age, now))[0]]
+
+
+def tick_stamp(tick):
+    """What identifies a tick: time_msc, else time, else its prices."""
+    stamp = getattr(tick, "time_msc", None) or getattr(tick, "time", None)
+    return stamp if stamp else (tick.bid, tick.ask)
+
+
+class PriceFeed:
+    def __init__(self, terminal, symbols: Iterable[str], poll_seconds: float = 0.05,
+                 stale_seconds: float = 10.0, clock: Callable[[], float] = time.time):
+        """
+        terminal: TerminalClient (or anything with symbol_info_tick)
+        symbols: terminal symbols to track
+        """
+        self.term = terminal
+        self.poll_seconds = float(poll_seconds)
+        self.stale_seconds = float(stale_seconds)
+        self._clock = clock
+        self.table = FeedTable.empty(symbols)
+        self._stamps: Dict[str, object] = {}  # last tick stamp per symbol (poll thread only)
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -------- lifecycle --------
+
+    def start(self) -> "PriceFeed":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="price-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def set_symbols(self, symbols: Iterable[str]) -> None:
+        """Change the tracked universe; prices of symbols kept are carried over."""
+        old = self.table
+        new = FeedTable.empty(symbols)
+        for s, i in new.index.items():
+            j = old.index.get(s)
+            if j is not None:
+                new.bid[i], new.ask[i], new.time[i] = old.bid[j], old.ask[j], old.time[j]
+        self.table = new
+
+    # -------- polling --------
+
+    def poll_once(self) -> FeedTable:
+        """One sweep over all symbols; publishes and returns the new table."""
+        old = self.table
+        bid, ask, ts = old.bid.copy(), old.ask.copy(), old.time.copy()
+        now = self._clock()
+        for i, sym in enumerate(old.symbols):
+            try:
+                tick = self.term.symbol_info_tick(sym)
+            except Exception:
+                self.errors += 1
+                continue
+            if tick is None or not tick.bid or not tick.ask:
+                continue
+            bid[i], ask[i] = tick.bid, tick.ask
+            stamp = tick_stamp(tick)
+            if self._stamps.get(sym) != stamp:  # a new tick: age restarts from now
+                self._stamps[sym] = stamp
+                ts[i] = now
+        table = FeedTable(old.symbols, old.index, bid, ask, ts, now)
+        if self.table is old:  # set_symbols() during the sweep wins
+            self.table = table
+        return table
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            t0 = time.monotonic()
+            self.poll_once()
+            self._stop.wait(max(0.0, self.poll_seconds - (time.monotonic() - t0)))
@@ -0,0 +1,143 @@
+"""
+Per-cycle mid-price resolver.
+
+One `symbol_info_tick` read per symbol per cycle, memoized for the rest of
+the cycle. When a symbol has no usable tick, its mid is triangulated from the
+USD legs of its two currencies (`currency_to_usd_pair`), e.g.
+
+    EURJPY = EURUSD * USDJPY      (EUR→USD, then USD→JPY)
+    GBPCHF = GBPUSD * USDCHF
+
+instead of falling back to a slow, stale M1 `copy_rates_from_pos` call.
+With a background `PriceFeed`, fresh rows of its table are used instead of
+synchronous tick reads; stale or missing rows fall back to `symbol_info_tick`.
+Every quote carries its source ("tick" or "cross:EURUSD*USDJPY") and age in
+seconds. Age is measured on the local clock from when the resolver first saw
+the tick (a new `time_msc`), not from the tick's server timestamp, which is
+offset from local epoch by the broker's timezone; it is None the first time
+a tick is seen, since how long it sat on the server is unknown.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional
+
+from data_access.price_feed import tick_stamp
+
+
+@dataclass(frozen=True, slots=True)
+class Quote:
+    mid: float
+    source: str
+    age: Optional[float]
+
+    @property
+    def derived(self) -> bool:
+        return self.source != "tick"
+
+
+class PriceResolver:
+    def __init__(self, terminal, symbol_mapping: Mapping[str, str],
+                 currency_to_usd_pair: Mapping[str, str],
+                 clock: Callable[[], float] = time.time, feed=None):
+        self.term = terminal
+        self.feed = feed
+        self._map = symbol_mapping
+        self._c2u = currency_to_usd_pair
+        self._clock = clock
+        self._ticks: Dict[str, Optional[Quote]] = {}
+        self._quotes: Dict[str, Optional[Quote]] = {}
+        self._seen: Dict[str, tuple] = {}  # symbol -> (tick stamp, local time first seen), across cycles
+
+    def begin_cycle(self) -> None:
+        """Drop the previous cycle's snapshot."""
+        self._ticks.clear()
+        self._quotes.clear()
+
+    def rebind(self, symbol_mapping: Mapping[str, str], currency_to_usd_pair: Mapping[str, str]) -> None:
+        self._map = symbol_mapping
+        self._c2u = currency_to_usd_pair
+        self.begin_cycle()
+
+    # -------- snapshot --------
+
+    def _tick_quote(self, symbol: str) -> Optional[Quote]:
+        if symbol in self._ticks:
+            return self._ticks[symbol]
+        q = None
+        term_symbol = self._map.get(symbol, symbol)
+        row = self.feed.table.row(term_symbol) if self.feed is not None else None
+        if row is not None:
+            age = max(0.0, self._clock() - row[2])
+            if age <= self.feed.stale_seconds:
+                q = self._ticks[symbol] = Quote((row[0] + row[1]) / 2, "tick", age)
+                return q
+        try:
+            tick = self.term.symbol_info_tick(term_symbol)
+        except Exception:
+            tick = None
+        q = self._ticks[symbol] = self._from_tick(symbol, tick)
+        return q
+
+    def _from_tick(self, symbol: str, tick) -> Optional[Quote]:
+        if tick is None or not (tick.bid > 0 and tick.ask > 0):
+            return None
+        now = self._clock()
+        stamp = tick_stamp(tick)
+        seen = self._seen.get(symbol)
+        if seen is not None and seen[0] == stamp:
+            age = max(0.0, now - seen[1])
+        else:
+            age = None if seen is None else 0.0
+            self._seen[symbol] = (stamp, now)
+        return Quote((tick.bid + tick.ask) / 2, "tick", age)
+
+    def prime(self, ticks: Mapping[str, object]) -> None:
+        """Seed this cycle's snapshot with ticks already read (engine symbol -> tick or None)."""
+        for symbol, tick in ticks.items():
+            self._ticks[symbol] = self._from_tick(symbol, tick)
+
+    def _usd_leg(self, ccy: str) -> tuple[Optional[float], Optional[str], Optional[float]]:
+        """(USD per 1 unit of ccy, leg symbol, age) from the ccy's USD pair tick."""
+        if ccy == "USD":
+            return 1.0, None, 0.0
+        pair = self._c2u.get(ccy)
+        q = self._tick_quote(pair) if pair else None
+        if q is None:
+            return None, None, None
+        return (q.mid if pair.startswith(ccy) else 1.0 / q.mid), pair, q.age
+
+    def _derive(self, symbol: str) -> Optional[Quote]:
+        s = symbol.upper()
+        if len(s) != 6 or not s.isalpha():
+            return None
+        base, quote = s[:3], s[3:]
+        if symbol in (self._c2u.get(base), self._c2u.get(quote)):
+            return None  # a USD leg can't be triangulated from itself
+        rb, leg_b, age_b = self._usd_leg(base)
+        rq, leg_q, age_q = self._usd_leg(quote)
+        if rb is None or rq is None or rq <= 0:
+            return None
+        used = [(leg, age) for leg, age in ((leg_b, age_b), (leg_q, age_q)) if leg]
+        ages = [age for _, age in used]
+        age = None if None in ages else max(ages, default=0.0)
+        return Quote(rb / rq, "cross:" + "*".join(leg for leg, _ in used), age)
+
+    # -------- public --------
+
+    def quote(self, symbol: str) -> Optional[Quote]:
+        if symbol in self._quotes:
+            return self._quotes[symbol]
+        q = self._tick_quote(symbol) or self._derive(symbol)
+        self._quotes[symbol] = q
+        return q
+
+    def mid(self, symbol: str) -> Optional[float]:
+        q = self.quote(symbol)
+        return q.mid if q else None
+
+    def derived(self) -> Dict[str, Quote]:
+        """Quotes resolved by triangulation this cycle."""
+        return {s: q for s, q in self._quotes.items() if q is not None and q.derived}
@@ -0,0 +1,179 @@
+"""
+Process-wide order rate limiting.
+
+Every `TerminalClient.order_send` takes a token from its account's bucket
+(and, when configured, from a per-symbol bucket) before the request leaves,
+so bursts from liquidation, slicing or concurrent senders stay under the
+broker's throttle instead of coming back as mass rejections.
+
+Waiting senders are served by lane: while a "risk" order (risk-guard
+close) is waiting, no "normal" order (routine rebalance) takes a token. A
+risk order is never dropped: if its wait runs out it borrows the token, and
+the bucket's debt delays the normal orders after it.
+
+    limiter = order_rate_limiter("12345")          # one per account, off until configured
+    limiter.configure(per_second=10, burst=20)
+    waited = limiter.acquire("EURUSD.ecn", lane="normal")   # None on timeout
+
+`TerminalClient.order_send` returns `THROTTLED` (falsy, retcode None) when
+the wait ran out: the request never reached the terminal, unlike a None
+result whose fate is unknown.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+LANES = ("risk", "normal")   # highest priority first
+
+
+class _Throttled:
+    """order_send result for a request the limiter held back (never sent)."""
+    retcode = None
+    comment = "throttled by order rate limit"
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return "THROTTLED"
+
+
+THROTTLED = _Throttled()
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.stamp = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 = now)."""
+        self._refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def take(self) -> None:
+        self.tokens -= 1.0
+
+
+class OrderRateLimiter:
+    def __init__(self, per_second: float = 20.0, burst: float = 40.0, *,
+                 per_symbol_per_second: Optional[float] = None, per_symbol_burst: float = 2.0,
+                 max_wait: float = 5.0, enabled: bool = True,
+                 clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._waiting = {lane: 0 for lane in LANES}
+        self._symbols: Dict[str, TokenBucket] = {}
+        self._stats = {lane: {"orders": 0, "waited": 0, "wait_total": 0.0, "wait_max": 0.0, "timeouts": 0,
+                              "borrowed": 0}
+                       for lane in LANES}
+        self.configure(per_second, burst, per_symbol_per_second=per_symbol_per_second,
+                       per_symbol_burst=per_symbol_burst, max_wait=max_wait, enabled=enabled)
+
+    def configure(self, per_second: float = 20.0, burst: float = 40.0, *,
+                  per_symbol_per_second: Optional[float] = None, per_symbol_burst: float = 2.0,
+                  max_wait: float = 5.0, enabled: bool = True) -> None:
+        """(Re)apply limits; tokens left in the account bucket are kept."""
+        with self._cond:
+            now = self._clock()
+            old = getattr(self, "_account", None)
+            self._account = TokenBucket(per_second, burst, now)
+            if old is not None:
+                self._account.tokens = min(old.tokens, self._account.burst)
+            self.per_symbol_per_second = per_symbol_per_second
+            self.per_symbol_burst = float(per_symbol_burst)
+            self._symbols.clear()
+            self.max_wait = float(max_wait)
+            self.enabled = enabled
+            self._cond.notify_all()
+
+    def _symbol_bucket(self, symbol: Optional[str], now: float) -> Optional[TokenBucket]:
+        if not self.per_symbol_per_second or not symbol:
+            return None
+        b = self._symbols.get(symbol)
+        if b is None:
+            b = self._symbols[symbol] = TokenBucket(self.per_symbol_per_second, self.per_symbol_burst, now)
+        return b
+
+    def acquire(self, symbol: Optional[str] = None, lane: str = "normal",
+                timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Block until the order may go out; returns seconds waited, or None when
+        `timeout` (default max_wait) ran out first. The "risk" lane never gets
+        None: at its deadline it takes the token on credit.
+        """
+        if lane not in self._waiting:
+            raise ValueError(f"lane must be one of {LANES}, got {lane!r}")
+        if not self.enabled:
+            return 0.0
+        higher = LANES[:LANES.index(lane)]
+        start = self._clock()
+        deadline = start + (self.max_wait if timeout is None else timeout)
+        stats = self._stats[lane]
+        blocked = False
+        with self._cond:
+            self._waiting[lane] += 1
+            try:
+                while True:
+                    now = self._clock()
+                    sym = self._symbol_bucket(symbol, now)
+                    if any(self._waiting[h] for h in higher):
+                        wait = 0.05   # re-checked when a higher lane leaves (notify_all)
+                    else:
+                        wait = max(self._account.wait_time(now), sym.wait_time(now) if sym else 0.0)
+                        if wait <= 0.0:
+                            return self._grant(stats, sym, now - start if blocked else 0.0)
+                    if now + wait > deadline:
+                        if lane == LANES[0]:  # protective orders are never dropped
+                            stats["borrowed"] += 1
+                            return self._grant(stats, sym, now - start)
+                        stats["timeouts"] += 1
+                        return None
+                    blocked = True
+                    self._cond.wait(wait)
+            finally:
+                self._waiting[lane] -= 1
+                self._cond.notify_all()
+
+    def _grant(self, stats: dict, sym: Optional[TokenBucket], waited: float) -> float:
+        self._account.take()
+        if sym:
+            sym.take()
+        stats["orders"] += 1
+        if waited > 0:
+            stats["waited"] += 1
+            stats["wait_total"] += waited
+            stats["wait_max"] = max(stats["wait_max"], waited)
+        return waited
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {lane: {**s, "wait_total": round(s["wait_total"], 4), "wait_max": round(s["wait_max"], 4),
+                           "queued": self._waiting[lane]}
+                    for lane, s in self._stats.items()}
+
+
+_LIMITERS: Dict[str, OrderRateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def order_rate_limiter(account: str = "") -> OrderRateLimiter:
+    """The shared limiter for `account` (created disabled on first use; `configure` turns it on)."""
+    with _LIMITERS_LOCK:
+        lim = _LIMITERS.get(account)
+        if lim is None:
+            lim = _LIMITERS[account] = OrderRateLimiter(enabled=False)
+        return lim
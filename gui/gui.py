@@ -1,7 +1,9 @@
 """
 Tkinter GUI (refined)
 - Account panel: Balance, Equity, Margin, Profit (+ last refresh)
-- Exposure (USD by Symbol) table
+- Exposure (USD by Symbol) table, with net/PnL sparklines from the engine's in-memory history
+  (PNL is read before the cycle's orders, so fills appear one cycle later; with deferred
+  reporting the sparklines may trail the table by one report)
 - Pair Net Positions table
 - Trade Log (reads today's CSV) + Export
 - Buttons: export CCY tables, open logs folder
@@ -26,6 +28,8 @@ except Exception:  # pragma: no cover
     mt5 = None
 
 from trade_logging.logger import export_ccy_tables_from_gui
+from trade_logging.history import sparkline
+from trade_logic.decision import DecisionRow
 
 
 # ---------- helpers ----------
@@ -58,15 +62,17 @@ def _zebra_style(style: ttk.Style):
 # ---------- GUI ----------
 
 class TradingGUI:
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, store=None, history=None):
         self.root = root
+        self.store = store  # optional TradeStore: trade log read from SQLite instead of CSV
+        self.history = history  # optional ExposureHistory: sparkline columns
         self.root.title("Trading Dashboard")
         self.root.geometry("1400x850")
 
         self.style = ttk.Style(self.root)
         _zebra_style(self.style)
 
-        self.last_usd_rows: List[Dict[str, Any]] = []
+        self.last_usd_rows: List[DecisionRow] = []
         self.last_pair_rows: List[Dict[str, Any]] = []
 
         # --- account strip (row 0) ---
@@ -78,12 +84,13 @@ class TradingGUI:
         # --- Exposure (row 2) ---
         self.usd_columns = (
             "Symbol", "Net USD Position", "Trade Position", "Target Position",
-            "Trade Delta", "Trend", "Trend Strength", "RSI", "MACD", "Reason", "PNL"
+            "Trade Delta", "Trend", "Trend Strength", "RSI", "MACD", "Reason", "PNL", "Breaker",
+            "Net History", "PNL History",
         )
         self.usd_frame, self.usd_tree = self._build_labeled_tree(
             title="Exposure (USD by Symbol)",
             columns=self.usd_columns,
-            col_widths=(110, 130, 120, 120, 110, 130, 130, 80, 80, 220, 90),
+            col_widths=(110, 130, 120, 120, 110, 130, 130, 80, 80, 220, 90, 150, 170, 170),
         )
         self._place_section(self.usd_frame, row=2)
 
@@ -194,10 +201,10 @@ class TradingGUI:
     # ----- updates -----
 
     def update_from_engine(self, payload: Dict[str, Any]):
-        self._refresh_tree(self.usd_tree, payload.get("usd_rows", []), self.usd_columns, decimals={
+        self._refresh_tree(self.usd_tree, payload.get("usd_rows", []) or [], self.usd_columns, decimals={
             "Net USD Position": 2, "Trade Position": 2, "Target Position": 2, "Trade Delta": 2,
             "Trend Strength": 6, "RSI": 2, "MACD": 4, "PNL": 2,
-        })
+        }, cell=self._usd_cell)
         self._refresh_tree(self.pair_tree, payload.get("pair_rows", []), self.pair_columns, decimals={
             "Trades": 0, "Long": 2, "Short": 2, "Net Position": 2,
         })
@@ -210,22 +217,35 @@ class TradingGUI:
         trades_executed = payload.get("trades_executed", 0)
         status = payload.get("status")
         suffix = f" | Status: {status}" if status else ""
+        stale = payload.get("stale_prices") or []
+        if stale:
+            suffix += f" | Stale prices: {', '.join(stale[:5])}{'…' if len(stale) > 5 else ''}"
+        open_breakers = [s for s, b in (payload.get("breakers") or {}).items() if b.get("state") == "open"]
+        if open_breakers:
+            suffix += f" | Breakers open: {', '.join(open_breakers[:5])}{'…' if len(open_breakers) > 5 else ''}"
         self.summary.config(text=f"Trades Executed: {trades_executed}{suffix}")
         self._update_account_metrics()
         self.lbl_time.config(text=f"Last refresh: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-    def _refresh_tree(self, tree: ttk.Treeview, rows: List[Dict[str, Any]], columns: tuple, decimals: Dict[str, int]):
+    def _usd_cell(self, row: DecisionRow, col: str):
+        attr = DecisionRow.COLUMNS.get(col)
+        if attr is not None:
+            val = getattr(row, attr)
+            return val.capitalize() if col == "Trend" else val
+        if self.history is not None and col in ("Net History", "PNL History"):
+            return sparkline(self.history.series(row.symbol, "net" if col == "Net History" else "pnl"))
+        return ""
+
+    def _refresh_tree(self, tree: ttk.Treeview, rows: List[Any], columns: tuple, decimals: Dict[str, int],
+                      cell=lambda r, col: r.get(col, "")):
         for it in tree.get_children():
             tree.delete(it)
         for i, r in enumerate(rows):
             vals = []
             for col in columns:
-                val = r.get(col, "")
-                if col in decimals and isinstance(val, (int, float, str)):
-                    try:
-                        vals.append(_fmt(float(val), decimals[col]))
-                    except Exception:
-                        vals.append(val)
+                val = cell(r, col)
+                if col in decimals and isinstance(val, (int, float)):
+                    vals.append(_fmt(val, decimals[col]))
                 else:
                     vals.append(val if val is not None else "")
             tag = "odd" if i % 2 else "even"
@@ -235,7 +255,7 @@ class TradingGUI:
         path = _today_trade_log_path()
         for it in self.log_tree.get_children():
             self.log_tree.delete(it)
-        if not os.path.exists(path):
+        if self.store is None and not os.path.exists(path):
             return
         try:
             import csv
@@ -247,20 +267,24 @@ class TradingGUI:
                 "executed_price": "Price",
                 "reason": "Reason",
             }
-            with open(path, "r", newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for i, row in enumerate(reader):
-                    out = []
-                    for k in cols:
-                        v = row.get(k, "")
-                        if k in ("executed_volume", "executed_price") and v not in ("", None):
-                            try:
-                                v = _fmt(float(v), 2 if k == "executed_volume" else 5)
-                            except Exception:
-                                pass
-                        out.append(v)
-                    tag = "odd" if i % 2 else "even"
-                    self.log_tree.insert("", "end", values=out, tags=(tag,))
+            if self.store is not None:
+                since = datetime.now().strftime("%Y-%m-%d 00:00:00")
+                rows = list(reversed(self.store.recent("trades", limit=500, since=since)))
+            else:
+                with open(path, "r", newline="", encoding="utf-8") as f:
+                    rows = list(csv.DictReader(f))
+            for i, row in enumerate(rows):
+                out = []
+                for k in cols:
+                    v = row.get(k, "")
+                    if k in ("executed_volume", "executed_price") and v not in ("", None):
+                        try:
+                            v = _fmt(float(v), 2 if k == "executed_volume" else 5)
+                        except Exception:
+                            pass
+                    out.append(v)
+                tag = "odd" if i % 2 else "even"
+                self.log_tree.insert("", "end", values=out, tags=(tag,))
         except Exception as e:
             messagebox.showwarning("Trade Log", f"Failed to read trade log:\n{e}")
 
@@ -281,7 +305,7 @@ class TradingGUI:
     # ----- buttons -----
 
     def _export_usd_pair_csvs(self):
-        export_ccy_tables_from_gui(self.last_usd_rows, self.last_pair_rows)
+        export_ccy_tables_from_gui([r.as_dict() for r in self.last_usd_rows], self.last_pair_rows)
         messagebox.showinfo("Export", f"Exported to:\n{_today_folder()}")
 
     def _export_trade_log(self):
@@ -321,17 +345,24 @@ def run_gui(engine, refresh_seconds: int | None = None):
     if refresh_seconds is None:
         refresh_seconds = int(CONFIG.get("runtime", {}).get("cycle_seconds", 5))
 
+    from trade_logic.scheduler import CycleScheduler
+
+    rt = CONFIG.get("runtime", {})
+    sched = CycleScheduler(max(1, int(refresh_seconds)), budget=rt.get("cycle_budget_seconds"),
+                           policy=str(rt.get("overrun_policy", "skip")))
+
     root = tk.Tk()
-    app = TradingGUI(root)
+    app = TradingGUI(root, store=getattr(engine, "store", None), history=getattr(engine, "history", None))
 
     def _tick():
         try:
-            payload = engine.cycle()
+            payload = sched.step(engine.cycle)
             app.update_from_engine(payload)
         except Exception as e:
             root.title(f"Trading Dashboard - ERROR: {e}")
         finally:
-            root.after(max(1000, int(refresh_seconds) * 1000), _tick)
+            # next start on the fixed grid, not refresh_seconds after this cycle ended
+            root.after(int(sched.delay() * 1000), _tick)
 
     _tick()
     root.mainloop()
\ No newline at end of file
@@ -6,7 +6,10 @@ Run with:
 
 What it does:
 - Builds the engine (Manager + Terminal) using CONFIG/symbol_config
-- Shows account panel, USD-decisions table, Manager-pairs table, trade log
+- Shows account panel, USD-decisions table (with net/PnL mini-charts from the
+  engine's in-memory history), Manager-pairs table, trade log. PNL is read
+  before the cycle's orders go out, so fills show up one cycle later; with
+  runtime.deferred_reporting the mini-charts may trail the table by one report
 - Lets you run one cycle (preview) or run & execute trades
 - Auto-refresh and simple exports
 """
@@ -24,6 +27,7 @@ import streamlit as st
 from config import CONFIG, SYMBOL_CONFIG
 from data_access.data_access import ManagerClient, TerminalClient
 from trade_logic.engine import TradingEngine
+from trade_logging.history import sparkline
 from trade_logging import (
     get_logger, log_json, log_exception,
     export_ccy_tables_from_gui  # optional export helper if you want
@@ -57,8 +61,15 @@ def build_engine() -> TradingEngine:
     if not term.initialize():
         # show a friendly message, but keep UI alive
         log_json(get_logger("streamlit"), "terminal_init_failed")
+    # Optional SQLite store (recent rows are queried from it instead of CSVs)
+    store = None
+    sqlite_path = CONFIG.get("outputs", {}).get("sqlite_path")
+    if sqlite_path:
+        from trade_logging.store import TradeStore
+        store = TradeStore(sqlite_path)
+
     # Build engine: it expects a callable for manager rows + a terminal client
-    engine = TradingEngine(mgr.get_net_positions, term)  # type: ignore[arg-type]
+    engine = TradingEngine(mgr.get_net_positions, term, store=store)  # type: ignore[arg-type]
     log_json(log, "engine_built_streamlit", manager_server=f"{m_host}:{m_port}")
     return engine
 
@@ -73,6 +84,10 @@ def _today_folder() -> str:
 
 
 def _read_latest_trade_log() -> pd.DataFrame:
+    store = getattr(st.session_state.get("engine"), "store", None)
+    if store is not None:
+        since = datetime.now().strftime("%Y-%m-%d 00:00:00")
+        return pd.DataFrame(store.recent("trades", limit=1000, since=since))
     folder = _today_folder()
     # pick the newest trade_log_*.csv if any
     files = [f for f in os.listdir(folder) if f.startswith("trade_log_") and f.endswith(".csv")]
@@ -103,8 +118,15 @@ if "last_run" not in st.session_state:
 with st.sidebar:
     st.title("Controls")
     st.markdown("**Routing**")
-    consolidate = st.checkbox("Consolidate to USD pairs (rc4)", value=bool(CONFIG.get("routing", {}).get("consolidate_to_usd", True)))
-    CONFIG.setdefault("routing", {})["consolidate_to_usd"] = consolidate
+    _engine_cfg = st.session_state.engine.config
+    consolidate = st.checkbox("Consolidate to USD pairs (rc4)", value=_engine_cfg.current.routing.consolidate_to_usd)
+    if consolidate != _engine_cfg.current.routing.consolidate_to_usd:
+        # Swapped into a new snapshot; the engine picks it up at its next cycle.
+        # Back at the file value, drop the override so later config edits apply again.
+        if consolidate == _engine_cfg.base.routing.consolidate_to_usd:
+            _engine_cfg.clear_override("routing", "consolidate_to_usd")
+        else:
+            _engine_cfg.override("routing", consolidate_to_usd=consolidate)
 
     st.markdown("**Execution**")
     st.session_state.execute = st.checkbox("Execute trades", value=st.session_state.execute)
@@ -203,17 +225,28 @@ pair_rows = (result or {}).get("pair_rows", [])
 trades_executed = int((result or {}).get("trades_executed", 0))
 
 st.markdown("### USD Decisions")
-usd_df = _dicts_to_df(usd_rows)
+usd_df = _dicts_to_df([r.as_dict() for r in usd_rows])  # DecisionRow values are already numeric
 if not usd_df.empty:
-    # pretty types
-    num_cols = [c for c in usd_df.columns if c not in ("Symbol", "Trend", "Reason")]
-    for c in num_cols:
-        try:
-            usd_df[c] = pd.to_numeric(usd_df[c], errors="ignore")
-        except Exception:
-            pass
-    st.dataframe(usd_df, use_container_width=True, hide_index=True)
+    usd_df["Trend"] = usd_df["Trend"].str.capitalize()
+    hist = engine.history
+    usd_view = usd_df.copy()
+    extra = {}
+    for col, field in (("Net History", "net"), ("PNL History", "pnl")):
+        series = [hist.series(s, field)[-60:].tolist() for s in usd_df["Symbol"]]
+        if hasattr(st, "column_config"):  # Streamlit >= 1.23 draws list columns as line charts
+            usd_view[col] = [[x if x == x else None for x in v] for v in series]  # NaN gaps -> None
+            extra.setdefault("column_config", {})[col] = st.column_config.LineChartColumn(col)
+        else:
+            usd_view[col] = [sparkline(v) for v in series]
+    st.dataframe(usd_view, use_container_width=True, hide_index=True, **extra)
     st.download_button("Download USD Decisions CSV", data=usd_df.to_csv(index=False), file_name="usd_decisions.csv")
+
+    if len(hist):
+        pick = st.selectbox("Exposure history", list(usd_df["Symbol"]))
+        st.line_chart(pd.DataFrame(
+            {f: hist.series(pick, f) for f in ("net", "position", "target")},
+            index=pd.to_datetime(hist.times(), unit="s"),
+        ))
 else:
     st.info("No USD decision rows yet.")
 
@@ -240,6 +273,6 @@ status_cols = st.columns(3)
 with status_cols[0]:
     st.metric("Trades executed this cycle", trades_executed)
 with status_cols[1]:
-    st.write(f"Consolidate to USD: **{bool(CONFIG.get('routing', {}).get('consolidate_to_usd', False))}**")
+    st.write(f"Consolidate to USD: **{engine.config.current.routing.consolidate_to_usd}**")
 with status_cols[2]:
     st.caption("All symbol metadata/mapping from config/symbol_config.py")
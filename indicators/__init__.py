@@ -1,7 +1,12 @@
 # indicators/__init__.py
-from .indicators import compute_trend_metrics, TrendMetrics
+from .indicators import (
+    compute_trend_metrics, compute_trend_metrics_batch, closes_matrix, TrendMetrics, TrendMetricsBatch,
+)
 
 __all__ = [
     "compute_trend_metrics",
     "TrendMetrics",
+    "compute_trend_metrics_batch",
+    "TrendMetricsBatch",
+    "closes_matrix",
 ]
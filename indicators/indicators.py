@@ -1,14 +1,18 @@
 # indicators/indicators.py
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import Optional, Iterable
+from typing import TYPE_CHECKING, Optional, Iterable, Mapping
 
-import pandas as pd
-import numpy as np
 import MetaTrader5 as mt5
 
 from config import CONFIG, SYMBOL_CONFIG
 
+if TYPE_CHECKING:  # pandas/numpy are imported on first use, not when the package loads
+    import numpy as np
+    import pandas as pd
+
 
 @dataclass
 class TrendMetrics:
@@ -19,12 +23,15 @@ class TrendMetrics:
 
 
 def _series_from_iter(closes: Iterable[float]) -> pd.Series:
+    import pandas as pd
     s = pd.Series(list(closes), dtype="float64")
     # Drop NaNs if any
     return s.dropna()
 
 
 def _fetch_closes(symbol: str, bars: int = 300) -> pd.Series:
+    import numpy as np
+    import pandas as pd
     term_symbol = SYMBOL_CONFIG["symbol_mapping"].get(symbol, symbol)
     # ↓↓↓ Fallback to M1 if M5 doesn’t exist in the stub
     timeframe = getattr(mt5, "TIMEFRAME_M5", None) or getattr(mt5, "TIMEFRAME_M1", 1)
@@ -48,7 +55,7 @@ def _rsi(s: pd.Series, n: int) -> Optional[float]:
     delta = s.diff()
     up = delta.clip(lower=0.0).rolling(n).mean()
     down = (-delta.clip(upper=0.0)).rolling(n).mean()
-    rs = up / (down.replace(0, np.nan))
+    rs = up / (down.replace(0, float("nan")))
     out = 100 - (100 / (1 + rs))
     return float(out.iloc[-1]) if len(out) else None
 
@@ -95,3 +102,151 @@ def compute_trend_metrics(symbol: str, closes: Optional[Iterable[float]] = None)
     macd_val = _macd(s, int(cfg["macd_fast"]), int(cfg["macd_slow"]), int(cfg["macd_signal"]))
 
     return TrendMetrics(trend=trend, sma_diff=sma_diff, rsi=rsi_val, macd=macd_val)
+
+
+# -------------------- Batch kernel (symbols x bars) --------------------
+
+@dataclass
+class TrendMetricsBatch:
+    """
+    Struct-of-arrays TrendMetrics for many symbols; index i is row i of the
+    closes matrix. rsi/macd are NaN where the per-symbol API returns None
+    (see rsi_valid / macd_valid).
+    """
+    symbols: list
+    trend: np.ndarray       # object array of "up" | "down" | "neutral"
+    sma_diff: np.ndarray
+    rsi: np.ndarray
+    macd: np.ndarray
+    rsi_valid: np.ndarray
+    macd_valid: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __getitem__(self, i: int) -> TrendMetrics:
+        return TrendMetrics(
+            trend=str(self.trend[i]),
+            sma_diff=float(self.sma_diff[i]),
+            rsi=float(self.rsi[i]) if self.rsi_valid[i] else None,
+            macd=float(self.macd[i]) if self.macd_valid[i] else None,
+        )
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+def _ewm_rows(x: np.ndarray, span: int) -> np.ndarray:
+    """Row-wise ewm(span, adjust=False).mean(); each row starts at its first non-NaN bar."""
+    import numpy as np
+    a = 2.0 / (span + 1.0)
+    out = np.empty_like(x)
+    y = np.full(x.shape[0], np.nan)
+    for t in range(x.shape[1]):
+        xt = x[:, t]
+        y = np.where(np.isnan(y), xt, (1.0 - a) * y + a * xt)
+        out[:, t] = y
+    return out
+
+
+TREND_BARS = 300  # bars fetched per symbol for the batch trend metrics
+
+
+def trend_timeframe() -> int:
+    return getattr(mt5, "TIMEFRAME_M5", None) or getattr(mt5, "TIMEFRAME_M1", 1)
+
+
+def fetch_closes_matrix(symbols: Iterable[str], bars: int = TREND_BARS,
+                        symbol_mapping: Optional[dict] = None) -> np.ndarray:
+    """Recent closes for each symbol as one (symbols x bars) matrix, left-padded with NaN."""
+    mapping = SYMBOL_CONFIG["symbol_mapping"] if symbol_mapping is None else symbol_mapping
+    timeframe = trend_timeframe()
+    return closes_matrix([mt5.copy_rates_from_pos(mapping.get(s, s), timeframe, 0, bars) for s in symbols], bars)
+
+
+def last_bar_time(rates) -> Optional[int]:
+    """Open time of the newest bar in a copy_rates_from_pos result (None if unknown)."""
+    if rates is None or len(rates) == 0:
+        return None
+    try:
+        return int(rates[-1]["time"])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+def latest_bar_times(symbols: Iterable[str], symbol_mapping: Optional[dict] = None) -> list:
+    """Newest trend-timeframe bar time per symbol, from one single-bar read each."""
+    mapping = SYMBOL_CONFIG["symbol_mapping"] if symbol_mapping is None else symbol_mapping
+    timeframe = trend_timeframe()
+    return [last_bar_time(mt5.copy_rates_from_pos(mapping.get(s, s), timeframe, 0, 1)) for s in symbols]
+
+
+def closes_matrix(rates_per_symbol: Iterable, bars: int = TREND_BARS) -> np.ndarray:
+    """(symbols x bars) close matrix from already-read copy_rates_from_pos results (None = no bars)."""
+    import numpy as np
+    rates_per_symbol = list(rates_per_symbol)
+    out = np.full((len(rates_per_symbol), bars), np.nan)
+    for i, rates in enumerate(rates_per_symbol):
+        if rates is None or len(rates) == 0:
+            continue
+        if isinstance(rates, np.ndarray):
+            closes = np.asarray(rates["close"], dtype="float64")
+        else:
+            closes = np.array([r["close"] for r in rates], dtype="float64")
+        closes = closes[~np.isnan(closes)][-bars:]
+        if len(closes):
+            out[i, bars - len(closes):] = closes
+    return out
+
+
+def compute_trend_metrics_batch(symbols: Iterable[str], closes: Optional[np.ndarray] = None,
+                                symbol_mapping: Optional[dict] = None,
+                                params: Optional[Mapping] = None) -> TrendMetricsBatch:
+    """
+    compute_trend_metrics for a whole universe in one pass. `closes` is a
+    (symbols x bars) matrix with each row's history right-aligned (leading
+    NaNs for short histories); fetched from MT5 when omitted. `params` are the
+    indicator settings (the engine passes its config snapshot's; default
+    CONFIG["indicators"]).
+    Results match the per-symbol function up to floating-point rounding.
+    """
+    import numpy as np
+    symbols = list(symbols)
+    cfg = CONFIG["indicators"] if params is None else params
+    short_n = int(cfg["short_sma_period"])
+    long_n = int(cfg["long_sma_period"])
+    rsi_n = int(cfg["rsi_period"])
+    fast, slow, signal = int(cfg["macd_fast"]), int(cfg["macd_slow"]), int(cfg["macd_signal"])
+    neutral_eps = float(cfg.get("neutral_trend_threshold", 0.0))
+
+    c = fetch_closes_matrix(symbols, symbol_mapping=symbol_mapping) if closes is None \
+        else np.asarray(closes, dtype="float64").reshape(len(symbols), -1)
+    n_valid = np.count_nonzero(~np.isnan(c), axis=1)
+    enough = n_valid >= max(short_n, long_n)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # SMA: only the last value of each rolling mean is used
+        sma_diff = c[:, -short_n:].mean(axis=1) - c[:, -long_n:].mean(axis=1)
+        sma_diff = np.where(enough, sma_diff, 0.0)
+        trend = np.full(len(symbols), "neutral", dtype=object)
+        trend[enough & (sma_diff > neutral_eps)] = "up"
+        trend[enough & (sma_diff < -neutral_eps)] = "down"
+
+        # RSI over the last rsi_n price changes (NaN when the window reaches the padding)
+        d = np.diff(c, axis=1)[:, -rsi_n:]
+        up = np.clip(d, 0.0, None).mean(axis=1)
+        down = (-np.clip(d, None, 0.0)).mean(axis=1)
+        rsi = 100.0 - 100.0 / (1.0 + up / np.where(down == 0, np.nan, down))
+        rsi_valid = enough & (n_valid >= max(5, rsi_n))
+
+        # MACD histogram (three row-wise EWMs, looped over bars not symbols)
+        macd_line = _ewm_rows(c, fast) - _ewm_rows(c, slow)
+        hist = macd_line - _ewm_rows(macd_line, signal)
+        macd = hist[:, -1] if c.shape[1] else np.full(len(symbols), np.nan)
+        macd_valid = enough & (n_valid >= max(fast, slow, signal) + 2)
+
+    return TrendMetricsBatch(
+        symbols=symbols, trend=trend, sma_diff=sma_diff,
+        rsi=np.where(rsi_valid, rsi, np.nan), macd=np.where(macd_valid, macd, np.nan),
+        rsi_valid=rsi_valid, macd_valid=macd_valid,
+    )
@@ -7,15 +7,80 @@ from __future__ import annotations
 import os, sys
 sys.path.insert(0, os.path.dirname(__file__))
 
-import argparse
 import time
-from typing import Callable, Dict, Any, List
+import importlib.abc
+
+_START = time.perf_counter()
+
+
+# ------------------------ Startup profiling ------------------------
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    --profile-startup: times every module executed after it is installed.
+    Records (self_seconds, cumulative_seconds) per module; children are
+    subtracted from the parent's self time, like `python -X importtime`.
+    """
+
+    def __init__(self):
+        self.times: dict[str, tuple] = {}
+        self._stack: list[float] = []
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        if loader is None or not hasattr(loader, "exec_module"):
+            return spec
+        timer = self
+
+        class _Timed(importlib.abc.Loader):
+            def create_module(self, spec_):
+                return loader.create_module(spec_)
+
+            def exec_module(self, module):
+                t0 = time.perf_counter()
+                timer._stack.append(0.0)
+                try:
+                    loader.exec_module(module)
+                finally:
+                    total = time.perf_counter() - t0
+                    children = timer._stack.pop()
+                    timer.times[name] = (total - children, total)
+                    if timer._stack:
+                        timer._stack[-1] += total
+                    spec.loader = module.__loader__ = loader
+
+        spec.loader = _Timed()
+        return spec
+
+    def report(self, top: int = 25) -> str:
+        rows = sorted(self.times.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+        lines = [f"{'self ms':>9} {'cumul ms':>9}  module"]
+        lines += [f"{s * 1000:9.1f} {c * 1000:9.1f}  {name}" for name, (s, c) in rows]
+        return "\n".join(lines)
+
+
+_IMPORT_TIMER = None
+if "--profile-startup" in sys.argv:
+    _IMPORT_TIMER = _ImportTimer()
+    sys.meta_path.insert(0, _IMPORT_TIMER)
+
+import argparse
+from typing import TYPE_CHECKING, Callable, Dict, Any, List
 
 from config import CONFIG, SYMBOL_CONFIG
 from trade_logging import get_logger, log_json, log_exception
 from data_access.data_access import ManagerClient, TerminalClient
-from trade_logic.engine import TradingEngine
-from gui.gui import run_gui
+
+if TYPE_CHECKING:  # imported after login in build_engine(); the GUI only when it's shown
+    from trade_logic.engine import TradingEngine
 
 
 # ------------------------ Manager helper ------------------------
@@ -87,22 +152,118 @@ def build_manager_rows_provider(logger) -> Callable[[], List[Dict[str, Any]]]:
     return _provider
 
 
+def build_group_exposure_provider(logger) -> Callable[[], List[Dict[str, Any]]]:
+    """
+    Keeps one Manager connection open and maintains per-group exposure from the
+    position pump (GroupExposureAggregator). Each call returns totals for
+    CONFIG["connection"]["manager_group"] in the get_net_positions() row shape.
+    Reconnects on the next call if the connection or subscription fails.
+    """
+    try:
+        import MT5Manager
+    except Exception as e:
+        log_exception(logger, e, where="manager_import", note="MT5Manager not importable")
+        return lambda: []
+
+    from data_access.exposure import GroupExposureAggregator
+
+    m_server = str(CONFIG["connection"].get("manager_server", ""))
+    m_login = int(CONFIG["connection"].get("manager_login", 0))
+    m_pass  = str(CONFIG["connection"].get("manager_password", ""))
+    mask = str(CONFIG["connection"].get("manager_group", "*") or "*")
+    host, port = _parse_host_port(m_server)
+    state: Dict[str, Any] = {"manager": None, "agg": None}
+
+    def _connect():
+        manager = MT5Manager.ManagerAPI()
+        log_json(logger, event="manager_connect_attempt", host=host, port=port, login=m_login, mode="pump")
+        modes = MT5Manager.ManagerAPI.EnPumpModes
+        ok = manager.Connect(host, m_login, m_pass,
+                             modes.PUMP_MODE_POSITIONS.value | modes.PUMP_MODE_USERS.value, 30000)
+        if not ok:
+            log_json(logger, event="manager_connect_failed")
+            return None, None
+
+        def _group_of(login):
+            user = manager.UserGet(login)
+            return getattr(user, "Group", None) if user else None
+
+        agg = GroupExposureAggregator(_group_of, SYMBOL_CONFIG.get("symbols"))
+        # subscribe before the snapshot so changes in between aren't lost; seed() keeps the pump's view
+        if not (manager.PositionSubscribe(agg) and manager.UserSubscribe(agg)):
+            log_json(logger, event="manager_subscribe_failed")
+            manager.Disconnect()
+            return None, None
+        agg.seed(manager.PositionGetByGroup(mask) or [])
+        log_json(logger, event="manager_pump_ready", groups=len(agg.groups()), mask=mask)
+        return manager, agg
+
+    def _provider():
+        try:
+            if state["agg"] is None:
+                state["manager"], state["agg"] = _connect()
+                if state["agg"] is None:
+                    return []
+            rows = state["agg"].net_rows(mask)
+            log_json(logger, event="manager_fetch_ok", rows=len(rows), mask=mask)
+            return rows
+        except Exception as e:
+            log_exception(logger, e, where="manager_pump")
+            try:
+                if state["manager"]:
+                    state["manager"].Disconnect()
+            except Exception:
+                pass
+            state["manager"], state["agg"] = None, None
+            return []
+
+    return _provider
+
+
 # ------------------------ Engine / CLI ------------------------
 
 def build_engine() -> TradingEngine:
     logger = get_logger("main")
 
+    if _IMPORT_TIMER is not None:
+        sys.meta_path.remove(_IMPORT_TIMER)
+        elapsed = time.perf_counter() - _START
+        print(f"startup: {elapsed * 1000:.0f} ms to MT5 login "
+              f"({len(_IMPORT_TIMER.times)} modules imported)")
+        print(_IMPORT_TIMER.report())
+        log_json(logger, event="startup_profile", ms_to_login=round(elapsed * 1000, 1),
+                 modules=len(_IMPORT_TIMER.times))
+
     # Terminal login
     term = TerminalClient()
     if not term.init_and_login():
         raise SystemExit("MT5 Terminal login failed. Check CONFIG['connection'] credentials & server.")
 
-    # Manager provider
-    manager_rows_provider = build_manager_rows_provider(logger)
-
-    # Engine wires the provider + terminal
-    engine = TradingEngine(manager_rows_provider, term)
-    log_json(logger, event="engine_built")
+    # Manager provider: server-wide summaries, or group-filtered pump aggregation
+    if str(CONFIG.get("runtime", {}).get("manager_exposure_source", "summary")) == "pump":
+        manager_rows_provider = build_group_exposure_provider(logger)
+    else:
+        manager_rows_provider = build_manager_rows_provider(logger)
+
+    # Optional SQLite trade/event store
+    store = None
+    sqlite_path = CONFIG.get("outputs", {}).get("sqlite_path")
+    if sqlite_path:
+        from trade_logging.store import TradeStore
+        store = TradeStore(sqlite_path)
+
+    # Optional crash-safe order intent journal
+    journal = None
+    outputs = CONFIG.get("outputs", {})
+    if outputs.get("intent_journal_path"):
+        from trade_logging.journal import IntentJournal
+        journal = IntentJournal(outputs["intent_journal_path"],
+                                settle_seconds=float(outputs.get("intent_settle_seconds", 30)))
+
+    # Engine wires the provider + terminal (pandas/numpy load here, after login)
+    from trade_logic.engine import TradingEngine
+    engine = TradingEngine(manager_rows_provider, term, store=store, journal=journal)
+    log_json(logger, event="engine_built", intent_journal=engine.journal_report)
     return engine
 
 
@@ -113,14 +274,24 @@ def run_headless(engine: TradingEngine, *, once: bool, interval: int, execute: b
     - If execute=False: we just run cycle() and rely on config to gate execution (optional)
       (For a true dry-run, set your config to block trades or we can add a dry-run toggle in engine.)
     """
+    from trade_logic.scheduler import CycleScheduler
+
     log = get_logger("main")
+    rt = CONFIG.get("runtime", {})
+    sched = CycleScheduler(max(1, int(interval)), budget=rt.get("cycle_budget_seconds"),
+                           policy=str(rt.get("overrun_policy", "skip")))
     try:
         while True:
-            out = engine.cycle() if execute else engine.cycle()  # same today; engine handles gating
-            log_json(log, event="cycle_done", trades=out.get("trades_executed", 0), status=out.get("status"))
+            out = sched.step(engine.cycle)  # engine handles execution gating
+            m = sched.metrics
+            log_json(log, event="cycle_done", trades=out.get("trades_executed", 0), status=out.get("status"),
+                     duration=round(m.last_duration, 3), lateness=round(m.last_lateness, 3),
+                     late=m.late, skipped=m.skipped, coalesced=m.coalesced, over_budget=m.over_budget,
+                     breakers_open=sum(b["state"] == "open" for b in (out.get("breakers") or {}).values()),
+                     **(out.get("timings") or {}))
             if once:
                 break
-            time.sleep(max(1, int(interval)))
+            time.sleep(sched.delay())
     except KeyboardInterrupt:
         print("Interrupted — exiting…")
     except Exception as e:
@@ -134,6 +305,8 @@ def parse_args() -> argparse.Namespace:
     ap.add_argument("--execute", action="store_true", help="headless: place orders during the cycle")
     ap.add_argument("--interval", type=int, default=None,  # ← let config decide if None
                     help="headless: seconds between cycles (default from config.runtime.cycle_seconds)")
+    ap.add_argument("--profile-startup", action="store_true",
+                    help="print per-module import times up to the MT5 login")
     return ap.parse_args()
 
 
@@ -146,11 +319,15 @@ def main() -> None:
     cfg_interval = int(CONFIG.get("runtime", {}).get("cycle_seconds", 5))
     interval = args.interval if args.interval is not None else cfg_interval
 
-    if args.headless:
-        run_headless(engine, once=args.once, interval=interval, execute=args.execute)
-    else:
-        # Use config for GUI refresh
-        run_gui(engine, refresh_seconds=cfg_interval)
+    try:
+        if args.headless:
+            run_headless(engine, once=args.once, interval=interval, execute=args.execute)
+        else:
+            # Use config for GUI refresh
+            from gui.gui import run_gui
+            run_gui(engine, refresh_seconds=cfg_interval)
+    finally:
+        engine.close()
 
 
 
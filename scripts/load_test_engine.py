@@ -0,0 +1,98 @@
+# scripts/load_test_engine.py
+"""
+Drive TradingEngine against the local MT5 simulator and report cycle latency.
+
+    python scripts/load_test_engine.py --cycles 50 --latency-ms 2 --jitter-ms 1 --hedging
+
+Every configured symbol gets a random-walk quote and an M1 history; manager
+exposures are random as well. Nothing here touches a real terminal.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from simulators import MT5Simulator, install  # noqa: E402  (must precede MetaTrader5 imports)
+
+# rough USD value of one unit of each currency, for plausible crosses
+USD_PER = {"USD": 1.0, "EUR": 1.09, "GBP": 1.27, "AUD": 0.66, "NZD": 0.61, "CAD": 0.74, "CHF": 1.12,
+           "JPY": 0.0067, "SGD": 0.74, "DKK": 0.146, "HUF": 0.0028, "NOK": 0.094, "PLN": 0.25,
+           "SEK": 0.095, "CNH": 0.14, "CZK": 0.044, "HKD": 0.128, "MXN": 0.058, "ZAR": 0.054}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--cycles", type=int, default=20)
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="mean latency per terminal call")
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--requote", type=float, default=0.0, help="requote probability per market order")
+    ap.add_argument("--partial", type=float, default=0.0, help="partial-fill probability per market order")
+    ap.add_argument("--hedging", action="store_true")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    sim = install(MT5Simulator(
+        margin_mode="hedging" if args.hedging else "netting", seed=args.seed,
+        latency={"*": (args.latency_ms / 1000, args.jitter_ms / 1000)},
+        requote_prob=args.requote, partial_fill_prob=args.partial,
+    ))
+
+    from config import SYMBOL_CONFIG
+    from data_access.data_access import TerminalClient
+    from trade_logic.engine import TradingEngine
+
+    rng = random.Random(args.seed)
+    mapping = SYMBOL_CONFIG["symbol_mapping"]
+    now = time.time()
+    mids = {}
+    for sym in SYMBOL_CONFIG["symbols"]:
+        mid = USD_PER.get(sym[:3], 1.0) / USD_PER.get(sym[3:6], 1.0)
+        digits = 3 if sym.endswith("JPY") or mid > 20 else 5
+        spread = 2 * 10.0 ** -digits
+        term = mapping.get(sym, sym)
+        sim.add_symbol(term, digits=digits, bid=round(mid, digits), ask=round(mid + spread, digits))
+        closes, px = [], mid
+        for _ in range(300):
+            px *= 1 + rng.gauss(0, 0.0004)
+            closes.append(px)
+        sim.load_rates(term, [(int(now) - (300 - i) * 60, c, c, c, c) for i, c in enumerate(closes)])
+        mids[term] = (mid, digits, spread)
+
+    def manager_rows():
+        return [{"symbol": s, "net_volume": round(rng.uniform(-20, 20), 2), "positions": rng.randint(1, 50),
+                 "buy_volume": 0.0, "sell_volume": 0.0, "timestamp": ""} for s in SYMBOL_CONFIG["symbols"]]
+
+    term = TerminalClient()
+    term.init_and_login()
+    engine = TradingEngine(manager_rows, term)
+    durations, to_send, trades = [], [], 0
+    for _ in range(args.cycles):
+        for name, (mid, digits, spread) in mids.items():
+            m = mid * (1 + rng.gauss(0, 0.0002))
+            sim.set_quote(name, round(m, digits), round(m + spread, digits))
+        t0 = time.perf_counter()
+        out = engine.cycle()
+        durations.append(time.perf_counter() - t0)
+        trades += out.get("trades_executed", 0)
+        if "timings" in out:
+            to_send.append(out["timings"]["read_to_sent_ms"])
+    engine.close()
+
+    ms = sorted(d * 1000 for d in durations)
+    print(f"cycles={len(ms)} trades={trades} order_sends={sim.calls['order_send']} "
+          f"terminal_calls={sum(sim.calls.values())}")
+    print(f"cycle ms: mean={statistics.mean(ms):.1f} p50={ms[len(ms) // 2]:.1f} "
+          f"p95={ms[int(len(ms) * 0.95) - 1]:.1f} max={ms[-1]:.1f}")
+    if to_send:
+        to_send.sort()
+        print(f"read->sent ms: mean={statistics.mean(to_send):.1f} p50={to_send[len(to_send) // 2]:.1f} "
+              f"max={to_send[-1]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
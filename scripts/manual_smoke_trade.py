@@ -32,7 +32,7 @@ def main():
     print("----- RESULT -----")
     print("Trades executed:", out.get("trades_executed"))
     for r in out.get("usd_rows", []):
-        if r.get("Symbol") == TEST_SYMBOL:
+        if r.symbol == TEST_SYMBOL:
             print("Row:", r)
 
     term.shutdown()
@@ -0,0 +1,28 @@
+"""
+Offline stand-ins for the MetaTrader 5 terminal and Manager SDKs.
+
+    from simulators import MT5Simulator, install, install_manager
+    sim = install(MT5Simulator())   # before anything imports MetaTrader5
+    flow = install_manager(symbols=2000, updates_per_second=5000)
+"""
+
+import sys
+
+from .mt5_terminal import MT5Simulator
+from . import mt5_manager
+
+
+def install(sim: MT5Simulator | None = None) -> MT5Simulator:
+    """Register `sim` as the `MetaTrader5` module and return it."""
+    sim = sim or MT5Simulator()
+    sys.modules["MetaTrader5"] = sim
+    return sim
+
+
+def install_manager(**flow_options) -> "mt5_manager.ClientFlow":
+    """Register the fake SDK as `MT5Manager`, configure its shared client flow and return the flow."""
+    sys.modules["MT5Manager"] = mt5_manager
+    return mt5_manager.configure(**flow_options)
+
+
+__all__ = ["MT5Simulator", "install", "install_manager"]
@@ -0,0 +1,318 @@
+"""
+Fake `MT5Manager` SDK with synthetic client flow.
+
+Implements the subset of `MT5Manager.ManagerAPI` the project uses (Connect,
+Disconnect, SummaryTotal, SummaryGet, UserGet, PositionGetByGroup,
+PositionSubscribe/Unsubscribe, UserSubscribe/Unsubscribe) on top of a shared `ClientFlow`. The flow is a
+book of client positions whose volumes random-walk, open and close at a
+configurable rate. Summaries are kept incrementally and every change is
+pushed to position sinks (OnPositionAdd/Update/Delete), as the real pump does.
+Logins never change group, so user sinks are accepted but never called.
+
+    from simulators import install_manager
+    flow = install_manager(symbols=2000, updates_per_second=5000, connect_delay=0.2)
+    import MT5Manager                   # this module
+    api = MT5Manager.ManagerAPI()
+    api.Connect("host", 1000, "pw", MT5Manager.ManagerAPI.EnPumpModes.PUMP_MODE_POSITIONS.value, 30000)
+
+`simulators/shim` holds an `MT5Manager` package that forwards here, so
+`PYTHONPATH=simulators/shim python main.py` needs no code changes.
+"""
+
+from __future__ import annotations
+
+import enum
+import random
+import threading
+import time
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Dict, Iterable, List, Optional
+
+# Manager API: position Volume is in 1/10000 lot, Action 0=buy 1=sell
+VOLUME_DIV = 10000
+ACTION_BUY = 0
+ACTION_SELL = 1
+
+
+class EnPumpModes(enum.IntFlag):
+    PUMP_MODE_NONE = 0
+    PUMP_MODE_USERS = 1
+    PUMP_MODE_ACTIVITY = 2
+    PUMP_MODE_MAIL = 4
+    PUMP_MODE_ORDERS = 8
+    PUMP_MODE_NEWS = 16
+    PUMP_MODE_POSITIONS = 32
+    PUMP_MODE_SYMBOLS = 64
+    PUMP_MODE_GROUPS = 128
+    PUMP_MODE_FULL = 255
+
+
+@dataclass
+class MTPosition:
+    Position: int
+    Login: int
+    Symbol: str
+    Action: int
+    Volume: int          # 1/10000 lot
+    PriceOpen: float = 0.0
+
+
+@dataclass
+class MTSummary:
+    Symbol: str
+    VolumeBuyClients: int = 0    # 1/10000 lot
+    VolumeSellClients: int = 0
+    PositionClients: int = 0
+
+    @property
+    def VolumeNet(self) -> float:
+        """Client net in lots (the project's SDK build reports VolumeNet already in lots)."""
+        return (self.VolumeBuyClients - self.VolumeSellClients) / VOLUME_DIV
+
+
+@dataclass
+class MTUser:
+    Login: int
+    Group: str
+
+
+class ClientFlow:
+    """Synthetic client book shared by every ManagerAPI instance."""
+
+    def __init__(self, symbols: Iterable[str] | int = 50, *, logins: int = 500,
+                 groups: Iterable[str] = ("real\\A-book\\std", "real\\B-book\\std", "real\\B-book\\pro", "demo\\std"),
+                 positions_per_symbol: int = 20, updates_per_second: float = 100.0,
+                 max_lots: float = 5.0, connect_delay: float = 0.0, connect_failure_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        """
+        symbols: names, or a count of synthetic names (SYM00000...)
+        positions_per_symbol: steady-state open positions the flow drifts towards
+        updates_per_second: rate of the background generator (see start())
+        """
+        self.symbols: List[str] = ([f"SYM{i:05d}" for i in range(symbols)] if isinstance(symbols, int)
+                                   else list(symbols))
+        self.updates_per_second = float(updates_per_second)
+        self.connect_delay = float(connect_delay)
+        self.connect_failure_rate = float(connect_failure_rate)
+        self.max_volume = int(max_lots * VOLUME_DIV)
+        self.target_positions = max(1, positions_per_symbol * len(self.symbols))
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        groups = list(groups)
+        self.users: Dict[int, MTUser] = {
+            1000 + i: MTUser(1000 + i, groups[i % len(groups)]) for i in range(logins)
+        }
+        self._logins = list(self.users)
+        self.positions: Dict[int, MTPosition] = {}
+        self._tickets: List[int] = []          # for O(1) random picks
+        self._slot: Dict[int, int] = {}        # ticket -> index in _tickets
+        self.summaries: Dict[str, MTSummary] = {}
+        self._sinks: List[object] = []
+        self._next_ticket = 1
+        self.updates = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -------- book maintenance --------
+
+    def _account(self, p: MTPosition, sign: int) -> None:
+        s = self.summaries.get(p.Symbol)
+        if s is None:
+            s = self.summaries[p.Symbol] = MTSummary(p.Symbol)
+        if p.Action == ACTION_BUY:
+            s.VolumeBuyClients += sign * p.Volume
+        else:
+            s.VolumeSellClients += sign * p.Volume
+        s.PositionClients += sign
+        if s.PositionClients <= 0:
+            del self.summaries[p.Symbol]
+
+    def _remove(self, ticket: int) -> None:
+        del self.positions[ticket]
+        i = self._slot.pop(ticket)
+        last = self._tickets.pop()
+        if last != ticket:
+            self._tickets[i] = last
+            self._slot[last] = i
+
+    def _notify(self, event: str, p: MTPosition) -> None:
+        snapshot = MTPosition(p.Position, p.Login, p.Symbol, p.Action, p.Volume, p.PriceOpen)
+        for sink in list(self._sinks):
+            try:
+                getattr(sink, event)(snapshot)
+            except Exception:
+                pass  # a failing sink must not stop the pump
+
+    def step(self, n: int = 1) -> None:
+        """Apply `n` random open / resize / close events."""
+        rng = self._rng
+        with self._lock:
+            for _ in range(n):
+                self.updates += 1
+                fill = len(self.positions) / self.target_positions
+                r = rng.random()
+                if not self.positions or r < 0.5 * (1.5 - fill):
+                    ticket = self._next_ticket
+                    self._next_ticket += 1
+                    p = MTPosition(ticket, rng.choice(self._logins), rng.choice(self.symbols),
+                                   rng.choice((ACTION_BUY, ACTION_SELL)),
+                                   rng.randint(1, self.max_volume // 100) * 100)
+                    self.positions[ticket] = p
+                    self._slot[ticket] = len(self._tickets)
+                    self._tickets.append(ticket)
+                    self._account(p, +1)
+                    self._notify("OnPositionAdd", p)
+                    continue
+                p = self.positions[self._tickets[rng.randrange(len(self._tickets))]]
+                if r < 0.8:
+                    # random-walk the volume; a walk to zero closes the position
+                    self._account(p, -1)
+                    p.Volume = max(0, min(self.max_volume, p.Volume + rng.choice((-1, 1)) * rng.randint(1, 10) * 100))
+                    if p.Volume:
+                        self._account(p, +1)
+                        self._notify("OnPositionUpdate", p)
+                        continue
+                else:
+                    self._account(p, -1)
+                self._remove(p.Position)
+                self._notify("OnPositionDelete", p)
+
+    # -------- background generator --------
+
+    def start(self) -> "ClientFlow":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="fake-manager-flow", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        owed, last = 0.0, time.monotonic()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            owed += (now - last) * self.updates_per_second
+            last = now
+            if owed >= 1:
+                self.step(int(owed))
+                owed -= int(owed)
+            self._stop.wait(0.01)
+
+
+_FLOW: Optional[ClientFlow] = None
+
+
+def configure(**kwargs) -> ClientFlow:
+    """Replace the shared flow (stopping the old generator); see ClientFlow for options."""
+    global _FLOW
+    if _FLOW is not None:
+        _FLOW.stop()
+    _FLOW = ClientFlow(**kwargs)
+    return _FLOW
+
+
+def flow() -> ClientFlow:
+    global _FLOW
+    if _FLOW is None:
+        _FLOW = ClientFlow()
+    return _FLOW
+
+
+class ManagerAPI:
+    EnPumpModes = EnPumpModes
+
+    def __init__(self):
+        self._flow = flow()
+        self._connected = False
+        self._sinks: List[object] = []
+        self._user_sinks: List[object] = []
+        self._last_error = (0, "MT_RET_OK")
+
+    def Connect(self, server, login, password, pump_mode=0, timeout=30000) -> bool:
+        f = self._flow
+        if f.connect_delay > 0:
+            time.sleep(min(f.connect_delay, timeout / 1000.0))
+        if f.connect_failure_rate and f._rng.random() < f.connect_failure_rate:
+            self._last_error = (3, "MT_RET_ERR_NETWORK")
+            return False
+        self._connected = True
+        return True
+
+    def Disconnect(self) -> None:
+        for sink in list(self._sinks):
+            self.PositionUnsubscribe(sink)
+        self._user_sinks.clear()
+        self._connected = False
+
+    def LastError(self):
+        return self._last_error
+
+    # -------- summaries --------
+
+    def SummaryTotal(self) -> int:
+        if not self._connected:
+            return 0
+        with self._flow._lock:
+            return len(self._flow.summaries)
+
+    def SummaryGet(self, symbol: str):
+        if not self._connected:
+            return False
+        with self._flow._lock:
+            s = self._flow.summaries.get(symbol)
+            return False if s is None else MTSummary(s.Symbol, s.VolumeBuyClients, s.VolumeSellClients,
+                                                     s.PositionClients)
+
+    # -------- users / positions --------
+
+    def UserGet(self, login: int):
+        return self._flow.users.get(int(login)) if self._connected else None
+
+    def PositionGetByGroup(self, mask: str = "*"):
+        if not self._connected:
+            return []
+        pats = [p.strip().lower() for p in (mask or "*").split(",") if p.strip()]
+        users = self._flow.users
+
+        def _match(login):
+            g = users[login].Group.lower()
+            if any(p.startswith("!") and fnmatchcase(g, p[1:]) for p in pats):
+                return False
+            return any(not p.startswith("!") and fnmatchcase(g, p) for p in pats)
+
+        with self._flow._lock:
+            return [MTPosition(p.Position, p.Login, p.Symbol, p.Action, p.Volume, p.PriceOpen)
+                    for p in self._flow.positions.values() if _match(p.Login)]
+
+    def PositionSubscribe(self, sink) -> bool:
+        if not self._connected:
+            return False
+        with self._flow._lock:
+            self._flow._sinks.append(sink)
+        self._sinks.append(sink)
+        return True
+
+    def PositionUnsubscribe(self, sink) -> bool:
+        with self._flow._lock:
+            if sink in self._flow._sinks:
+                self._flow._sinks.remove(sink)
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+        return True
+
+    def UserSubscribe(self, sink) -> bool:
+        if not self._connected:
+            return False
+        self._user_sinks.append(sink)
+        return True
+
+    def UserUnsubscribe(self, sink) -> bool:
+        if sink in self._user_sinks:
+            self._user_sinks.remove(sink)
+        return True
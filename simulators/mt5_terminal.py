@@ -0,0 +1,545 @@
+"""
+Local MetaTrader5 terminal simulator.
+
+A drop-in stand-in for the `MetaTrader5` module for load and latency testing
+on machines without a terminal. It keeps real account state instead of the
+fill-everything conftest stub:
+
+- netting or hedging account mode (positions, reversals, realized P/L)
+- quotes set directly or replayed from tick files / arrays on a clock
+- per-call latency with jitter, requotes, partial fills (IOC/RETURN)
+- pending limit/stop orders that fill when the price crosses them
+- history deals with ticket/entry/profit, and an M1 rates store fed by ticks
+
+Install it before anything imports MetaTrader5:
+
+    from simulators import install
+    sim = install(MT5Simulator(margin_mode="hedging", latency={"order_send": (0.02, 0.005)}))
+    sim.add_symbol("EURUSD", digits=5, bid=1.1000, ask=1.1002)
+    sim.replay_ticks("EURUSD", "ticks/EURUSD.csv", speed=10.0)
+
+Return codes and constants follow the MetaTrader5 package.
+"""
+
+from __future__ import annotations
+
+import csv
+import random
+import threading
+import time
+from collections import Counter, namedtuple
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+# -------------------- constants (MetaTrader5 values) --------------------
+
+TRADE_ACTION_DEAL = 1
+TRADE_ACTION_PENDING = 5
+TRADE_ACTION_SLTP = 6
+TRADE_ACTION_MODIFY = 7
+TRADE_ACTION_REMOVE = 8
+
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+ORDER_TYPE_BUY_LIMIT = 2
+ORDER_TYPE_SELL_LIMIT = 3
+ORDER_TYPE_BUY_STOP = 4
+ORDER_TYPE_SELL_STOP = 5
+
+ORDER_FILLING_FOK = 0
+ORDER_FILLING_IOC = 1
+ORDER_FILLING_RETURN = 2
+ORDER_TIME_GTC = 0
+
+POSITION_TYPE_BUY = 0
+POSITION_TYPE_SELL = 1
+DEAL_TYPE_BUY = 0
+DEAL_TYPE_SELL = 1
+DEAL_TYPE_BALANCE = 2
+DEAL_ENTRY_IN = 0
+DEAL_ENTRY_OUT = 1
+DEAL_ENTRY_INOUT = 2
+
+ACCOUNT_MARGIN_MODE_RETAIL_NETTING = 0
+ACCOUNT_MARGIN_MODE_RETAIL_HEDGING = 2
+
+TRADE_RETCODE_REQUOTE = 10004
+TRADE_RETCODE_REJECT = 10006
+TRADE_RETCODE_PLACED = 10008
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_DONE_PARTIAL = 10010
+TRADE_RETCODE_INVALID = 10013
+TRADE_RETCODE_INVALID_VOLUME = 10014
+TRADE_RETCODE_INVALID_PRICE = 10015
+TRADE_RETCODE_NO_MONEY = 10019
+TRADE_RETCODE_INVALID_ORDER = 10035
+TRADE_RETCODE_POSITION_CLOSED = 10036
+
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 16385
+TIMEFRAME_H4 = 16388
+TIMEFRAME_D1 = 16408
+_TF_MINUTES = {TIMEFRAME_M1: 1, TIMEFRAME_M5: 5, TIMEFRAME_M15: 15, TIMEFRAME_M30: 30,
+               TIMEFRAME_H1: 60, TIMEFRAME_H4: 240, TIMEFRAME_D1: 1440}
+
+RATES_DTYPE = np.dtype([("time", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"),
+                        ("close", "<f8"), ("tick_volume", "<u8"), ("spread", "<i4"),
+                        ("real_volume", "<u8")])
+
+# -------------------- returned records (namedtuples, like the real package) --------------------
+
+Tick = namedtuple("Tick", "time bid ask last volume time_msc flags volume_real")
+SymbolInfo = namedtuple("SymbolInfo", "name digits point volume_min volume_step volume_max "
+                                      "trade_contract_size currency_base currency_profit visible")
+AccountInfo = namedtuple("AccountInfo", "login balance equity profit margin margin_free margin_level "
+                                        "leverage currency margin_mode")
+TerminalInfo = namedtuple("TerminalInfo", "connected trade_allowed ping_last")
+TradePosition = namedtuple("TradePosition", "ticket time symbol type volume price_open price_current "
+                                            "profit magic comment identifier")
+TradeOrder = namedtuple("TradeOrder", "ticket time_setup symbol type volume_initial volume_current "
+                                      "price_open magic comment")
+TradeDeal = namedtuple("TradeDeal", "ticket order time time_msc type entry symbol volume price "
+                                    "profit position_id magic comment")
+OrderSendResult = namedtuple("OrderSendResult", "retcode deal order volume price bid ask comment "
+                                                "request_id request")
+
+
+@dataclass
+class _Symbol:
+    name: str
+    digits: int
+    point: float
+    volume_min: float
+    volume_step: float
+    volume_max: float
+    contract_size: float
+    bid: float = 0.0
+    ask: float = 0.0
+    tick_time: float = 0.0
+    bars: Dict[int, list] = field(default_factory=dict)   # M1 minute -> [o, h, l, c, ticks]
+    replay: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+    replay_pos: int = 0
+
+
+@dataclass
+class _Position:
+    ticket: int
+    time: float
+    symbol: str
+    type: int
+    volume: float
+    price_open: float
+    magic: int = 0
+    comment: str = ""
+
+
+@dataclass
+class _Order:
+    ticket: int
+    time: float
+    symbol: str
+    type: int
+    volume: float
+    price: float
+    magic: int = 0
+    comment: str = ""
+
+
+class MT5Simulator:
+    """Module-like object: attributes mirror the MetaTrader5 API."""
+
+    def __init__(self, *, margin_mode: str = "netting", balance: float = 100_000.0, leverage: int = 100,
+                 latency: Optional[Mapping[str, Tuple[float, float]]] = None,
+                 requote_prob: float = 0.0, partial_fill_prob: float = 0.0,
+                 seed: Optional[int] = None, clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        margin_mode: "netting" (one position per symbol) or "hedging"
+        latency: per-call (mean, jitter) seconds, e.g. {"order_send": (0.02, 0.005), "*": (0.0005, 0.0)}
+        requote_prob / partial_fill_prob: chance a market order is requoted / partially filled
+        """
+        if margin_mode not in ("netting", "hedging"):
+            raise ValueError(f"margin_mode must be 'netting' or 'hedging', got {margin_mode!r}")
+        self.margin_mode = margin_mode
+        self.balance = float(balance)
+        self.leverage = int(leverage)
+        self.latency = dict(latency or {})
+        self.requote_prob = float(requote_prob)
+        self.partial_fill_prob = float(partial_fill_prob)
+        self.calls: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.RLock()
+        self._connected = False
+        self._last_error = (1, "Success")
+        self._symbols: Dict[str, _Symbol] = {}
+        self._positions: Dict[int, _Position] = {}
+        self._orders: Dict[int, _Order] = {}
+        self._deals: List[TradeDeal] = []
+        self._tickets = iter(range(1_000_001, 10**12))
+        self._replay_origin: Dict[str, Tuple[float, float, float]] = {}
+
+        # expose constants like the real module does
+        for name, value in globals().items():
+            if name.isupper() and isinstance(value, int):
+                setattr(self, name, value)
+
+    # -------------------- scenario setup --------------------
+
+    def add_symbol(self, name: str, *, digits: int = 5, bid: float = 0.0, ask: float = 0.0,
+                   volume_min: float = 0.01, volume_step: float = 0.01, volume_max: float = 100.0,
+                   contract_size: float = 100_000.0, point: Optional[float] = None) -> None:
+        with self._lock:
+            self._symbols[name] = _Symbol(name, digits, point or 10.0 ** -digits, volume_min, volume_step,
+                                          volume_max, contract_size)
+            if bid > 0 and ask > 0:
+                self._apply_tick(self._symbols[name], self._clock(), bid, ask)
+
+    def set_quote(self, symbol: str, bid: float, ask: float, at: Optional[float] = None) -> None:
+        """Push one tick now (or at `at`); pending orders crossing it are filled."""
+        with self._lock:
+            self._apply_tick(self._symbols[symbol], self._clock() if at is None else at, bid, ask)
+
+    def replay_ticks(self, symbol: str, source, *, start_at: Optional[float] = None, speed: float = 1.0) -> int:
+        """
+        Queue ticks for `symbol`: a CSV path (columns time or time_msc, bid, ask), an
+        array with those fields, or an iterable of (time, bid, ask). The first tick
+        is played at `start_at` (default: now) and the rest at `speed` x real spacing.
+        Returns the number of ticks queued.
+        """
+        if isinstance(source, str):
+            with open(source, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+            t = np.array([float(r["time_msc"]) / 1000 if r.get("time_msc") else float(r["time"]) for r in rows])
+            bid = np.array([float(r["bid"]) for r in rows])
+            ask = np.array([float(r["ask"]) for r in rows])
+        elif isinstance(source, np.ndarray) and source.dtype.names:
+            names = source.dtype.names
+            t = source["time_msc"] / 1000.0 if "time_msc" in names else source["time"].astype("float64")
+            bid, ask = source["bid"].astype("float64"), source["ask"].astype("float64")
+        else:
+            arr = np.asarray(list(source), dtype="float64").reshape(-1, 3)
+            t, bid, ask = arr[:, 0], arr[:, 1], arr[:, 2]
+        order = np.argsort(t, kind="stable")
+        with self._lock:
+            sym = self._symbols[symbol]
+            sym.replay, sym.replay_pos = (t[order], bid[order], ask[order]), 0
+            origin = self._clock() if start_at is None else float(start_at)
+            self._replay_origin[symbol] = (origin, float(t[order][0]) if len(t) else 0.0, float(speed))
+        return len(t)
+
+    def load_rates(self, symbol: str, rates) -> None:
+        """Seed M1 history from an array/iterable of (time, open, high, low, close[, tick_volume])."""
+        with self._lock:
+            sym = self._symbols[symbol]
+            for r in rates:
+                r = tuple(r)
+                sym.bars[int(r[0]) // 60] = [float(r[1]), float(r[2]), float(r[3]), float(r[4]),
+                                             int(r[5]) if len(r) > 5 else 1]
+
+    # -------------------- internals --------------------
+
+    def _call(self, name: str) -> None:
+        self.calls[name] += 1
+        mean, jitter = self.latency.get(name, self.latency.get("*", (0.0, 0.0)))
+        delay = mean + (self._rng.uniform(-jitter, jitter) if jitter else 0.0)
+        if delay > 0:
+            self._sleep(delay)
+        self._advance_replay()
+
+    def _advance_replay(self) -> None:
+        if not self._replay_origin:
+            return
+        now = self._clock()
+        with self._lock:
+            for name, (origin, t0, speed) in self._replay_origin.items():
+                sym = self._symbols[name]
+                t, bid, ask = sym.replay
+                # ticks whose replay time has come: origin + (t - t0) / speed <= now
+                end = int(np.searchsorted(t, t0 + (now - origin) * speed, side="right"))
+                for i in range(sym.replay_pos, end):
+                    self._apply_tick(sym, origin + (t[i] - t0) / speed, float(bid[i]), float(ask[i]))
+                sym.replay_pos = max(sym.replay_pos, end)
+
+    def _apply_tick(self, sym: _Symbol, at: float, bid: float, ask: float) -> None:
+        sym.bid, sym.ask, sym.tick_time = bid, ask, at
+        mid = (bid + ask) / 2
+        minute = int(at) // 60
+        bar = sym.bars.get(minute)
+        if bar is None:
+            sym.bars[minute] = [mid, mid, mid, mid, 1]
+        else:
+            bar[1], bar[2], bar[3], bar[4] = max(bar[1], mid), min(bar[2], mid), mid, bar[4] + 1
+        self._fill_crossed_orders(sym, at)
+
+    def _fill_crossed_orders(self, sym: _Symbol, at: float) -> None:
+        for o in [o for o in self._orders.values() if o.symbol == sym.name]:
+            buy = o.type in (ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_BUY_STOP)
+            market = sym.ask if buy else sym.bid
+            crossed = {
+                ORDER_TYPE_BUY_LIMIT: sym.ask <= o.price, ORDER_TYPE_SELL_LIMIT: sym.bid >= o.price,
+                ORDER_TYPE_BUY_STOP: sym.ask >= o.price, ORDER_TYPE_SELL_STOP: sym.bid <= o.price,
+            }[o.type]
+            if crossed:
+                del self._orders[o.ticket]
+                price = o.price if o.type in (ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_LIMIT) else market
+                self._execute(sym, buy, o.volume, price, at, order=o.ticket, magic=o.magic, comment=o.comment)
+
+    def _usd_per(self, ccy: str) -> float:
+        if ccy == "USD":
+            return 1.0
+        for name, s in self._symbols.items():
+            if s.bid <= 0:
+                continue
+            if name.startswith(ccy + "USD"):
+                return (s.bid + s.ask) / 2
+            if name.startswith("USD" + ccy):
+                return 2.0 / (s.bid + s.ask)
+        return 1.0
+
+    def _profit(self, sym: _Symbol, typ: int, volume: float, open_price: float, close_price: float) -> float:
+        sign = 1.0 if typ == POSITION_TYPE_BUY else -1.0
+        quote = sym.name[3:6] if len(sym.name) >= 6 else "USD"
+        return sign * (close_price - open_price) * volume * sym.contract_size * self._usd_per(quote)
+
+    def _deal(self, sym: _Symbol, buy: bool, volume: float, price: float, at: float, entry: int,
+              profit: float, position_id: int, order: int, magic: int, comment: str) -> int:
+        ticket = next(self._tickets)
+        self._deals.append(TradeDeal(ticket, order, int(at), int(at * 1000),
+                                     DEAL_TYPE_BUY if buy else DEAL_TYPE_SELL, entry, sym.name,
+                                     round(volume, 8), price, round(profit, 2), position_id, magic, comment))
+        self.balance += profit
+        return ticket
+
+    def _close_part(self, sym, pos: _Position, volume: float, price: float, at: float,
+                    order: int, magic: int, comment: str, entry: int = DEAL_ENTRY_OUT) -> int:
+        profit = self._profit(sym, pos.type, volume, pos.price_open, price)
+        pos.volume = round(pos.volume - volume, 8)
+        if pos.volume <= 1e-9:
+            del self._positions[pos.ticket]
+        return self._deal(sym, pos.type == POSITION_TYPE_SELL, volume, price, at, entry, profit,
+                          pos.ticket, order, magic, comment)
+
+    def _execute(self, sym: _Symbol, buy: bool, volume: float, price: float, at: float, *,
+                 order: int, magic: int = 0, comment: str = "", position: int = 0) -> int:
+        """Book a fill; returns the deal ticket."""
+        typ = POSITION_TYPE_BUY if buy else POSITION_TYPE_SELL
+        if self.margin_mode == "hedging":
+            pos = self._positions.get(position) if position else None
+            if pos is not None and pos.type != typ:
+                return self._close_part(sym, pos, min(volume, pos.volume), price, at, order, magic, comment)
+            ticket = next(self._tickets)
+            self._positions[ticket] = _Position(ticket, at, sym.name, typ, volume, price, magic, comment)
+            return self._deal(sym, buy, volume, price, at, DEAL_ENTRY_IN, 0.0, ticket, order, magic, comment)
+
+        pos = next((p for p in self._positions.values() if p.symbol == sym.name), None)
+        if pos is None:
+            ticket = next(self._tickets)
+            self._positions[ticket] = _Position(ticket, at, sym.name, typ, volume, price, magic, comment)
+            return self._deal(sym, buy, volume, price, at, DEAL_ENTRY_IN, 0.0, ticket, order, magic, comment)
+        if pos.type == typ:
+            total = pos.volume + volume
+            pos.price_open = (pos.price_open * pos.volume + price * volume) / total
+            pos.volume = round(total, 8)
+            return self._deal(sym, buy, volume, price, at, DEAL_ENTRY_IN, 0.0, pos.ticket, order, magic, comment)
+        if volume <= pos.volume + 1e-9:
+            return self._close_part(sym, pos, volume, price, at, order, magic, comment)
+        # reversal: close the whole position and open the remainder the other way in one INOUT deal
+        rest = round(volume - pos.volume, 8)
+        profit = self._profit(sym, pos.type, pos.volume, pos.price_open, price)
+        pos.type, pos.volume, pos.price_open, pos.time = typ, rest, price, at
+        return self._deal(sym, buy, volume, price, at, DEAL_ENTRY_INOUT, profit, pos.ticket, order, magic, comment)
+
+    def _floating(self, pos: _Position) -> Tuple[float, float]:
+        sym = self._symbols[pos.symbol]
+        current = sym.bid if pos.type == POSITION_TYPE_BUY else sym.ask
+        return current, self._profit(sym, pos.type, pos.volume, pos.price_open, current)
+
+    def _margin(self, sym: _Symbol, volume: float, price: float) -> float:
+        quote = sym.name[3:6] if len(sym.name) >= 6 else "USD"
+        return volume * sym.contract_size * price * self._usd_per(quote) / self.leverage
+
+    def _result(self, retcode: int, request: dict, comment: str, *, deal: int = 0, order: int = 0,
+                volume: float = 0.0, price: float = 0.0, sym: Optional[_Symbol] = None) -> OrderSendResult:
+        self._last_error = (1, "Success") if retcode in (TRADE_RETCODE_DONE, TRADE_RETCODE_DONE_PARTIAL,
+                                                         TRADE_RETCODE_PLACED) else (retcode, comment)
+        return OrderSendResult(retcode, deal, order, volume, price, sym.bid if sym else 0.0,
+                               sym.ask if sym else 0.0, comment, 0, request)
+
+    # -------------------- MetaTrader5 API --------------------
+
+    def initialize(self, *args, **kwargs) -> bool:
+        self._call("initialize")
+        self._connected = True
+        return True
+
+    def login(self, *args, **kwargs) -> bool:
+        self._call("login")
+        return self._connected
+
+    def shutdown(self) -> None:
+        self._connected = False
+
+    def last_error(self):
+        return self._last_error
+
+    def terminal_info(self):
+        self._call("terminal_info")
+        return TerminalInfo(self._connected, True, 0)
+
+    def account_info(self):
+        self._call("account_info")
+        with self._lock:
+            floating = sum(self._floating(p)[1] for p in self._positions.values())
+            margin = sum(self._margin(self._symbols[p.symbol], p.volume, p.price_open)
+                         for p in self._positions.values())
+        equity = self.balance + floating
+        return AccountInfo(1, round(self.balance, 2), round(equity, 2), round(floating, 2), round(margin, 2),
+                           round(equity - margin, 2), round(equity / margin * 100, 2) if margin else 0.0,
+                           self.leverage, "USD",
+                           ACCOUNT_MARGIN_MODE_RETAIL_HEDGING if self.margin_mode == "hedging"
+                           else ACCOUNT_MARGIN_MODE_RETAIL_NETTING)
+
+    def symbol_select(self, symbol, enable=True) -> bool:
+        self._call("symbol_select")
+        return symbol in self._symbols
+
+    def symbol_info(self, symbol):
+        self._call("symbol_info")
+        s = self._symbols.get(symbol)
+        if s is None:
+            return None
+        base, profit = (s.name[:3], s.name[3:6]) if len(s.name) >= 6 else (s.name, "USD")
+        return SymbolInfo(s.name, s.digits, s.point, s.volume_min, s.volume_step, s.volume_max,
+                          s.contract_size, base, profit, True)
+
+    def symbol_info_tick(self, symbol):
+        self._call("symbol_info_tick")
+        s = self._symbols.get(symbol)
+        if s is None or s.bid <= 0:
+            return None
+        return Tick(int(s.tick_time), s.bid, s.ask, 0.0, 0, int(s.tick_time * 1000), 6, 0.0)
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        self._call("copy_rates_from_pos")
+        s = self._symbols.get(symbol)
+        minutes = _TF_MINUTES.get(timeframe)
+        if s is None or minutes is None:
+            return None
+        with self._lock:
+            grouped: Dict[int, list] = {}
+            for m in sorted(s.bars):
+                o, h, l, c, n = s.bars[m]
+                k = m // minutes
+                g = grouped.get(k)
+                if g is None:
+                    grouped[k] = [o, h, l, c, n]
+                else:
+                    g[1], g[2], g[3], g[4] = max(g[1], h), min(g[2], l), c, g[4] + n
+        keys = sorted(grouped)
+        stop = len(keys) - int(start_pos)
+        keys = keys[max(0, stop - int(count)):max(0, stop)]
+        out = np.zeros(len(keys), dtype=RATES_DTYPE)
+        for i, k in enumerate(keys):
+            o, h, l, c, n = grouped[k]
+            out[i] = (k * minutes * 60, o, h, l, c, n, 0, 0)
+        return out
+
+    def positions_get(self, symbol=None, group=None, ticket=None):
+        self._call("positions_get")
+        with self._lock:
+            rows = []
+            for p in self._positions.values():
+                if (symbol is not None and p.symbol != symbol) or (ticket is not None and p.ticket != ticket):
+                    continue
+                current, profit = self._floating(p)
+                rows.append(TradePosition(p.ticket, int(p.time), p.symbol, p.type, p.volume, p.price_open,
+                                          current, round(profit, 2), p.magic, p.comment, p.ticket))
+        return tuple(rows)
+
+    def positions_total(self) -> int:
+        return len(self._positions)
+
+    def orders_get(self, symbol=None, group=None, ticket=None):
+        self._call("orders_get")
+        with self._lock:
+            return tuple(TradeOrder(o.ticket, int(o.time), o.symbol, o.type, o.volume, o.volume, o.price,
+                                    o.magic, o.comment)
+                         for o in self._orders.values()
+                         if (symbol is None or o.symbol == symbol) and (ticket is None or o.ticket == ticket))
+
+    def history_deals_get(self, date_from=None, date_to=None, group=None, ticket=None, position=None):
+        self._call("history_deals_get")
+        lo = date_from.timestamp() if isinstance(date_from, datetime) else float(date_from or 0)
+        hi = date_to.timestamp() if isinstance(date_to, datetime) else float(date_to or float("inf"))
+        with self._lock:
+            return tuple(d for d in self._deals
+                         if (ticket is not None and d.order == ticket)
+                         or (position is not None and d.position_id == position)
+                         or (ticket is None and position is None and lo <= d.time <= hi))
+
+    def order_calc_margin(self, action, symbol, volume, price):
+        self._call("order_calc_margin")
+        s = self._symbols.get(symbol)
+        return None if s is None else round(self._margin(s, float(volume), float(price)), 2)
+
+    def order_send(self, request: dict):
+        self._call("order_send")
+        with self._lock:
+            action = request.get("action")
+            sym = self._symbols.get(request.get("symbol", ""))
+            if action == TRADE_ACTION_REMOVE:
+                o = self._orders.pop(int(request.get("order", 0)), None)
+                if o is None:
+                    return self._result(TRADE_RETCODE_INVALID_ORDER, request, "Invalid order")
+                return self._result(TRADE_RETCODE_DONE, request, "Request executed", order=o.ticket)
+            if sym is None or sym.bid <= 0:
+                return self._result(TRADE_RETCODE_INVALID, request, "Invalid request", sym=sym)
+            volume = float(request.get("volume", 0.0))
+            steps = volume / sym.volume_step
+            if volume < sym.volume_min or volume > sym.volume_max or abs(steps - round(steps)) > 1e-6:
+                return self._result(TRADE_RETCODE_INVALID_VOLUME, request, "Invalid volume", sym=sym)
+            typ = request.get("type")
+            magic, comment = int(request.get("magic", 0)), str(request.get("comment", ""))
+            now = self._clock()
+
+            if action == TRADE_ACTION_PENDING:
+                if typ not in (ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_LIMIT, ORDER_TYPE_BUY_STOP, ORDER_TYPE_SELL_STOP):
+                    return self._result(TRADE_RETCODE_INVALID, request, "Invalid order type", sym=sym)
+                price = float(request.get("price", 0.0))
+                if price <= 0:
+                    return self._result(TRADE_RETCODE_INVALID_PRICE, request, "Invalid price", sym=sym)
+                ticket = next(self._tickets)
+                self._orders[ticket] = _Order(ticket, now, sym.name, typ, volume, price, magic, comment)
+                self._fill_crossed_orders(sym, now)  # marketable limits fill at once
+                return self._result(TRADE_RETCODE_PLACED, request, "Request executed", order=ticket,
+                                    volume=volume, price=price, sym=sym)
+
+            if action != TRADE_ACTION_DEAL or typ not in (ORDER_TYPE_BUY, ORDER_TYPE_SELL):
+                return self._result(TRADE_RETCODE_INVALID, request, "Invalid request", sym=sym)
+            buy = typ == ORDER_TYPE_BUY
+            market = sym.ask if buy else sym.bid
+            requested = float(request.get("price") or market)
+            deviation = float(request.get("deviation", 0)) * sym.point
+            if self._rng.random() < self.requote_prob or (request.get("price") and abs(requested - market) > deviation + 1e-12):
+                return self._result(TRADE_RETCODE_REQUOTE, request, "Requote", sym=sym)
+
+            retcode, fill = TRADE_RETCODE_DONE, volume
+            if self._rng.random() < self.partial_fill_prob:
+                if request.get("type_filling", ORDER_FILLING_FOK) == ORDER_FILLING_FOK:
+                    return self._result(TRADE_RETCODE_REJECT, request, "No liquidity for FOK", sym=sym)
+                part = np.floor(volume * self._rng.uniform(0.3, 0.9) / sym.volume_step) * sym.volume_step
+                if part >= sym.volume_min:
+                    retcode, fill = TRADE_RETCODE_DONE_PARTIAL, round(float(part), 8)
+            order = next(self._tickets)
+            deal = self._execute(sym, buy, fill, market, now, order=order, magic=magic, comment=comment,
+                                 position=int(request.get("position", 0)))
+            return self._result(retcode, request, "Request executed" + (" partially" if fill < volume else ""),
+                                deal=deal, order=order, volume=fill, price=market, sym=sym)
@@ -0,0 +1,13 @@
+"""
+`MT5Manager` shim for offline runs: put simulators/shim on PYTHONPATH and the
+project imports the fake SDK in simulators/mt5_manager.py unchanged.
+Tune the flow with simulators.mt5_manager.configure(...) before connecting.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+from simulators.mt5_manager import *  # noqa: E402,F401,F403
+from simulators.mt5_manager import ManagerAPI, EnPumpModes, configure, flow  # noqa: E402,F401
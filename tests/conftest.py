@@ -243,6 +243,22 @@ def reset_config():
             CONFIG[k] = orig[k]
 
 
+@pytest.fixture
+def make_engine():
+    # Build TradingEngines that are closed on teardown (reporting/feed threads, store, journal)
+    from trade_logic.engine import TradingEngine
+    engines = []
+
+    def _make(*args, **kwargs):
+        engine = TradingEngine(*args, **kwargs)
+        engines.append(engine)
+        return engine
+
+    yield _make
+    for engine in engines:
+        engine.close()
+
+
 @pytest.fixture
 def stub_trend_allow(monkeypatch):
     # Always allow trades; trend=up
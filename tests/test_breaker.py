@@ -0,0 +1,32 @@
+def test_breaker_opens_by_class_backs_off_and_probes_half_open():
+    from trade_logic.breaker import CircuitBreakers
+
+    now = [0.0]
+    cb = CircuitBreakers(max_backoff=100.0, clock=lambda: now[0])
+
+    cb.record("EURUSD", 10004)                    # requote: transient, needs 3 in a row
+    cb.record("EURUSD", 10004)
+    assert cb.allow("EURUSD") and cb.state("EURUSD").state == "closed"
+    cb.record("EURUSD", 10009)                    # success resets
+    assert cb.snapshot() == {}
+
+    cb.record("GBPUSD", 10019)                    # no money: opens at once for 120s, capped at 100
+    assert not cb.allow("GBPUSD") and cb.label("GBPUSD") == "open (no_money, 100s)"
+    now[0] = 100.0
+    assert cb.allow("GBPUSD") and cb.label("GBPUSD") == "half-open"
+    cb.record("GBPUSD", 10018)                    # failed probe re-opens with a doubled backoff
+    st = cb.state("GBPUSD")
+    assert (st.state, st.last_class, st.trips) == ("open", "market_closed", 2)
+    assert cb.snapshot()["GBPUSD"]["retry_in"] == 100.0
+    now[0] = 200.0
+    assert cb.allow("GBPUSD")
+    cb.record("GBPUSD", 10008)                    # a placed pending order is a success too
+    assert cb.allow("GBPUSD") and cb.snapshot() == {}
+
+
+def test_disabled_breakers_never_block():
+    from trade_logic.breaker import CircuitBreakers
+
+    cb = CircuitBreakers(enabled=False)
+    cb.record("EURUSD", 10018)
+    assert cb.allow("EURUSD") and cb.label("EURUSD") == ""
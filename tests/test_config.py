@@ -0,0 +1,65 @@
+import os
+import time
+import pytest
+
+
+def _write(path, name, body):
+    path.write_text(f"{name} = {body!r}\n", encoding="utf-8")
+
+
+def test_compile_config_resolves_per_symbol_params(patch_mt5_in_sys_modules):
+    from config import CONFIG, SYMBOL_CONFIG
+    from config.snapshot import compile_config, ConfigError
+
+    snap = compile_config(CONFIG, SYMBOL_CONFIG)
+    eur = snap.symbols["EURUSD"]
+    assert eur.terminal_symbol == SYMBOL_CONFIG["symbol_mapping"]["EURUSD"]
+    assert eur.multiplier == CONFIG["trade_management"]["trade_size_multiplier"]
+    assert eur.max_position_size == CONFIG["trade_management"]["max_position_size"]
+
+    bad = dict(CONFIG, limit_orders=dict(CONFIG["limit_orders"], market_order_percentage=1.5))
+    with pytest.raises(ConfigError, match="market_order_percentage"):
+        compile_config(bad, SYMBOL_CONFIG)
+
+
+def test_config_store_hot_reload_keeps_last_good_snapshot(tmp_path, patch_mt5_in_sys_modules):
+    from config.snapshot import ConfigStore, compile_config
+
+    cfg_path, sym_path = tmp_path / "config.py", tmp_path / "symbol_config.py"
+    cfg = {"trade_management": {"trade_size_multiplier": 1.0, "max_position_size": 10}}
+    sym = {"symbols": ["EURUSD"], "symbol_mapping": {"EURUSD": "EURUSD.ecn"}}
+    _write(cfg_path, "CONFIG", cfg)
+    _write(sym_path, "SYMBOL_CONFIG", sym)
+
+    store = ConfigStore(compile_config(cfg, sym), paths=(str(cfg_path), str(sym_path)), check_interval=0)
+    store.override("routing", consolidate_to_usd=True)
+
+    cfg["trade_management"]["trade_size_multiplier"] = 0.5
+    _write(cfg_path, "CONFIG", cfg)
+    os.utime(cfg_path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    snap = store.refresh()
+    assert snap.version == 1 and snap.symbols["EURUSD"].multiplier == 0.5
+    assert snap.routing.consolidate_to_usd is True  # override survives reload
+
+    cfg["trade_management"]["trade_size_multiplier"] = -1
+    _write(cfg_path, "CONFIG", cfg)
+    os.utime(cfg_path, ns=(time.time_ns(), time.time_ns() + 2 * 10**9))
+    assert store.refresh() is snap
+    assert "trade_size_multiplier" in store.last_error
+
+    snap = store.clear_override("routing", "consolidate_to_usd")
+    assert snap.routing.consolidate_to_usd is False and snap.symbols["EURUSD"].multiplier == 0.5
+
+
+def test_config_snapshot_imports_no_trading_stack(tmp_path):
+    import os, subprocess, sys
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        f"import sys; sys.path.insert(0, {root!r})\n"
+        "from config.snapshot import ConfigStore\n"
+        "ConfigStore.from_modules()\n"
+        "print(sorted(m for m in ('numpy', 'MetaTrader5', 'trade_logic') if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "[]"
@@ -44,3 +44,226 @@ def test_terminal_client_current_position_aggregation(patch_mt5_in_sys_modules):
 
     assert term.get_current_position("XAUUSD") == 0.80
     assert term.get_current_position("EURUSD") == 0.20
+
+
+def test_terminal_client_net_positions_nets_the_whole_book(patch_mt5_in_sys_modules):
+    import MetaTrader5 as mt5
+    from data_access.data_access import TerminalClient
+
+    book = [mt5._Position("XAUUSD", mt5.POSITION_TYPE_BUY, 1.5), mt5._Position("XAUUSD", mt5.POSITION_TYPE_SELL, 0.5),
+            mt5._Position("EURUSD.ecn", mt5.POSITION_TYPE_SELL, 0.2)]
+    net = TerminalClient().net_positions(book)               # an earlier positions_get() result
+    assert net == {"XAUUSD": 1.0, "EURUSD.ecn": -0.2}
+
+
+def test_price_resolver_triangulates_missing_cross(patch_mt5_in_sys_modules):
+    from types import SimpleNamespace
+    from data_access.prices import PriceResolver
+
+    class Term:
+        def __init__(self):
+            self.calls = []
+            self.ticks = {
+                "EURUSD.x": SimpleNamespace(bid=1.0999, ask=1.1001, time=990),
+                "USDJPY.x": SimpleNamespace(bid=149.99, ask=150.01, time=995),
+            }
+        def symbol_info_tick(self, symbol):
+            self.calls.append(symbol)
+            return self.ticks.get(symbol)
+
+    term = Term()
+    now = [1000.0]
+    res = PriceResolver(term, {"EURUSD": "EURUSD.x", "USDJPY": "USDJPY.x", "EURJPY": "EURJPY.x"},
+                        {"EUR": "EURUSD", "JPY": "USDJPY"}, clock=lambda: now[0])
+
+    q = res.quote("EURJPY")
+    assert abs(q.mid - 1.1 * 150.0) < 1e-9
+    assert q.source == "cross:EURUSD*USDJPY" and q.age is None   # first sight: age unknown
+    assert res.quote("EURUSD").source == "tick"
+    # one tick read per symbol per cycle
+    res.quote("EURJPY")
+    assert sorted(term.calls) == ["EURJPY.x", "EURUSD.x", "USDJPY.x"]
+
+    # ages run on the local clock from first sight; server stamps (time=990/995) are only identities
+    now[0] += 12.0
+    term.ticks["USDJPY.x"] = SimpleNamespace(bid=149.98, ask=150.0, time=1007)
+    res.begin_cycle()
+    assert res.quote("EURUSD").age == 12.0 and res.quote("USDJPY").age == 0.0
+    assert res.quote("EURJPY").age == 12.0                   # oldest leg
+
+
+def test_group_exposure_aggregator_incremental_and_filtered(patch_mt5_in_sys_modules):
+    from types import SimpleNamespace as P
+    from data_access.exposure import GroupExposureAggregator
+
+    groups = {1: "real\\A-book", 2: "real\\B-book", 3: "demo\\test"}
+    agg = GroupExposureAggregator(groups.get)
+    agg.seed([
+        P(Position=10, Login=1, Symbol="EURUSD", Action=0, Volume=20000),
+        P(Position=11, Login=2, Symbol="EURUSD", Action=1, Volume=5000),
+        P(Position=12, Login=3, Symbol="EURUSD", Action=0, Volume=90000),
+    ])
+    agg.OnPositionUpdate(P(Position=10, Login=1, Symbol="EURUSD", Action=0, Volume=30000))
+    agg.OnPositionAdd(P(Position=13, Login=1, Symbol="USDJPY", Action=1, Volume=10000))
+    agg.OnPositionDelete(P(Position=11))
+
+    rows = {r["symbol"]: r for r in agg.net_rows("real\\*")}
+    assert rows["EURUSD"]["net_volume"] == 3.0 and rows["EURUSD"]["positions"] == 1
+    assert rows["USDJPY"]["net_volume"] == -1.0
+
+    rows = {r["symbol"]: r for r in agg.net_rows("*,!demo*")}
+    assert rows["EURUSD"]["buy_volume"] == 3.0
+    assert {r["symbol"]: r["net_volume"] for r in agg.net_rows("*")}["EURUSD"] == 12.0
+
+
+def test_group_exposure_aggregator_seed_after_subscribe_and_user_moves(patch_mt5_in_sys_modules):
+    from types import SimpleNamespace as P
+    from data_access.exposure import GroupExposureAggregator
+
+    groups = {1: "real\\A-book", 2: "real\\B-book"}
+    lookups = []
+    agg = GroupExposureAggregator(lambda login: lookups.append(agg._lock.locked()) or groups.get(login))
+
+    class Snapshot:
+        # the pump fires while the snapshot is being loaded
+        def __iter__(self):
+            yield P(Position=10, Login=1, Symbol="EURUSD", Action=0, Volume=10000)
+            agg.OnPositionDelete(P(Position=11))
+            agg.OnPositionUpdate(P(Position=12, Login=2, Symbol="EURUSD", Action=0, Volume=50000))
+            yield P(Position=11, Login=1, Symbol="EURUSD", Action=0, Volume=20000)  # stale: closed
+            yield P(Position=12, Login=2, Symbol="EURUSD", Action=0, Volume=40000)  # stale: resized
+
+    agg.seed(Snapshot())
+    assert {r["symbol"]: r["net_volume"] for r in agg.net_rows("*")} == {"EURUSD": 6.0}
+    agg.OnPositionAdd(P(Position=13, Login=1, Symbol="EURUSD", Action=0, Volume=10000))
+    assert agg.net_rows("*")[0]["positions"] == 3  # seeding over, the pump applies normally
+
+    assert agg.net_rows("real\\A-book")[0]["net_volume"] == 2.0
+    agg.OnUserUpdate(P(Login=1, Group="real\\B-book"))
+    assert agg.net_rows("real\\A-book") == []
+    assert agg.net_rows("real\\B-book")[0]["net_volume"] == 7.0
+    agg.OnUserDelete(P(Login=2))
+    groups[2] = "real\\C-book"
+    agg.OnPositionAdd(P(Position=14, Login=2, Symbol="EURUSD", Action=0, Volume=10000))
+    assert agg.net_rows("real\\C-book")[0]["net_volume"] == 1.0
+    assert lookups and not any(lookups)  # UserGet round-trips never run under the lock
+
+
+def test_price_feed_swaps_table_and_flags_stale(patch_mt5_in_sys_modules):
+    import MetaTrader5 as mt5
+    from data_access.price_feed import PriceFeed
+    from data_access.prices import PriceResolver
+    from data_access.data_access import TerminalClient
+
+    now = [1000.0]
+    mt5._ticks["EURUSD"] = mt5._Tick(bid=1.1000, ask=1.1002)
+    mt5._ticks["GBPUSD"] = mt5._Tick(bid=0.0, ask=0.0)  # no quote
+    feed = PriceFeed(TerminalClient(), ["EURUSD", "GBPUSD"], stale_seconds=5.0, clock=lambda: now[0])
+    before = feed.table
+    feed.poll_once()
+    assert feed.table is not before and before.mid("EURUSD") is None  # readers keep their snapshot
+    assert abs(feed.table.mid("EURUSD") - 1.1001) < 1e-12
+    assert feed.table.stale(5.0, now=now[0]) == ["GBPUSD"]  # never ticked
+
+    # resolver serves fresh rows from the table, falls back to a direct read once stale
+    resolver = PriceResolver(TerminalClient(), {}, {}, clock=lambda: now[0], feed=feed)
+    mt5._ticks["EURUSD"] = mt5._Tick(bid=1.2000, ask=1.2002)
+    assert abs(resolver.mid("EURUSD") - 1.1001) < 1e-12
+    now[0] += 10.0
+    resolver.begin_cycle()
+    assert feed.table.stale(5.0, now=now[0]) == ["EURUSD", "GBPUSD"]
+    assert abs(resolver.mid("EURUSD") - 1.2001) < 1e-12
+
+    feed.start()
+    assert feed.running
+    feed.stop()
+    assert not feed.running
+
+
+def test_price_feed_ages_ticks_by_local_receive_time(patch_mt5_in_sys_modules):
+    from types import SimpleNamespace
+    from data_access.price_feed import PriceFeed
+
+    now = [1000.0]
+    ticks = {"EURUSD": SimpleNamespace(bid=1.1, ask=1.1002, time=1000 + 3 * 3600, time_msc=(1000 + 3 * 3600) * 1000)}
+    term = SimpleNamespace(symbol_info_tick=ticks.get)
+    feed = PriceFeed(term, ["EURUSD"], clock=lambda: now[0])
+    feed.poll_once()
+    assert feed.table.age(now[0])[0] == 0.0                  # server clock 3 h ahead: not "from the future"
+    now[0] += 8.0
+    feed.poll_once()                                         # same tick again
+    assert feed.table.stale(5.0, now=now[0]) == ["EURUSD"]
+    ticks["EURUSD"] = SimpleNamespace(bid=1.1, ask=1.1002, time=1000 + 3 * 3600, time_msc=(1000 + 3 * 3600) * 1000 + 7)
+    feed.poll_once()
+    assert feed.table.stale(5.0, now=now[0]) == []
+
+
+def test_order_rate_limiter_bursts_then_throttles_and_times_out():
+    from data_access.rate_limit import OrderRateLimiter
+
+    lim = OrderRateLimiter(per_second=50, burst=2, per_symbol_per_second=1, per_symbol_burst=1)
+    assert lim.acquire("EURUSD") == 0.0 and lim.acquire("GBPUSD") == 0.0
+    assert lim.acquire("USDJPY") >= 0.015                   # account bucket empty: ~1/50 s
+    assert lim.acquire("EURUSD", timeout=0.1) is None        # symbol bucket needs ~1 s
+    s = lim.stats()["normal"]
+    assert (s["orders"], s["waited"], s["timeouts"]) == (3, 1, 1) and s["wait_max"] >= 0.015
+
+
+def test_order_rate_limiter_serves_risk_lane_first():
+    import threading
+    import time
+    from data_access.rate_limit import OrderRateLimiter
+
+    lim = OrderRateLimiter(per_second=10, burst=1)
+    lim.acquire("EURUSD")                                    # bucket empty; next token in ~0.1 s
+    order = []
+    normal = threading.Thread(target=lambda: lim.acquire("EURUSD") is not None and order.append("normal"))
+    risk = threading.Thread(target=lambda: lim.acquire("EURUSD", lane="risk") is not None and order.append("risk"))
+    normal.start()
+    time.sleep(0.03)
+    risk.start()
+    normal.join(2)
+    risk.join(2)
+    assert order == ["risk", "normal"]
+    assert lim.stats()["risk"]["orders"] == 1 and lim.stats()["normal"]["wait_max"] > lim.stats()["risk"]["wait_max"]
+
+    # a risk order is never dropped: past its wait it borrows, and normal orders pay the debt
+    lim.configure(per_second=1, burst=1)
+    lim.acquire("EURUSD")
+    assert lim.acquire("EURUSD", lane="risk", timeout=0.01) is not None
+    assert lim.acquire("EURUSD", timeout=0.01) is None
+    assert lim.stats()["risk"]["borrowed"] == 1
+
+
+def test_async_terminal_reads_concurrently_within_the_worker_bound(patch_mt5_in_sys_modules):
+    import asyncio
+    import threading
+    import time
+    from data_access.async_terminal import AsyncTerminalClient
+
+    active, peak, lock = [0], [0], threading.Lock()
+
+    class SlowTerminal:
+        def _read(self, symbol, *args):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            if symbol == "BAD":
+                raise RuntimeError("IPC timeout")
+            return symbol
+        symbol_info_tick = symbol_info = copy_rates_from_pos = _read
+
+        def positions_get(self):
+            return None
+
+    aterm = AsyncTerminalClient(SlowTerminal(), max_workers=3)
+    symbols = ["EURUSD", "GBPUSD", "USDJPY", "BAD", "EURUSD"]
+    snap = asyncio.run(aterm.read_snapshot(symbols, bars=10, timeframe=1))
+    aterm.close()
+    assert peak[0] == 3                                      # overlapped, never past the pool size
+    assert snap.ticks == {"EURUSD": "EURUSD", "GBPUSD": "GBPUSD", "USDJPY": "USDJPY", "BAD": None}
+    assert snap.rates["GBPUSD"] == "GBPUSD" and snap.positions == ()
+
@@ -0,0 +1,65 @@
+import random
+
+
+def test_decide_matches_scalar_rounding_and_gating(patch_mt5_in_sys_modules):
+    from trade_logic.decision import decide
+    from utils.utils import round_down_to_step
+
+    rng = random.Random(7)
+    n = 2000
+    net = [rng.uniform(-50, 50) for _ in range(n)]
+    pos = [round(rng.uniform(-5, 5), 2) for _ in range(n)]
+    mult = [rng.choice([0.05, 0.1, 1.0]) for _ in range(n)]
+    lot = [rng.choice([0.01, 0.1, 1.0]) for _ in range(n)]
+    cap = [rng.choice([1.0, 5.0, 300.0]) for _ in range(n)]
+    trends = [rng.choice(["up", "down", "neutral"]) for _ in range(n)]
+
+    for follow in (True, False):
+        batch = decide([f"S{i}" for i in range(n)], net, pos, mult, lot, cap, trends,
+                       follow_position=follow, allow_neutral=False, allow_opposite=False)
+        for i in range(n):
+            target = net[i] * mult[i] if follow else -net[i] * mult[i]
+            delta = round_down_to_step(target - pos[i], lot[i])
+            if abs(delta) < lot[i]:
+                reason = f"Delta too small: {delta:.2f}"
+            elif (trends[i] == "neutral" or (trends[i] == "down" and target > pos[i])
+                  or (trends[i] == "up" and target < pos[i])):
+                reason = "Trade conditions not met"
+            elif abs(pos[i] + delta) > cap[i]:
+                reason = "Exceeds max position size"
+            else:
+                reason = "Initialized"
+            assert batch.target[i] == target and batch.delta[i] == delta
+            assert batch.reason(i) == reason
+
+
+def test_execution_order_ranks_by_abs_notional_and_caps():
+    import numpy as np
+    from trade_logic.decision import execution_order
+
+    send, queued = execution_order([5.0, -50.0, float("nan"), 20.0, 20.0])
+    assert send.tolist() == [1, 3, 4, 0, 2] and queued.tolist() == []
+    send, queued = execution_order(np.array([5.0, -50.0, float("nan"), 20.0]), max_legs=2)
+    assert send.tolist() == [1, 3] and queued.tolist() == [0, 2]
+
+
+def test_joint_rounding_nets_remainders_across_currencies():
+    import numpy as np
+    from trade_logic.decision import decide, residual_by_currency
+
+    # three EUR/USD legs each needing +0.6 lot with a 1-lot step: floor drops all 1.8 lots,
+    # joint rounding trades two of them and leaves 0.2 lot of EUR (and USD) unhedged
+    syms = ["EURUSD", "EURUSD2", "EURUSD3"]
+    bases, quotes = ["EUR"] * 3, ["USD"] * 3
+    args = (syms, [0.0] * 3, [-0.6, -0.6, -0.6], [1.0] * 3, [1.0] * 3, [300.0] * 3, ["up"] * 3)
+    kw = dict(follow_position=True, allow_neutral=True, allow_opposite=True)
+    u = np.full(3, 100_000.0)
+
+    floor = decide(*args, **kw)
+    joint = decide(*args, **kw, lot_rounding="joint", usd_per_lot=u, bases=bases, quotes=quotes)
+    assert floor.delta.tolist() == [0.0, 0.0, 0.0] and np.allclose(floor.residual, 0.6)
+    assert np.abs(joint.delta).sum() == 2.0
+    res_floor = residual_by_currency(floor.residual, u, bases, quotes)
+    res_joint = residual_by_currency(joint.residual, u, bases, quotes)
+    assert abs(res_joint["EUR"]) < abs(res_floor["EUR"]) and abs(res_joint["EUR"]) <= 0.5 * u[0]
+    assert abs(res_joint["USD"]) == abs(res_joint["EUR"])
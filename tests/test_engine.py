@@ -10,9 +10,8 @@ def _fake_manager_rows():
     ]
 
 
-def test_engine_cycle_executes_when_allowed(monkeypatch, patch_mt5_in_sys_modules, reset_config):
+def test_engine_cycle_executes_when_allowed(monkeypatch, patch_mt5_in_sys_modules, reset_config, make_engine):
     import MetaTrader5 as mt5
-    from trade_logic.engine import TradingEngine
     from data_access.data_access import TerminalClient
     from config import CONFIG
 
@@ -36,19 +35,22 @@ def test_engine_cycle_executes_when_allowed(monkeypatch, patch_mt5_in_sys_module
     CONFIG["trade_management"]["trade_size_multiplier"] = 0.05
     CONFIG["trade_management"]["max_position_size"] = 300.0
 
-    engine = TradingEngine(_fake_manager_rows, TerminalClient())
+    engine = make_engine(_fake_manager_rows, TerminalClient())
     out = engine.cycle()
 
     assert "usd_rows" in out and "pair_rows" in out
     # We should have attempted trades; stub fills market DEAls
     assert out["trades_executed"] >= 1
-    # GUI row shape includes PNL column
-    assert set(out["usd_rows"][0].keys()) >= {"Symbol", "Trade Delta", "PNL"}
+    # raw typed rows; the GUIs format them
+    from trade_logic.decision import DecisionRow
+    row = out["usd_rows"][0]
+    assert isinstance(row, DecisionRow) and not hasattr(row, "__dict__")
+    assert isinstance(row.delta_position, float) and isinstance(row.pnl, float)
+    assert set(row.as_dict()) >= {"Symbol", "Trade Delta", "PNL"}
 
 
-def test_engine_blocks_on_daily_loss_and_auto_close(monkeypatch, patch_mt5_in_sys_modules, reset_config):
+def test_engine_blocks_on_daily_loss_and_auto_close(monkeypatch, patch_mt5_in_sys_modules, reset_config, make_engine):
     import MetaTrader5 as mt5
-    from trade_logic.engine import TradingEngine
     from data_access.data_access import TerminalClient
     from config import CONFIG
 
@@ -65,9 +67,341 @@ def test_engine_blocks_on_daily_loss_and_auto_close(monkeypatch, patch_mt5_in_sy
     CONFIG["risk_management"]["daily_loss_limit"] = -5000.0
     CONFIG["risk_management"]["auto_close_on_daily_loss_limit"] = True
 
-    engine = TradingEngine(_fake_manager_rows, TerminalClient())
+    engine = make_engine(_fake_manager_rows, TerminalClient())
     res = engine.cycle()
     # No trades executed
     assert res.get("trades_executed", 0) == 0
     # Auto-close should have cleared positions
     assert len(mt5._positions) == 0
+
+
+def test_engine_carries_forward_unchanged_symbols(monkeypatch, patch_mt5_in_sys_modules, reset_config, make_engine):
+    import MetaTrader5 as mt5
+    from data_access.data_access import TerminalClient
+    from config import CONFIG
+
+    mt5._ticks["XAUUSD"] = mt5._Tick(bid=2400.00, ask=2400.20)
+    mt5._ticks["EURUSD"] = mt5._Tick(bid=1.1000, ask=1.1002)
+    mt5._positions.clear()
+    mt5._deals.clear()
+    CONFIG["risk_management"]["daily_loss_limit"] = -1000.0
+    CONFIG["trade_management"]["max_position_size"] = 0.001  # every leg blocked → nothing trades
+    CONFIG["runtime"]["change_detection"] = {"enabled": True, "net_epsilon": 0.0,
+                                             "position_epsilon": 0.0, "mid_rel_epsilon": 0.001}
+
+    bar = [1_700_000_000]
+    monkeypatch.setattr(mt5, "copy_rates_from_pos", lambda s, tf, pos, n: [{"close": 100.0, "time": bar[0]}] * n)
+
+    calls = []
+    import trade_logic.engine as eng
+    real = eng.compute_trend_metrics_batch
+    monkeypatch.setattr(eng, "compute_trend_metrics_batch",
+                        lambda syms, **kw: calls.append(list(syms)) or real(syms, **kw))
+
+    engine = make_engine(_fake_manager_rows, TerminalClient())
+    first = engine.cycle()
+    n = len(first["usd_rows"])
+    assert n >= 1 and first["carried_legs"] == 0 and len(calls[-1]) == n
+
+    second = engine.cycle()  # nothing moved
+    assert second["carried_legs"] == n and calls[-1] == []
+    assert [r.reason for r in second["usd_rows"]] == [r.reason for r in first["usd_rows"]]
+
+    eurusd = engine._map.get("EURUSD", "EURUSD")
+    mt5._ticks[eurusd] = mt5._Tick(bid=1.1200, ask=1.1202)  # EURUSD mid moves
+    third = engine.cycle()
+    assert "EURUSD" in calls[-1] and third["carried_legs"] == n - len(calls[-1])
+
+    bar[0] += 300  # a new bar opens; mids unchanged, but the trend inputs moved
+    fourth = engine.cycle()
+    assert fourth["carried_legs"] == 0 and len(calls[-1]) == n
+
+
+def test_engine_sends_largest_notional_first_and_queues_past_cap(patch_mt5_in_sys_modules, reset_config, make_engine):
+    import MetaTrader5 as mt5
+    from data_access.data_access import TerminalClient
+    from config import CONFIG
+
+    rows = [
+        {"symbol": "EURUSD", "net_volume": -2.0, "positions": 5, "buy_volume": 5.0, "sell_volume": 7.0, "timestamp": "t"},
+        {"symbol": "GBPUSD", "net_volume": 6.0, "positions": 8, "buy_volume": 9.0, "sell_volume": 3.0, "timestamp": "t"},
+    ]
+    mt5._positions.clear()
+    mt5._deals.clear()
+    CONFIG["risk_management"]["daily_loss_limit"] = -1000.0
+    CONFIG["trade_management"]["trade_size_multiplier"] = 0.5
+    CONFIG["trade_management"]["max_position_size"] = 300.0
+    CONFIG["trade_management"]["max_legs_per_cycle"] = 1
+
+    engine = make_engine(lambda: rows, TerminalClient())
+    mt5._ticks[engine._map.get("EURUSD", "EURUSD")] = mt5._Tick(bid=1.1000, ask=1.1002)
+    mt5._ticks[engine._map.get("GBPUSD", "GBPUSD")] = mt5._Tick(bid=1.2700, ask=1.2702)
+    out = engine.cycle()
+    ex = out["execution"]
+    assert (ex["approved"], ex["sent"], ex["queued"]) == (2, 1, 1)
+    first, second = ex["largest"]
+    assert first["symbol"] == "GBPUSD" and first["usd_notional"] > second["usd_notional"]
+    assert first["status"] == "executed" and first["time_to_hedge"] >= 0 and first["waiting"] is None
+    assert second["symbol"] == "EURUSD" and second["status"] == "queued" and second["waiting"] >= 0
+    reasons = {r.symbol: r.reason for r in out["usd_rows"]}
+    assert reasons["EURUSD"].startswith("Queued") and reasons["GBPUSD"] == "Trade executed"
+
+    # the queued leg is re-decided next cycle and goes out, its hedge clock kept from the first read
+    again = engine.cycle()["execution"]
+    assert again["largest"][0]["symbol"] == "EURUSD" and again["largest"][0]["status"] == "executed"
+    assert again["largest"][0]["time_to_hedge"] >= second["waiting"]
+
+
+def test_engine_reporting_runs_after_the_cycle_returns(monkeypatch, patch_mt5_in_sys_modules, reset_config, make_engine):
+    import threading
+    import MetaTrader5 as mt5
+    import trade_logic.engine as eng
+    from data_access.data_access import TerminalClient
+    from config import CONFIG
+
+    mt5._positions.clear()
+    mt5._deals.clear()
+    CONFIG["risk_management"]["daily_loss_limit"] = -1000.0
+    CONFIG["runtime"]["deferred_reporting"] = True
+
+    release, written = threading.Event(), []
+    monkeypatch.setattr(eng, "write_exposure_tables", lambda df, base: release.wait(2) and written.append(len(df)))
+    callers = set()
+    for name in ("positions_get", "account_info", "history_deals_get"):
+        real = getattr(mt5, name)
+        monkeypatch.setattr(mt5, name, lambda *a, _real=real:
+                            callers.add(threading.current_thread().name) or _real(*a))
+
+    engine = make_engine(_fake_manager_rows, TerminalClient())
+    out = engine.cycle()
+    assert out["usd_rows"] and out["timings"]["decide_to_send_ms"] >= 0
+    assert written == [] and engine.reporting.pending == 1   # cycle did not wait for the report
+
+    release.set()
+    engine.close()                                            # drains queued reports
+    assert written == [len(out["usd_rows"])]
+    assert len(engine.history) == 1                          # the report also fed the dashboards' history
+    assert {r.symbol for r in out["usd_rows"]} <= set(engine.history.symbols())
+    assert callers == {threading.current_thread().name}     # the worker never touched MT5
+
+
+def test_engine_stops_sending_to_a_symbol_whose_breaker_is_open(patch_mt5_in_sys_modules, reset_config, make_engine):
+    import MetaTrader5 as mt5
+    from data_access.data_access import TerminalClient
+    from config import CONFIG
+
+    mt5._positions.clear()
+    mt5._deals.clear()
+    CONFIG["risk_management"]["daily_loss_limit"] = -1000.0
+    CONFIG["trade_management"]["trade_size_multiplier"] = 0.5
+    CONFIG["runtime"]["circuit_breaker"] = {"enabled": True, "max_backoff_seconds": 3600.0}
+
+    term = TerminalClient()
+    sent = []
+    term.order_send = lambda req, **kw: sent.append(req["symbol"]) or SimpleNamespace(retcode=10018, comment="Market closed")
+    rows = [{"symbol": "EURUSD", "net_volume": -2.0, "positions": 5, "buy_volume": 5.0, "sell_volume": 7.0,
+             "timestamp": "t"}]
+    engine = make_engine(lambda: rows, term)
+
+    first = engine.cycle()
+    assert len(sent) == 1 and first["trades_executed"] == 0
+    assert first["breakers"]["EURUSD"]["class"] == "market_closed"
+
+    second = engine.cycle()
+    row = next(r for r in second["usd_rows"] if r.symbol == "EURUSD")
+    assert len(sent) == 1                                    # no round-trip while open
+    assert row.reason.startswith("Breaker open (market_closed") and row.breaker.startswith("open")
+    assert second["execution"]["largest"][0]["status"] == "breaker_open"
+
+
+def test_engine_journals_intents_and_blocks_unconfirmed_symbols(tmp_path, patch_mt5_in_sys_modules, reset_config, make_engine):
+    import MetaTrader5 as mt5
+    from data_access.data_access import TerminalClient
+    from trade_logging.journal import IntentJournal
+    from config import CONFIG
+
+    mt5._positions.clear()
+    mt5._deals.clear()
+    CONFIG["risk_management"]["daily_loss_limit"] = -1000.0
+    CONFIG["trade_management"]["trade_size_multiplier"] = 0.5
+    rows = [{"symbol": "EURUSD", "net_volume": -2.0, "positions": 5, "buy_volume": 5.0, "sell_volume": 7.0,
+             "timestamp": "t"}]
+    path = str(tmp_path / "intents.jsonl")
+
+    # a crash left an EURUSD intent without an outcome, and the server has no trace of it yet
+    j = IntentJournal(path)
+    j.intent(j.new_cid(), "EURUSD", {"symbol": "EURUSD.ecn", "volume": 1.0, "type": 0})
+    j.close()
+
+    term = TerminalClient()
+    sent = []
+    term.order_send = lambda req, **kw: sent.append(req["comment"]) or SimpleNamespace(retcode=10009, comment="done")
+    engine = make_engine(lambda: rows, term, journal=IntentJournal(path, settle_seconds=30.0))
+    assert engine.journal_report["in_flight"] == 1
+
+    out = engine.cycle()
+    row = next(r for r in out["usd_rows"] if r.symbol == "EURUSD")
+    assert sent == [] and row.reason == "Awaiting confirmation of an earlier order"
+
+    engine.journal.settle_seconds = 0.0                       # old enough: it never arrived
+    out = engine.cycle()
+    assert out["journal"]["lost"] == 1 and out["trades_executed"] == 1
+    assert len(sent) == 1 and sent[0].startswith("ij") and not engine.journal.open_intents()
+    engine.close()
+    assert IntentJournal(path).oldest_open() is None
+
+
+def test_engine_throttled_send_is_closed_and_not_held_against_the_symbol(tmp_path, patch_mt5_in_sys_modules, reset_config, make_engine):
+    import MetaTrader5 as mt5
+    from data_access.data_access import TerminalClient
+    from data_access.rate_limit import THROTTLED
+    from trade_logging.journal import IntentJournal
+    from config import CONFIG
+
+    mt5._positions.clear()
+    CONFIG["risk_management"]["daily_loss_limit"] = -1000.0
+    CONFIG["trade_management"]["trade_size_multiplier"] = 0.5
+    CONFIG["runtime"]["circuit_breaker"] = {"enabled": True, "max_backoff_seconds": 3600.0}
+    rows = [{"symbol": "EURUSD", "net_volume": -2.0, "positions": 5, "buy_volume": 5.0, "sell_volume": 7.0,
+             "timestamp": "t"}]
+    term = TerminalClient()
+    term.order_send = lambda req, **kw: THROTTLED
+    engine = make_engine(lambda: rows, term, journal=IntentJournal(str(tmp_path / "intents.jsonl")))
+    for _ in range(4):                                       # past the transient threshold
+        out = engine.cycle()
+        assert out["trades_executed"] == 0
+    assert not engine.journal.open_intents() and out["breakers"] == {}
+    row = next(r for r in out["usd_rows"] if r.symbol == "EURUSD")
+    assert row.reason == "Trade failed"                      # retried every cycle, never "awaiting confirmation"
+
+
+def test_engine_journal_finds_fills_stamped_in_server_time(tmp_path, monkeypatch, patch_mt5_in_sys_modules, reset_config, make_engine):
+    import time
+    import MetaTrader5 as mt5
+    from data_access.data_access import TerminalClient
+    from trade_logging.journal import IntentJournal
+
+    path = str(tmp_path / "intents.jsonl")
+    j = IntentJournal(path)
+    cid = j.new_cid()
+    j.intent(cid, "EURUSD", {"symbol": "EURUSD.ecn", "volume": 1.0, "type": 0, "price": 1.1})
+    j.close()
+
+    # broker server runs UTC+3: the fill is stamped three hours "ahead" of local epoch
+    fill = SimpleNamespace(comment=cid, time=time.time() + 3 * 3600, ticket=9, order=4, volume=1.0, price=1.1, profit=0.0)
+    monkeypatch.setattr(mt5, "history_deals_get",
+                        lambda t0, t1: [d for d in (fill,) if t0 <= d.time <= t1])
+    engine = make_engine(lambda: [], TerminalClient(), journal=IntentJournal(path, settle_seconds=0.0))
+    assert engine.journal_report["filled"] == 1 and engine.journal_report["lost"] == 0
+
+
+def test_engine_acycle_reads_concurrently_and_matches_cycle(monkeypatch, patch_mt5_in_sys_modules, reset_config, make_engine):
+    import asyncio
+    import threading
+    import MetaTrader5 as mt5
+    from data_access.data_access import TerminalClient
+    from config import CONFIG
+
+    mt5._positions.clear()
+    mt5._deals.clear()
+    CONFIG["risk_management"]["daily_loss_limit"] = -1000.0
+    CONFIG["trade_management"]["trade_size_multiplier"] = 0.5
+    CONFIG["runtime"]["async_reads"] = {"max_workers": 4}
+
+    reads = []
+    for name in ("symbol_info_tick", "copy_rates_from_pos"):
+        real = getattr(mt5, name)
+        monkeypatch.setattr(mt5, name, lambda *a, _real=real, _name=name:
+                            reads.append((_name, threading.current_thread().name)) or _real(*a))
+
+    sync = make_engine(_fake_manager_rows, TerminalClient()).cycle()
+    mt5._positions.clear()                                    # same starting book for the async run
+    engine = make_engine(_fake_manager_rows, TerminalClient())
+    reads.clear()
+    out = asyncio.run(engine.acycle())
+    engine.close()
+
+    assert out["timings"]["prefetch_ms"] >= 0 and engine.aterm is None
+    assert [(r.symbol, r.target_position, r.reason) for r in out["usd_rows"]] == \
+           [(r.symbol, r.target_position, r.reason) for r in sync["usd_rows"]]
+    bars = [t for name, t in reads if name == "copy_rates_from_pos"]
+    assert bars and all(t.startswith("mt5-read") for t in bars)   # none left for the cycle thread
+
+
+def test_engine_reads_deals_stamped_behind_the_local_clock(monkeypatch, patch_mt5_in_sys_modules, reset_config, make_engine):
+    import time
+    import MetaTrader5 as mt5
+    from data_access.data_access import TerminalClient
+
+    # broker server runs two hours behind local time
+    server = lambda: time.time() - 2 * 3600
+    deals = [SimpleNamespace(ticket=1, time=server(), symbol="EURUSD", entry=1, profit=-40.0)]
+    monkeypatch.setattr(mt5, "history_deals_get", lambda t0, t1: [d for d in deals if t0 <= d.time <= t1])
+    engine = make_engine(lambda: [], TerminalClient())
+    assert engine._todays_realized_pnl() == -40.0
+
+    deals.append(SimpleNamespace(ticket=2, time=server(), symbol="EURUSD", entry=1, profit=-25.0))
+    assert engine._todays_realized_pnl() == -65.0            # behind a local-time cursor, still read
+
+
+def test_engine_records_slippage_from_the_fill_price(monkeypatch, patch_mt5_in_sys_modules, reset_config, make_engine):
+    import MetaTrader5 as mt5
+    from data_access.data_access import TerminalClient
+    from config import CONFIG
+
+    mt5._positions.clear()
+    mt5._deals.clear()
+    CONFIG["risk_management"]["daily_loss_limit"] = -1000.0
+    CONFIG["trade_management"]["trade_size_multiplier"] = 0.5
+    rows = [{"symbol": "EURUSD", "net_volume": -2.0, "positions": 5, "buy_volume": 5.0, "sell_volume": 7.0,
+             "timestamp": "t"}]
+    term = TerminalClient()
+    term.order_send = lambda req, **kw: SimpleNamespace(retcode=10009, comment="done",
+                                                        price=req["price"] + 3 * 0.00001)
+    engine = make_engine(lambda: rows, term)
+    mt5._symbol_info[engine._map.get("EURUSD", "EURUSD")] = mt5._Info(digits=5, point=0.00001)
+    trades = []
+    monkeypatch.setattr(engine, "_record_trade", trades.append)
+    assert engine.cycle()["trades_executed"] == 1
+    side = 1 if trades[0]["trade_type"] == "BUY" else -1
+    assert trades[0]["slippage_points"] == 3.0 * side        # paid 3 points more on a buy
+
+
+def test_engine_runs_on_a_terminal_without_rate_limiting(patch_mt5_in_sys_modules, reset_config, make_engine):
+    import MetaTrader5 as mt5
+    from config import CONFIG
+
+    CONFIG["risk_management"]["daily_loss_limit"] = -1000.0
+    CONFIG["trade_management"]["trade_size_multiplier"] = 0.5
+
+    class Term:  # only the read/order methods, no lanes or limiter
+        sent = []
+        positions_get = staticmethod(lambda: [])
+        orders_get = staticmethod(lambda: [])
+        symbol_info = staticmethod(mt5.symbol_info)
+        symbol_info_tick = staticmethod(mt5.symbol_info_tick)
+
+        def order_send(self, req):
+            self.sent.append(req["symbol"])
+            return SimpleNamespace(retcode=10009, comment="done")
+
+    rows = [{"symbol": "EURUSD", "net_volume": -2.0, "positions": 5, "buy_volume": 5.0, "sell_volume": 7.0,
+             "timestamp": "t"}]
+    engine = make_engine(lambda: rows, Term())
+    out = engine.cycle()
+    assert out["trades_executed"] == 1 and len(Term.sent) == 1 and out["order_rate"] is None
+
+
+def test_engine_logs_a_risk_close_that_did_not_go_through(patch_mt5_in_sys_modules, reset_config, make_engine):
+    import MetaTrader5 as mt5
+    from data_access.data_access import TerminalClient
+
+    term = TerminalClient()
+    term.order_send = lambda req, **kw: SimpleNamespace(retcode=10018, comment="Market closed")
+    term.positions_get = lambda: [mt5._Position("XAUUSD", mt5.POSITION_TYPE_BUY, 1.0)]
+    engine = make_engine(lambda: [], term)
+    written = []
+    engine.rejections._writer = written.extend
+    assert engine._close_all_positions() == 0
+    engine.rejections.flush()
+    assert written[0]["reason"] == "risk close failed: Market closed" and written[0]["delta_position"] == -1.0
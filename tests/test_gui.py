@@ -4,6 +4,7 @@ import pytest
 def test_gui_smoke(monkeypatch):
     import tkinter as tk
     from gui.gui import TradingGUI
+    from trade_logic.decision import DecisionRow
 
     root = tk.Tk()
     root.withdraw()
@@ -11,9 +12,7 @@ def test_gui_smoke(monkeypatch):
 
     payload = {
         "usd_rows": [
-            {"Symbol": "XAUUSD", "Net USD Position": "4.00", "Trade Position": "0.00",
-             "Target Position": "-0.20", "Trade Delta": "-0.20", "Trend": "Up",
-             "Trend Strength": 0.001, "RSI": 55.0, "MACD": 0.1, "Reason": "Test", "PNL": 0.0}
+            DecisionRow("XAUUSD", 4.0, 0.0, -0.2, -0.2, "up", 0.001, 55.0, 0.1, "Test", pnl=0.0)
         ],
         "pair_rows": [
             {"Symbol": "XAUUSD", "Trades": 10, "Long": 23.0, "Short": 8.0, "Net Position": 4.0}
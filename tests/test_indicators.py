@@ -0,0 +1,43 @@
+import math
+import random
+
+
+def test_trend_metrics_batch_matches_per_symbol(patch_mt5_in_sys_modules):
+    import numpy as np
+    from indicators.indicators import compute_trend_metrics, compute_trend_metrics_batch
+
+    rng = random.Random(3)
+    bars = 120
+    lengths = [120, 80, 51, 50, 30, 14, 0]  # full, padded, and too-short histories
+    mat = np.full((len(lengths), bars), np.nan)
+    series = []
+    for i, n in enumerate(lengths):
+        px, closes = 1.1, []
+        for _ in range(n):
+            px *= 1 + rng.gauss(0, 0.001)
+            closes.append(px)
+        series.append(closes)
+        if n:
+            mat[i, bars - n:] = closes
+
+    symbols = [f"S{i}" for i in range(len(lengths))]
+    batch = compute_trend_metrics_batch(symbols, mat)
+    for i, closes in enumerate(series):
+        one, many = compute_trend_metrics(symbols[i], closes), batch[i]
+        assert one.trend == many.trend
+        assert math.isclose(one.sma_diff, many.sma_diff, rel_tol=1e-9, abs_tol=1e-12)
+        for a, b in ((one.rsi, many.rsi), (one.macd, many.macd)):
+            assert (a is None) == (b is None)
+            if a is not None:
+                assert math.isclose(a, b, rel_tol=1e-7, abs_tol=1e-12)
+
+
+def test_trend_metrics_batch_takes_indicator_settings_from_the_caller(patch_mt5_in_sys_modules):
+    import numpy as np
+    from config import CONFIG
+    from indicators.indicators import compute_trend_metrics_batch
+
+    closes = np.linspace(1.0, 2.0, 60)[None, :]
+    params = {**CONFIG["indicators"], "short_sma_period": 5, "long_sma_period": 10}
+    default, reloaded = compute_trend_metrics_batch(["S"], closes), compute_trend_metrics_batch(["S"], closes, params=params)
+    assert reloaded.sma_diff[0] != default.sma_diff[0]
@@ -29,3 +29,207 @@ def test_csv_writers(tmp_path):
     assert any(f.startswith("daily_summary_") for f in os.listdir(date_folder))
     assert "exposure_net_positions.csv" in os.listdir(date_folder)
     assert "previous_net_positions.csv" in os.listdir(date_folder)
+
+
+def test_trade_store_batched_writes_queries_and_csv_export(tmp_path):
+    import csv
+    from trade_logging.store import TradeStore, TABLE_COLUMNS
+
+    store = TradeStore(str(tmp_path / "store.sqlite3"))
+    assert store.query("PRAGMA journal_mode")[0]["journal_mode"] == "wal"
+
+    store.add("rejections", {"symbol": "EURUSD", "reason": "Exceeds max position size", "timestamp": "2099-01-02 10:00:00"})
+    store.add("rejections", {"symbol": "USDJPY", "reason": "Trade conditions not met", "timestamp": "2099-01-02 10:00:01"})
+    store.add("rejections", {"symbol": "EURUSD", "reason": "Trade conditions not met", "timestamp": "2099-01-03 09:00:00", "note": "x"})
+    assert store.recent("rejections") == []  # nothing visible until the cycle flush
+    assert store.flush() == 3
+
+    rows = store.recent("rejections", symbol="EURUSD", since="2099-01-01 00:00:00")
+    assert [r["timestamp"] for r in rows] == ["2099-01-03 09:00:00", "2099-01-02 10:00:00"]
+    assert rows[0]["note"] == "x"
+
+    out = tmp_path / "rejected.csv"
+    assert store.export_csv("rejections", str(out), day="2099-01-02") == 2
+    with open(out, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f))
+    assert header == list(TABLE_COLUMNS["rejections"])
+    store.close()
+
+
+def test_daily_stats_streaming_updates_and_dedup():
+    from types import SimpleNamespace as D
+    from trade_logging.stats import DailyStats
+
+    st = DailyStats()
+    st.on_trade({"symbol": "EURUSD", "trade_type": "BUY", "slippage_points": 2})
+    st.on_trade({"symbol": "USDJPY", "trade_type": "SELL", "slippage_points": 0})
+    st.on_trade({"symbol": "USDJPY", "trade_type": "SELL", "slippage_points": None})  # recovered: unknown
+    deals = [
+        D(ticket=1, symbol="EURUSD", entry=0, profit=0.0),
+        D(ticket=2, symbol="EURUSD", entry=1, profit=50.0),
+        D(ticket=3, symbol="USDJPY", entry=1, profit=-20.0),
+    ]
+    for d in deals + deals[1:]:  # overlapping history windows
+        st.on_deal(d)
+
+    s = st.summary(unrealized_pnl=5.0)
+    assert (s["total_trades"], s["buy_trades"], s["sell_trades"]) == (3, 1, 2)
+    assert (s["win_trades"], s["loss_trades"]) == (1, 1)
+    assert s["avg_profit"] == 50.0 and s["avg_loss"] == -20.0
+    assert s["avg_slippage_points"] == 1.0 and s["realized_pnl"] == 30.0
+    assert {r["symbol"]: r["realized_pnl"] for r in st.symbol_rows()} == {"EURUSD": 50.0, "USDJPY": -20.0}
+
+    assert st.changed(s) is True
+    assert st.changed(st.summary(unrealized_pnl=5.0)) is False
+    assert st.changed(st.summary(unrealized_pnl=-12.5)) is False  # ticks alone don't rewrite the file
+    st.on_deal(D(ticket=4, symbol="USDJPY", entry=1, profit=1.0))
+    assert st.changed(st.summary(unrealized_pnl=-12.5)) is True
+
+
+def test_rejection_tracker_run_length_encodes_states():
+    from trade_logging.rejections import RejectionTracker
+
+    written, now = [], [1000.0]
+    tr = RejectionTracker(written.extend, heartbeat_seconds=300, clock=lambda: now[0])
+    blocked = {"symbol": "EURUSD", "reason": "Exceeds max position size"}
+
+    for _ in range(100):  # one blocked symbol, 100 cycles x 60s
+        tr.begin_cycle()
+        tr.observe(dict(blocked))
+        tr.end_cycle(["EURUSD", "USDJPY"])
+        tr.flush()
+        now[0] += 60
+    assert written[0]["state"] == "open"
+    assert {r["state"] for r in written[1:]} == {"heartbeat"}
+    assert len(written) < 25 and written[-1]["count"] > 90
+
+    tr.begin_cycle()
+    tr.end_cycle(["EURUSD"])  # evaluated, not rejected any more
+    tr.flush()
+    assert written[-1]["state"] == "closed" and written[-1]["count"] == 100
+    assert tr.open_records() == {}
+
+    # two reasons for one symbol are tracked independently
+    over, small = dict(blocked), {"symbol": "EURUSD", "reason": "Below minimum lot"}
+    for rows in ([over, small], [over, small], [over]):
+        tr.begin_cycle()
+        for r in rows:
+            tr.observe(dict(r))
+        tr.end_cycle(["EURUSD"])
+    tr.flush()
+    assert [(r["reason"], r["state"]) for r in written[-3:]] == [
+        (over["reason"], "open"), (small["reason"], "open"), (small["reason"], "closed")]
+    assert tr.open_records()[("EURUSD", over["reason"])]["count"] == 3
+
+
+def test_rejected_csv_keeps_columns_aligned_when_rows_widen(tmp_path):
+    import csv
+    from trade_logging.logger import log_rejected_csv_rows
+
+    log_rejected_csv_rows([{"symbol": "EURUSD", "reason": "r1"}], base_dir=str(tmp_path))
+    log_rejected_csv_rows([{"reason": "r2", "symbol": "USDJPY"}], base_dir=str(tmp_path))
+    log_rejected_csv_rows([{"symbol": "GBPUSD", "reason": "r3", "count": 4, "state": "open"}],
+                          base_dir=str(tmp_path))
+    (day,) = tmp_path.iterdir()
+    (path,) = day.iterdir()
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["symbol"], r["reason"], r["state"]) for r in rows] == [
+        ("EURUSD", "r1", ""), ("USDJPY", "r2", ""), ("GBPUSD", "r3", "open")]
+
+
+def test_queue_logger_encodes_off_thread_and_samples(tmp_path):
+    import json
+    import threading
+    from trade_logging.logger import get_logger, log_json, flush_logging, set_event_sampling
+
+    log = get_logger("test_queue_logger", base_dir=str(tmp_path))
+    encoded_on = []
+
+    class Probe:
+        def __str__(self):
+            encoded_on.append(threading.current_thread().name)
+            return "probe"
+
+    set_event_sampling("tick", 5)
+    try:
+        for i in range(10):
+            log_json(log, event="tick", i=i)
+        log_json(log, event="probe", obj=Probe())
+        flush_logging()
+    finally:
+        set_event_sampling("tick", 1)
+
+    assert encoded_on and threading.main_thread().name not in encoded_on
+    path = os.path.join(str(tmp_path), datetime.now().strftime("%Y-%m-%d"), "runtime.log")
+    with open(path, encoding="utf-8") as f:
+        events = [json.loads(line.split("] ", 1)[1]) for line in f]
+    assert [e["i"] for e in events if e["event"] == "tick"] == [0, 5]
+    assert events[-1] == {"event": "probe", "obj": "probe"}
+
+
+def test_reporting_worker_runs_in_order_drops_oldest_and_survives_errors():
+    import threading
+    from trade_logging.reporting import ReportingWorker
+
+    gate, seen = threading.Event(), []
+    w = ReportingWorker(max_pending=2).start()
+    w.submit(gate.wait)                 # occupies the worker
+    assert not w.drain(timeout=0.05)
+    for i in range(3):                  # backlog of 2: job 0 is dropped
+        w.submit(seen.append, i)
+    w.submit(lambda: 1 / 0)             # displaces job 1
+    gate.set()
+    assert w.drain(timeout=2)
+    assert seen == [2] and w.dropped == 2 and w.errors == 1
+    assert isinstance(w.last_error, ZeroDivisionError)
+    w.stop()
+    assert not w.running
+
+
+def test_exposure_history_is_a_fixed_size_ring():
+    import numpy as np
+    from trade_logging.history import ExposureHistory, sparkline
+
+    h = ExposureHistory(capacity=3, initial_symbols=1)
+    for i in range(5):
+        syms = ["EURUSD", "GBPUSD"] if i % 2 else ["EURUSD"]
+        h.record(syms, net=[float(i)] * len(syms), position=[0.0] * len(syms),
+                 target=[1.0] * len(syms), pnl=[-float(i)] * len(syms), t=100.0 + i)
+    assert len(h) == 3 and h.symbols() == ["EURUSD", "GBPUSD"]
+    assert h.series("EURUSD").tolist() == [2.0, 3.0, 4.0]
+    assert np.isnan(h.series("GBPUSD")[[0, 2]]).all() and h.series("GBPUSD", "pnl")[1] == -3.0
+    assert h.times().tolist() == [102.0, 103.0, 104.0] and h.series("XAUUSD").size == 0
+    assert sparkline([1.0, float("nan"), 3.0]) == "▁ █" and sparkline([]) == ""
+
+
+def test_intent_journal_replays_and_reconciles_open_intents(tmp_path):
+    from types import SimpleNamespace
+    from trade_logging.journal import IntentJournal
+
+    path = str(tmp_path / "intents.jsonl")
+    j = IntentJournal(path, settle_seconds=30.0)
+    cids = [j.new_cid() for _ in range(4)]
+    assert len(set(cids)) == 4 and all(len(c) <= 31 for c in cids)
+    for cid, sym in zip(cids, ["EURUSD", "GBPUSD", "USDJPY", "AUDUSD"]):
+        j.intent(cid, sym, {"symbol": sym + ".ecn", "volume": 1.0, "type": 0})
+    j.outcome(cids[3], "done", retcode=10009)
+    j.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"cid": "torn')                             # crash mid-write
+
+    j = IntentJournal(path, settle_seconds=30.0)              # restart: three intents without an outcome
+    assert j.blocked_symbols() == {"EURUSD", "GBPUSD", "USDJPY"}
+    t0 = j.oldest_open()
+    deals = [SimpleNamespace(comment=cids[0], ticket=7, volume=1.0, price=1.1)]
+    orders = [SimpleNamespace(comment=cids[1], ticket=8)]
+    rep = j.reconcile(orders, deals, now=t0 + 1.0)
+    assert [r["symbol"] for r in rep["filled"]] == ["EURUSD"] and rep["filled"][0]["deals"] == deals
+    assert [r["symbol"] for r in rep["placed"]] == ["GBPUSD"]
+    assert [r["symbol"] for r in rep["in_flight"]] == ["USDJPY"] and not rep["lost"]
+
+    rep = j.reconcile([], [], now=t0 + 31.0)                 # never reached the server
+    assert [r["symbol"] for r in rep["lost"]] == ["USDJPY"] and not j.open_intents()
+    j.compact()
+    j.close()
+    assert open(path, encoding="utf-8").read() == ""
@@ -0,0 +1,68 @@
+import numpy as np
+
+
+class _Term:
+    """Minimal terminal surface used by MarginTable."""
+    def __init__(self):
+        self.calls = 0
+
+    def order_calc_margin(self, action, symbol, volume, price):
+        self.calls += 1
+        return 1000.0
+
+    def account_info(self):
+        return None
+
+
+def _risk(limits):
+    from trade_logic.risk import PreTradeRisk, MarginTable
+    term = _Term()
+    return PreTradeRisk(limits, MarginTable(term, {}), lambda s: 100000.0,
+                        {"EUR": "EURUSD", "JPY": "USDJPY"}), term
+
+
+def test_currency_cap_scales_only_adverse_legs(patch_mt5_in_sys_modules):
+    from trade_logic.risk import RiskLimits
+
+    risk, _ = _risk(RiskLimits(currency_net_usd_caps={"EUR": 220000.0}))
+    mids = {"EURUSD": 1.10, "USDJPY": 150.0}
+    # EURUSD buy 4 lots -> +440k USD of EUR, cap 220k -> scaled to 2 lots
+    v = risk.evaluate(["EURUSD", "USDJPY"], [0.0, 1.0], [4.0, -0.5], [0.01, 0.01], mids)
+
+    assert np.isclose(v.approved_delta[0], 2.0)
+    assert v.reasons[0].startswith("Risk: scaled")
+    # USDJPY reduces its position: untouched
+    assert v.approved_delta[1] == -0.5 and v.reasons[1] is None
+
+
+def test_margin_cap_nets_reductions_and_caches_table(patch_mt5_in_sys_modules):
+    from trade_logic.risk import RiskLimits
+
+    risk, term = _risk(RiskLimits(max_projected_margin=3000.0))
+    mids = {"EURUSD": 1.10, "USDJPY": 150.0}
+    # margin/lot = 1000: projected 2.5 + 1.0 lots = 3500 > 3000; the EURUSD
+    # reduction frees 500, so the USDJPY increase is halved regardless of order
+    v = risk.evaluate(["EURUSD", "USDJPY"], [3.0, 0.0], [-0.5, 1.0], [0.01, 0.01], mids)
+    assert v.approved_delta[0] == -0.5
+    assert np.isclose(v.approved_delta[1], 0.5) and "margin cap" in v.reasons[1]
+
+    v = risk.evaluate(["EURUSD", "USDJPY"], [3.0, 0.0], [0.0, 1.0], [0.01, 0.01], mids)
+    assert v.approved_delta[1] == 0.0 and v.reasons[1].startswith("Risk: rejected")
+    assert term.calls == 2  # one per symbol, second cycle served from cache
+
+
+def test_caps_count_the_rest_of_the_book_and_margin_in_use(patch_mt5_in_sys_modules):
+    from trade_logic.risk import RiskLimits
+
+    mids = {"EURUSD": 1.10, "EURJPY": 165.0, "USDJPY": 150.0}
+    risk, _ = _risk(RiskLimits(currency_net_usd_caps={"EUR": 330000.0}))
+    # 2 lots of EURJPY already held (+220k EUR, no leg this cycle): only 1 more EURUSD lot fits
+    v = risk.evaluate(["EURUSD"], [0.0], [4.0], [0.01], mids, held={"EURJPY": 2.0})
+    assert np.isclose(v.approved_delta[0], 1.0) and "EUR net cap" in v.reasons[0]
+    assert len(v.reasons) == 1 and np.isclose(v.currency_net_usd["EUR"], 660000.0)   # before scaling
+
+    risk, _ = _risk(RiskLimits(max_projected_margin=3000.0))
+    # 2500 already in use on the account: a 1-lot increase (1000/lot) is halved
+    v = risk.evaluate(["USDJPY"], [0.0], [1.0], [0.01], mids, margin_used=2500.0)
+    assert np.isclose(v.approved_delta[0], 0.5) and np.isclose(v.projected_margin, 3500.0)
+
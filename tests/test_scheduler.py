@@ -0,0 +1,46 @@
+import pytest
+
+
+class _Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def _cycle(clock, seconds):
+    def run():
+        clock.t += seconds
+        return seconds
+    return run
+
+
+def test_scheduler_keeps_fixed_grid_and_applies_overrun_policies():
+    from trade_logic.scheduler import CycleScheduler
+
+    clock = _Clock()
+    s = CycleScheduler(10, clock=clock)
+    s.step(_cycle(clock, 3))
+    assert s.delay() == 7  # next start at t=10, not 3 + 10
+    clock.t = 10
+    s.step(_cycle(clock, 25))  # ends at 35: ticks 20 and 30 missed
+    assert s.metrics.skipped == 2 and s.metrics.over_budget == 1 and s.delay() == 5
+
+    clock = _Clock()
+    s = CycleScheduler(10, policy="coalesce", clock=clock)
+    s.step(_cycle(clock, 25))  # ticks 10 and 20 merged into one catch-up run now
+    assert s.delay() == 0 and s.metrics.coalesced == 1
+    s.step(_cycle(clock, 1))   # catch-up cycle is late, then back on the grid at 30
+    assert s.metrics.late == 1 and s.delay() == 4
+
+    clock = _Clock()
+    s = CycleScheduler(10, policy="immediate", clock=clock)
+    s.step(_cycle(clock, 25))
+    s.step(_cycle(clock, 1))   # tick 10, run at 25
+    assert s.delay() == 0      # tick 20 still owed
+    s.step(_cycle(clock, 1))   # tick 20, run at 26
+    assert s.delay() == 3 and s.metrics.late == 2 and s.metrics.cycles == 3
+
+    with pytest.raises(ValueError):
+        CycleScheduler(10, policy="later")
@@ -0,0 +1,74 @@
+def test_mt5_simulator_netting_pending_partial_and_history(tmp_path):
+    from simulators.mt5_terminal import MT5Simulator
+
+    now = [1_700_000_000.0]
+    sim = MT5Simulator(seed=1, clock=lambda: now[0], sleep=lambda s: None,
+                       latency={"order_send": (0.02, 0.005)})
+    sim.add_symbol("EURUSD", digits=5, bid=1.1000, ask=1.1002)
+
+    buy = dict(action=sim.TRADE_ACTION_DEAL, symbol="EURUSD", volume=1.0, type=sim.ORDER_TYPE_BUY,
+               price=1.1002, deviation=10, type_filling=sim.ORDER_FILLING_IOC)
+    assert sim.order_send(buy).retcode == sim.TRADE_RETCODE_DONE
+    assert sim.order_send({**buy, "price": 1.1050}).retcode == sim.TRADE_RETCODE_REQUOTE  # off-market
+
+    # netting: a 1.5 lot sell reverses the position with one INOUT deal and realizes P/L
+    sim.set_quote("EURUSD", 1.1010, 1.1012)
+    sell = dict(buy, type=sim.ORDER_TYPE_SELL, volume=1.5, price=1.1010)
+    assert sim.order_send(sell).retcode == sim.TRADE_RETCODE_DONE
+    (pos,) = sim.positions_get(symbol="EURUSD")
+    assert pos.type == sim.POSITION_TYPE_SELL and abs(pos.volume - 0.5) < 1e-9
+    deals = sim.history_deals_get(now[0] - 60, now[0] + 60)
+    assert [d.entry for d in deals] == [sim.DEAL_ENTRY_IN, sim.DEAL_ENTRY_INOUT]
+    assert abs(deals[-1].profit - 80.0) < 1e-6  # 8 pips on 1 lot
+
+    # pending buy limit fills only once the ask crosses it, via tick replay
+    res = sim.order_send(dict(action=sim.TRADE_ACTION_PENDING, symbol="EURUSD", volume=0.5,
+                              type=sim.ORDER_TYPE_BUY_LIMIT, price=1.1000))
+    assert res.retcode == sim.TRADE_RETCODE_PLACED and len(sim.orders_get()) == 1
+    ticks = tmp_path / "ticks.csv"
+    ticks.write_text("time,bid,ask\n0,1.1005,1.1007\n30,1.0997,1.0999\n90,1.1001,1.1003\n")
+    sim.replay_ticks("EURUSD", str(ticks))
+    now[0] += 45
+    assert sim.orders_get() == () and sim.positions_get() == ()  # flat after the limit fill
+    assert len(sim.copy_rates_from_pos("EURUSD", sim.TIMEFRAME_M1, 0, 10)) >= 1
+
+    # partial fills under IOC
+    sim.partial_fill_prob = 1.0
+    res = sim.order_send(dict(buy, volume=1.0, price=None))
+    assert res.retcode == sim.TRADE_RETCODE_DONE_PARTIAL and 0.3 <= res.volume < 1.0
+    assert sim.calls["order_send"] == 5
+
+
+def test_fake_manager_flow_feeds_summaries_and_pump(patch_mt5_in_sys_modules):
+    import sys
+    from simulators import install_manager
+    from data_access.data_access import ManagerClient
+    from data_access.exposure import GroupExposureAggregator
+
+    flow = install_manager(symbols=["EURUSD", "GBPUSD"], logins=40, positions_per_symbol=50, seed=5)
+    try:
+        import MT5Manager
+        api = MT5Manager.ManagerAPI()
+        assert api.Connect("localhost", 1, "pw", MT5Manager.ManagerAPI.EnPumpModes.PUMP_MODE_POSITIONS.value, 1000)
+
+        agg = GroupExposureAggregator(lambda login: api.UserGet(login).Group)
+        flow.step(500)
+        assert api.PositionSubscribe(agg) and api.UserSubscribe(agg)
+        agg.seed(api.PositionGetByGroup("*"))
+        flow.step(5000)  # opens, resizes and closes stream into the sink
+
+        rows = {r["symbol"]: r for r in ManagerClient().get_net_positions(api)}
+        pumped = {r["symbol"]: r for r in agg.net_rows("*")}
+        assert set(rows) == set(pumped) == {"EURUSD", "GBPUSD"}
+        for sym, r in rows.items():
+            assert abs(r["net_volume"] - pumped[sym]["net_volume"]) < 1e-6
+            assert r["positions"] == pumped[sym]["positions"]
+        assert sum(r["positions"] for r in rows.values()) == len(flow.positions)
+
+        real_only = agg.net_rows("real*")
+        assert sum(r["positions"] for r in real_only) < len(flow.positions)
+        api.Disconnect()
+        assert flow._sinks == []
+    finally:
+        flow.stop()
+        sys.modules.pop("MT5Manager", None)
@@ -30,3 +30,17 @@ def test_to_usd_equivalents_basic(patch_mt5_in_sys_modules, monkeypatch):
     assert set(usd_df.columns) >= {"symbol", "net_volume"}
     assert len(usd_df) == 2
     assert isinstance(steps, list)
+
+
+def test_headless_startup_defers_gui_and_pandas(tmp_path):
+    import os, subprocess, sys
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "import sys, types; sys.modules['MetaTrader5'] = types.ModuleType('MetaTrader5')\n"
+        f"sys.path.insert(0, {root!r}); sys.argv = ['main.py', '--headless', '--once']\n"
+        "import main\n"
+        "print(sorted(m for m in ('pandas', 'numpy', 'tkinter', 'gui.gui', 'trade_logic.engine') if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "[]"
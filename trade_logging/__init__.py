@@ -1,15 +1,20 @@
 from .logger import (
-    get_logger, log_json, log_exception,
-    log_trade_csv, log_rejected_csv,
-    log_account_metrics_csv, write_daily_summary_csv,
+    get_logger, log_json, log_exception, flush_logging, set_event_sampling,
+    log_trade_csv, log_rejected_csv, log_rejected_csv_rows,
+    log_account_metrics_csv, write_daily_summary_csv, write_daily_symbol_summary_csv,
     write_exposure_tables, export_ccy_tables_from_gui,
     write_currency_exposure_calculations,  # <-- add this
 )
+from .stats import DailyStats
+from .rejections import RejectionTracker
+from .reporting import ReportingWorker
+from .journal import IntentJournal
 
 __all__ = [
-    "get_logger", "log_json", "log_exception",
-    "log_trade_csv", "log_rejected_csv",
-    "log_account_metrics_csv", "write_daily_summary_csv",
+    "get_logger", "log_json", "log_exception", "flush_logging", "set_event_sampling",
+    "log_trade_csv", "log_rejected_csv", "log_rejected_csv_rows",
+    "log_account_metrics_csv", "write_daily_summary_csv", "write_daily_symbol_summary_csv",
     "write_exposure_tables", "export_ccy_tables_from_gui",
     "write_currency_exposure_calculations",  # <-- and this
+    "DailyStats", "RejectionTracker", "ReportingWorker", "IntentJournal",
 ]
@@ -0,0 +1,93 @@
+"""
+In-memory exposure history for the dashboards.
+
+Fixed-size NumPy ring buffers hold, per symbol, the net exposure, terminal
+position, target and PnL of the last `capacity` cycles, so memory does not
+grow with uptime (rows grow only with the symbol universe). The engine
+records one column per cycle; the GUIs read series without any file I/O.
+
+    hist = ExposureHistory(capacity=240)
+    hist.record(["EURUSD"], net=[-2.0], position=[1.0], target=[1.0], pnl=[3.5])
+    hist.series("EURUSD", "net")     # oldest -> newest, NaN where the symbol was absent
+    sparkline(hist.series("EURUSD", "net"))
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+FIELDS = ("net", "position", "target", "pnl")
+_BARS = "▁▂▃▄▅▆▇█"
+
+
+class ExposureHistory:
+    def __init__(self, capacity: int = 240, initial_symbols: int = 64):
+        self.capacity = max(2, int(capacity))
+        self._rows: Dict[str, int] = {}
+        self._data = np.full((len(FIELDS), max(1, initial_symbols), self.capacity), np.nan)
+        self._times = np.zeros(self.capacity)
+        self._head = 0      # next column to write
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self._rows)
+
+    def _row(self, symbol: str) -> int:
+        r = self._rows.get(symbol)
+        if r is None:
+            r = self._rows[symbol] = len(self._rows)
+            if r >= self._data.shape[1]:
+                grown = np.full((len(FIELDS), 2 * self._data.shape[1], self.capacity), np.nan)
+                grown[:, :self._data.shape[1]] = self._data
+                self._data = grown
+        return r
+
+    def record(self, symbols: Sequence[str], *, net: Sequence[float], position: Sequence[float],
+               target: Sequence[float], pnl: Sequence[float], t: Optional[float] = None) -> None:
+        """Append one cycle; symbols not listed get NaN for it."""
+        with self._lock:
+            col = self._head
+            self._data[:, :, col] = np.nan
+            rows = [self._row(s) for s in symbols]
+            for f, values in enumerate((net, position, target, pnl)):
+                self._data[f, rows, col] = np.asarray(values, dtype="float64")
+            self._times[col] = time.time() if t is None else t
+            self._head = (col + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def _order(self) -> np.ndarray:
+        return (np.arange(self._count) + self._head - self._count) % self.capacity
+
+    def times(self) -> np.ndarray:
+        with self._lock:
+            return self._times[self._order()]
+
+    def series(self, symbol: str, field: str = "net") -> np.ndarray:
+        """Values oldest -> newest (empty for an unknown symbol)."""
+        f = FIELDS.index(field)
+        with self._lock:
+            r = self._rows.get(symbol)
+            if r is None:
+                return np.empty(0)
+            return self._data[f, r, self._order()]
+
+
+def sparkline(values: Sequence[float], width: int = 24) -> str:
+    """Unicode block sparkline of the last `width` values; gaps (NaN) render as spaces."""
+    v = np.asarray(values, dtype="float64")[-width:]
+    ok = np.isfinite(v)
+    if not ok.any():
+        return ""
+    lo, hi = v[ok].min(), v[ok].max()
+    span = hi - lo
+    idx = np.zeros(len(v), dtype=int) if span == 0 else np.round((v - lo) / span * (len(_BARS) - 1))
+    return "".join(_BARS[int(i)] if good else " " for i, good in zip(np.nan_to_num(idx), ok))
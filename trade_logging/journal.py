@@ -0,0 +1,150 @@
+"""
+Crash-safe order intent journal.
+
+Before each `order_send` the engine appends an "intent" line, fsync'd, to a
+JSONL file. The line is keyed by a client order id that also travels in the
+request's `comment`. After the send it appends the outcome. If the process
+dies in between, the next start replays the file, finds the intents without
+an outcome and reconciles them against one bulk `orders_get()` and
+`history_deals_get()`:
+
+    filled     a deal carries the id      -> the order went through
+    placed     a pending order carries it -> resting on the server
+    lost       neither, and older than settle_seconds -> never arrived; safe to resend
+    in_flight  neither, still younger     -> keep the symbol blocked and look again next cycle
+
+    journal = IntentJournal("order_intents.jsonl")
+    cid = journal.new_cid()
+    request["comment"] = cid
+    journal.intent(cid, "EURUSD", request)
+    res = mt5.order_send(request)
+    journal.outcome(cid, "done" if ok else "failed", retcode=res.retcode)
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+_B36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _base36(n: int) -> str:
+    out = ""
+    while True:
+        n, r = divmod(n, 36)
+        out = _B36[r] + out
+        if not n:
+            return out
+
+
+class IntentJournal:
+    def __init__(self, path: str, *, settle_seconds: float = 30.0, fsync: bool = True):
+        self.path = path
+        self.settle_seconds = float(settle_seconds)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._boot = _base36(int(time.time() * 1000))
+        self._open: Dict[str, dict] = {}   # cid -> intent record, until an outcome is written
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self._replay()
+        self._fh = open(path, "a", encoding="utf-8")
+
+    def _replay(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a crash mid-write
+                if rec.get("state") == "intent":
+                    self._open[rec["cid"]] = rec
+                else:
+                    self._open.pop(rec.get("cid"), None)
+
+    def _append(self, rec: dict, sync: bool) -> None:
+        with self._lock:
+            self._fh.write(json.dumps(rec, separators=(",", ":")) + "\n")
+            self._fh.flush()
+            if sync and self.fsync:
+                os.fsync(self._fh.fileno())
+
+    # -------- writing --------
+
+    def new_cid(self) -> str:
+        """Client order id; short enough for the 31-char MT5 comment."""
+        return f"ij{self._boot}{_base36(next(self._seq))}"
+
+    def intent(self, cid: str, symbol: str, request: dict) -> None:
+        """Durably record that `request` is about to be sent."""
+        rec = {"cid": cid, "state": "intent", "t": time.time(), "symbol": symbol,
+               "terminal_symbol": request.get("symbol"), "type": request.get("type"),
+               "volume": request.get("volume"), "price": request.get("price"), "action": request.get("action")}
+        self._append(rec, sync=True)
+        self._open[cid] = rec
+
+    def outcome(self, cid: str, state: str, **fields) -> None:
+        """Close an intent. Not fsync'd: if lost, startup reconciliation recovers it."""
+        self._append({"cid": cid, "state": state, "t": time.time(), **fields}, sync=False)
+        self._open.pop(cid, None)
+
+    # -------- recovery --------
+
+    def open_intents(self) -> Dict[str, dict]:
+        return dict(self._open)
+
+    def blocked_symbols(self) -> set:
+        """Symbols with an unresolved intent (do not send again until it is reconciled)."""
+        return {rec["symbol"] for rec in self._open.values()}
+
+    def oldest_open(self) -> Optional[float]:
+        return min((rec["t"] for rec in self._open.values()), default=None)
+
+    def reconcile(self, orders: Iterable, deals: Iterable, now: Optional[float] = None) -> dict:
+        """Resolve open intents from one orders_get() and one history_deals_get() result."""
+        now = time.time() if now is None else now
+        placed = {getattr(o, "comment", ""): o for o in orders or ()}
+        filled: Dict[str, list] = {}
+        for d in deals or ():
+            filled.setdefault(getattr(d, "comment", ""), []).append(d)
+        report = {"filled": [], "placed": [], "lost": [], "in_flight": []}
+        for cid, rec in list(self._open.items()):
+            if cid in filled:
+                ds = filled[cid]
+                self.outcome(cid, "filled", deals=[getattr(d, "ticket", None) for d in ds],
+                             volume=sum(getattr(d, "volume", 0.0) for d in ds))
+                report["filled"].append({**rec, "deals": ds})
+            elif cid in placed:
+                self.outcome(cid, "placed", order=getattr(placed[cid], "ticket", None))
+                report["placed"].append(rec)
+            elif now - rec["t"] >= self.settle_seconds:
+                self.outcome(cid, "lost")
+                report["lost"].append(rec)
+            else:
+                report["in_flight"].append(rec)
+        return report
+
+    def compact(self) -> None:
+        """Rewrite the file with only the open intents (atomic replace)."""
+        with self._lock:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for rec in self._open.values():
+                    f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._fh.close()
+            os.replace(tmp, self.path)
+            self._fh = open(self.path, "a", encoding="utf-8")
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
@@ -1,13 +1,22 @@
 # trading_algo/trade_logging/logger.py
 
+from __future__ import annotations
+
 import os
+import csv
 import json
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import itertools
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
-import pandas as pd
+from typing import TYPE_CHECKING
 from config import CONFIG, SYMBOL_CONFIG
 
+if TYPE_CHECKING:  # pandas is imported inside the CSV writers so get_logger() stays light
+    import pandas as pd
+
 
 # ---------- Filenames / prefixes ----------
 TRADE_LOG_PREFIX = "trade_log"
@@ -35,37 +44,76 @@ def write_exposure_tables(usd_df: pd.DataFrame, base_dir: str | None = None) ->
 
 
 # ---------- CSV loggers (rc4 style) ----------
+def _append_csv(fpath: str, df: pd.DataFrame) -> None:
+    """
+    Append under the header already in the file. Rows are aligned to it by name;
+    if they bring new columns the day's file is rewritten once with the wider header.
+    """
+    import pandas as pd
+    try:
+        with open(fpath, newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), None)
+    except FileNotFoundError:
+        header = None
+    if not header:
+        df.to_csv(fpath, index=False)
+        return
+    extra = [c for c in df.columns if c not in header]
+    if extra:
+        old = pd.read_csv(fpath, dtype=str, keep_default_na=False)
+        pd.concat([old, df], ignore_index=True)[header + extra].to_csv(fpath, index=False)
+        return
+    df.reindex(columns=header).to_csv(fpath, mode="a", header=False, index=False)
+
+
 def log_trade_csv(row: dict, base_dir: str | None = None) -> None:
+    import pandas as pd
     folder = _date_folder(base_dir)
     fpath = os.path.join(folder, f"{TRADE_LOG_PREFIX}_{datetime.now().strftime('%Y-%m-%d')}.csv")
-    df = pd.DataFrame([row])
-    header = not os.path.exists(fpath)
-    df.to_csv(fpath, mode="a", header=header, index=False)
+    _append_csv(fpath, pd.DataFrame([row]))
 
 
 def log_rejected_csv(row: dict, base_dir: str | None = None) -> None:
+    import pandas as pd
     folder = _date_folder(base_dir)
     fpath = os.path.join(folder, f"{REJECTED_TRADE_LOG_PREFIX}_{datetime.now().strftime('%Y-%m-%d')}.csv")
-    df = pd.DataFrame([row])
-    header = not os.path.exists(fpath)
-    df.to_csv(fpath, mode="a", header=header, index=False)
+    _append_csv(fpath, pd.DataFrame([row]))
+
+
+def log_rejected_csv_rows(rows: list[dict], base_dir: str | None = None) -> None:
+    """Append a batch of rejection rows with a single write."""
+    import pandas as pd
+    if not rows:
+        return
+    folder = _date_folder(base_dir)
+    fpath = os.path.join(folder, f"{REJECTED_TRADE_LOG_PREFIX}_{datetime.now().strftime('%Y-%m-%d')}.csv")
+    _append_csv(fpath, pd.DataFrame(rows))
 
 
 def log_account_metrics_csv(metrics: dict, base_dir: str | None = None) -> None:
+    import pandas as pd
     folder = _date_folder(base_dir)
     fpath = os.path.join(folder, f"{ACCOUNT_METRICS_PREFIX}_{datetime.now().strftime('%Y-%m-%d')}.csv")
-    df = pd.DataFrame([metrics])
-    header = not os.path.exists(fpath)
-    df.to_csv(fpath, mode="a", header=header, index=False)
+    _append_csv(fpath, pd.DataFrame([metrics]))
 
 
 def write_daily_summary_csv(summary: dict, base_dir: str | None = None) -> None:
+    import pandas as pd
     folder = _date_folder(base_dir)
     fpath = os.path.join(folder, f"{SUMMARY_FILE_PREFIX}_{datetime.now().strftime('%Y-%m-%d')}.csv")
     pd.DataFrame([summary]).to_csv(fpath, index=False)
 
 
+def write_daily_symbol_summary_csv(rows: list[dict], base_dir: str | None = None) -> None:
+    """Per-symbol breakdown of the daily summary (overwritten when it changes)."""
+    import pandas as pd
+    folder = _date_folder(base_dir)
+    fpath = os.path.join(folder, f"{SUMMARY_FILE_PREFIX}_by_symbol_{datetime.now().strftime('%Y-%m-%d')}.csv")
+    pd.DataFrame(rows).to_csv(fpath, index=False)
+
+
 def export_ccy_tables_from_gui(usd_rows: list[dict], pair_rows: list[dict], base_dir: str | None = None) -> None:
+    import pandas as pd
     folder = _date_folder(base_dir)
     ts = datetime.now().strftime("%Y-%m-%d_%H-%M")
     if usd_rows:
@@ -99,41 +147,118 @@ def write_currency_exposure_calculations(steps, base_dir: str | None = None) ->
 
 
 
-# ---------- Structured logger (console + rotating file) ----------
+# ---------- Structured logger (queue -> console + rotating file) ----------
+# The calling thread only builds a LogRecord and enqueues it. JSON encoding,
+# formatting and console/disk I/O all happen on a QueueListener thread.
+
+_EVENT_ENCODER = json.JSONEncoder(ensure_ascii=False, default=str)  # built once, reused per event
+_LISTENERS: dict[str, QueueListener] = {}
+_SAMPLE_EVERY: dict[str, int] = dict(CONFIG.get("logging", {}).get("sample_every", {}))
+_SAMPLE_COUNTERS: dict[str, itertools.count] = {}
+
+
+class _JsonEvent:
+    """Deferred JSON payload: encoded when the listener formats the record."""
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: dict):
+        self.fields = fields
+
+    def __str__(self) -> str:
+        return _EVENT_ENCODER.encode(self.fields)
+
+
+class _EnqueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Skip QueueHandler's eager format(): keep the hot path to a put_nowait()
+        return record
+
+
+def _stop_listeners() -> None:
+    for listener in list(_LISTENERS.values()):
+        try:
+            listener.stop()
+        except Exception:
+            pass
+    _LISTENERS.clear()
+
+
+atexit.register(_stop_listeners)
+
+
 def get_logger(name: str = "trading_algo", level: int = logging.INFO, base_dir: str | None = None) -> logging.Logger:
     """
     Create or reuse a console + rotating-file logger.
     The file is written into today's YYYY-MM-DD folder as runtime.log.
+    With CONFIG["logging"]["queue"] (default) both handlers sit behind a
+    QueueListener thread and the logger itself only enqueues.
     """
     logger = logging.getLogger(name)
     if logger.handlers:
         return logger
 
     logger.setLevel(level)
+    fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
 
     # Console handler
     ch = logging.StreamHandler()
     ch.setLevel(level)
-    fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
     ch.setFormatter(fmt)
-    logger.addHandler(ch)
 
     # File handler (rotating)
     folder = _date_folder(base_dir)
     fh = RotatingFileHandler(os.path.join(folder, "runtime.log"), maxBytes=1_000_000, backupCount=3)
     fh.setLevel(level)
     fh.setFormatter(fmt)
-    logger.addHandler(fh)
+
+    if CONFIG.get("logging", {}).get("queue", True):
+        q: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(q, ch, fh, respect_handler_level=True)
+        listener.start()
+        _LISTENERS[name] = listener
+        logger.addHandler(_EnqueueHandler(q))
+        logger.propagate = False  # root handlers would format on the calling thread again
+    else:
+        logger.addHandler(ch)
+        logger.addHandler(fh)
 
     return logger
 
 
+def flush_logging() -> None:
+    """Drain queued records (stop + restart listeners); for tests and shutdown paths."""
+    for listener in _LISTENERS.values():
+        listener.stop()
+        listener.start()
+
+
+def set_event_sampling(event: str, every: int) -> None:
+    """Log only every Nth `event` (1 or less: log all). Sampling is per event name."""
+    if every <= 1:
+        _SAMPLE_EVERY.pop(event, None)
+    else:
+        _SAMPLE_EVERY[event] = int(every)
+    _SAMPLE_COUNTERS.pop(event, None)
+
+
+def _sampled_out(fields: dict) -> bool:
+    every = _SAMPLE_EVERY.get(fields.get("event"))
+    if not every:
+        return False
+    counter = _SAMPLE_COUNTERS.get(fields["event"])
+    if counter is None:
+        counter = _SAMPLE_COUNTERS[fields["event"]] = itertools.count()
+    return next(counter) % every != 0
+
+
 def log_json(logger: logging.Logger, **fields) -> None:
-    """Info-level JSON event."""
-    logger.info(json.dumps(fields, ensure_ascii=False))
+    """Info-level JSON event (encoded off-thread; high-frequency events may be sampled)."""
+    if not logger.isEnabledFor(logging.INFO) or (_SAMPLE_EVERY and _sampled_out(fields)):
+        return
+    logger.info(_JsonEvent(fields))
 
 
 def log_exception(logger: logging.Logger, err: Exception, **context) -> None:
     """Error-level JSON event with exception message."""
     context["error"] = str(err)
-    logger.error(json.dumps(context, ensure_ascii=False))
+    logger.error(_JsonEvent(context))
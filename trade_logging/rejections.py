@@ -0,0 +1,98 @@
+"""
+Run-length-encoded rejection logging.
+
+A symbol that stays blocked for the same reason used to produce one identical
+CSV row per cycle. `RejectionTracker` keeps one open record per
+(symbol, reason) with first_seen / last_seen / count and only emits a row when
+the state changes:
+
+    state="open"       first cycle a (symbol, reason) is seen
+    state="heartbeat"  every `heartbeat_seconds` while it stays open
+    state="closed"     the symbol was evaluated but no longer rejected for that reason
+
+A symbol blocked for two reasons in the same cycle (e.g. one leg over the max
+position, another under the minimum lot) keeps two independent records.
+
+Rows are queued during the cycle and written by `flush()` after orders have
+gone out, so rejection I/O stays off the decision/execution path.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class _Open:
+    row: dict
+    first_seen: str
+    last_seen: str
+    count: int
+    last_emit: float
+    seen_this_cycle: bool = True
+
+
+def _ts(t: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))
+
+
+class RejectionTracker:
+    def __init__(self, writer: Callable[[List[dict]], None], heartbeat_seconds: float = 900.0,
+                 clock: Callable[[], float] = time.time):
+        """writer: receives the batch of rows to persist on each flush()."""
+        self._writer = writer
+        self.heartbeat_seconds = float(heartbeat_seconds)
+        self._clock = clock
+        self._open: Dict[Tuple[str, str], _Open] = {}
+        self._queue: List[dict] = []
+
+    def _emit(self, rec: _Open, state: str) -> None:
+        self._queue.append({**rec.row, "first_seen": rec.first_seen, "last_seen": rec.last_seen,
+                            "count": rec.count, "state": state})
+
+    def begin_cycle(self) -> None:
+        for rec in self._open.values():
+            rec.seen_this_cycle = False
+
+    def observe(self, row: dict) -> None:
+        """Record that row["symbol"] is rejected for row["reason"] in this cycle."""
+        now = self._clock()
+        key = (row.get("symbol"), row.get("reason"))
+        rec = self._open.get(key)
+        if rec is not None:
+            rec.count += 1
+            rec.last_seen = _ts(now)
+            rec.row = row
+            rec.seen_this_cycle = True
+            if self.heartbeat_seconds > 0 and now - rec.last_emit >= self.heartbeat_seconds:
+                rec.last_emit = now
+                self._emit(rec, "heartbeat")
+            return
+        stamp = _ts(now)
+        rec = _Open(row=row, first_seen=stamp, last_seen=stamp, count=1, last_emit=now)
+        self._open[key] = rec
+        self._emit(rec, "open")
+
+    def end_cycle(self, evaluated: Optional[Iterable[str]] = None) -> None:
+        """Close records for symbols evaluated this cycle (default: all) that weren't rejected again."""
+        scope = None if evaluated is None else set(evaluated)
+        for key in list(self._open):
+            rec = self._open[key]
+            if rec.seen_this_cycle or (scope is not None and key[0] not in scope):
+                continue
+            self._emit(rec, "closed")
+            del self._open[key]
+
+    def open_records(self) -> Dict[Tuple[str, str], dict]:
+        """(symbol, reason) -> first_seen / last_seen / count of each open record."""
+        return {k: {"first_seen": r.first_seen, "last_seen": r.last_seen, "count": r.count}
+                for k, r in self._open.items()}
+
+    def flush(self) -> int:
+        if not self._queue:
+            return 0
+        rows, self._queue = self._queue, []
+        self._writer(rows)
+        return len(rows)
@@ -0,0 +1,105 @@
+"""
+Deferred reporting worker.
+
+Report jobs (exposure tables, account metrics, daily summary, store flush)
+are handed to one background thread and run in submission order, so the
+trading cycle returns as soon as its orders are out. Each job receives the
+frozen results of the cycle that produced it, never live engine state.
+
+    worker = ReportingWorker().start()
+    worker.submit(engine_report, snapshot)
+    worker.drain(timeout=5)       # e.g. before shutdown
+    worker.stop()
+
+When jobs pile up (reporting slower than the cycle), the oldest pending job
+is dropped and counted; the daily summary is cumulative, so a newer report
+supersedes it.
+"""
+
+from __future__ import annotations
+
+import collections
+import threading
+import time
+from typing import Callable, Optional
+
+
+class ReportingWorker:
+    def __init__(self, max_pending: int = 4, *, name: str = "cycle-reporting"):
+        self.max_pending = max(1, int(max_pending))
+        self.name = name
+        self._jobs: collections.deque = collections.deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self.completed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+        self.last_duration = 0.0
+
+    def start(self) -> "ReportingWorker":
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Finish queued jobs (up to `timeout`), then end the thread."""
+        self.drain(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._jobs) + self._busy
+
+    def submit(self, fn: Callable, *args) -> None:
+        with self._cond:
+            if len(self._jobs) >= self.max_pending:
+                self._jobs.popleft()
+                self.dropped += 1
+            self._jobs.append((fn, args))
+            self._cond.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted job has run; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._jobs and not self._busy, timeout)
+
+    def stats(self) -> dict:
+        return {"pending": self.pending, "completed": self.completed, "dropped": self.dropped,
+                "errors": self.errors, "last_ms": round(self.last_duration * 1000, 1)}
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._jobs or self._stopping)
+                if not self._jobs:
+                    return
+                fn, args = self._jobs.popleft()
+                self._busy = True
+            t0 = time.monotonic()
+            try:
+                fn(*args)
+            except Exception as e:  # a failing report must not kill the worker
+                self.errors += 1
+                self.last_error = e
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self.completed += 1
+                    self.last_duration = time.monotonic() - t0
+                    self._cond.notify_all()
@@ -0,0 +1,137 @@
+"""
+Streaming daily summary statistics.
+
+`DailyStats` is updated in O(1) as each trade row and each history deal is
+recorded, with per-symbol breakdowns, so the daily summary carries real
+buy/sell/win/loss/avg figures without re-scanning the trade log or the
+day's deal history. Deals are de-duplicated by ticket, so overlapping
+`history_deals_get` windows are safe.
+
+`changed(summary)` tells the caller whether the deal- and trade-driven figures
+differ from the last summary written, so the CSV is only rewritten when one of
+them moved; unrealized PnL moves with every tick and is not compared.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Optional
+
+# MT5 deal entry codes: IN=0, OUT=1, INOUT=2, OUT_BY=3 — everything but IN closes
+DEAL_ENTRY_IN = 0
+
+
+@dataclass
+class _Counters:
+    total_trades: int = 0
+    buy_trades: int = 0
+    sell_trades: int = 0
+    slippage_sum: float = 0.0
+    slipped_trades: int = 0     # trades with a known slippage (recovered ones have none)
+    win_trades: int = 0
+    loss_trades: int = 0
+    profit_sum: float = 0.0
+    loss_sum: float = 0.0
+    realized_pnl: float = 0.0
+
+    def add_trade(self, side: str, slippage: Optional[float]) -> None:
+        self.total_trades += 1
+        if side == "BUY":
+            self.buy_trades += 1
+        elif side == "SELL":
+            self.sell_trades += 1
+        if slippage is not None:
+            self.slippage_sum += slippage
+            self.slipped_trades += 1
+
+    def add_close(self, profit: float) -> None:
+        if profit > 0:
+            self.win_trades += 1
+            self.profit_sum += profit
+        elif profit < 0:
+            self.loss_trades += 1
+            self.loss_sum += profit
+
+    def as_row(self) -> dict:
+        return {
+            "total_trades": self.total_trades,
+            "avg_slippage_points": round(self.slippage_sum / self.slipped_trades, 4) if self.slipped_trades else 0.0,
+            "buy_trades": self.buy_trades,
+            "sell_trades": self.sell_trades,
+            "win_trades": self.win_trades,
+            "loss_trades": self.loss_trades,
+            "avg_profit": round(self.profit_sum / self.win_trades, 2) if self.win_trades else 0.0,
+            "avg_loss": round(self.loss_sum / self.loss_trades, 2) if self.loss_trades else 0.0,
+        }
+
+
+@dataclass
+class DailyStats:
+    day: date = field(default_factory=date.today)
+    totals: _Counters = field(default_factory=_Counters)
+    by_symbol: Dict[str, _Counters] = field(default_factory=dict)
+    _seen_deals: set = field(default_factory=set, repr=False)
+    _last_written: Optional[dict] = field(default=None, repr=False)
+
+    def _sym(self, symbol: str) -> _Counters:
+        c = self.by_symbol.get(symbol)
+        if c is None:
+            c = self.by_symbol[symbol] = _Counters()
+        return c
+
+    # -------- updates --------
+
+    def on_trade(self, row: dict) -> None:
+        side = str(row.get("trade_type", "")).upper()
+        slip = row.get("slippage_points")
+        slip = None if slip in (None, "") else float(slip)
+        self.totals.add_trade(side, slip)
+        self._sym(str(row.get("symbol", ""))).add_trade(side, slip)
+
+    def on_deal(self, deal) -> bool:
+        """Ingest one history deal; returns False if it was already counted."""
+        key = getattr(deal, "ticket", None)
+        if key is None:
+            key = (getattr(deal, "time_msc", None) or getattr(deal, "time", None),
+                   getattr(deal, "symbol", None), getattr(deal, "volume", None), deal.profit)
+        if key in self._seen_deals:
+            return False
+        self._seen_deals.add(key)
+        profit = float(deal.profit)
+        symbol = getattr(deal, "symbol", None)
+        sym = self._sym(symbol) if symbol else None
+        self.totals.realized_pnl += profit
+        if sym is not None:
+            sym.realized_pnl += profit
+        if getattr(deal, "entry", None) not in (None, DEAL_ENTRY_IN):
+            self.totals.add_close(profit)
+            if sym is not None:
+                sym.add_close(profit)
+        return True
+
+    # -------- views --------
+
+    @property
+    def realized_pnl(self) -> float:
+        return self.totals.realized_pnl
+
+    def summary(self, unrealized_pnl: float) -> dict:
+        return {
+            "date": self.day.strftime("%Y-%m-%d"),
+            **self.totals.as_row(),
+            "unrealized_pnl": unrealized_pnl,
+            "realized_pnl": self.totals.realized_pnl,
+        }
+
+    def symbol_rows(self) -> list[dict]:
+        return [{"symbol": s, **c.as_row(), "realized_pnl": round(c.realized_pnl, 2)}
+                for s, c in sorted(self.by_symbol.items())]
+
+    def changed(self, summary: dict) -> bool:
+        """True (and remembered) if `summary` differs from the last one written, ignoring unrealized PnL."""
+        key = {k: (round(v, 2) if isinstance(v, float) else v) for k, v in summary.items() if k != "unrealized_pnl"}
+        if key == self._last_written:
+            return False
+        self._last_written = key
+        return True
@@ -0,0 +1,185 @@
+"""
+Embedded SQLite (WAL) store for trades, rejections, account metrics and cycle
+summaries.
+
+Rows are buffered with `add()` and written in one transaction per cycle by
+`flush()`. Trades and rejections are indexed on (symbol, timestamp) so
+dashboards and ad-hoc queries ("all rejections for EURUSD this week") don't
+need to glob the per-date CSV folders. `export_csv()` writes files with the
+same columns as the rc4-style CSVs from logger.py.
+
+    store = TradeStore("trade_store.sqlite3")
+    store.add("trades", row); store.flush()
+    store.recent("rejections", symbol="EURUSD", since="2025-01-06 00:00:00")
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Column order matches the CSV rows written by the engine today.
+TABLE_COLUMNS: Dict[str, Sequence[str]] = {
+    "trades": (
+        "symbol", "terminal_symbol", "trade_type", "requested_volume", "executed_volume",
+        "requested_price", "executed_price", "slippage_points", "current_net",
+        "target_position", "current_position", "delta_position", "trend_signal",
+        "trend_strength", "rsi", "macd", "reason", "timestamp", "order_id",
+    ),
+    "rejections": (
+        "symbol", "reason", "delta_position", "current_position", "current_net",
+        "trend_signal", "trend_strength", "rsi", "macd", "timestamp",
+        "first_seen", "last_seen", "count", "state",
+    ),
+    "account_metrics": (
+        "timestamp", "balance", "equity", "margin", "free_margin", "margin_level",
+        "realized_pnl_today", "unrealized_pnl",
+    ),
+    "cycle_summaries": (
+        "timestamp", "date", "total_trades", "avg_slippage_points", "buy_trades", "sell_trades",
+        "win_trades", "loss_trades", "avg_profit", "avg_loss", "unrealized_pnl", "realized_pnl",
+    ),
+}
+
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_trades_symbol_ts ON trades(symbol, timestamp)",
+    "CREATE INDEX IF NOT EXISTS ix_trades_ts ON trades(timestamp)",
+    "CREATE INDEX IF NOT EXISTS ix_rejections_symbol_ts ON rejections(symbol, timestamp)",
+    "CREATE INDEX IF NOT EXISTS ix_rejections_ts ON rejections(timestamp)",
+    "CREATE INDEX IF NOT EXISTS ix_account_metrics_ts ON account_metrics(timestamp)",
+    "CREATE INDEX IF NOT EXISTS ix_cycle_summaries_ts ON cycle_summaries(timestamp)",
+)
+
+
+class TradeStore:
+    def __init__(self, path: str):
+        self.path = path
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[tuple]] = {t: [] for t in TABLE_COLUMNS}
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        with self._lock:
+            for table, cols in TABLE_COLUMNS.items():
+                col_sql = ", ".join(f'"{c}"' for c in cols)
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, {col_sql}, extra TEXT)"
+                )
+                # columns added after a database was created
+                have = {r["name"] for r in self._conn.execute(f"PRAGMA table_info({table})")}
+                for c in cols:
+                    if c not in have:
+                        self._conn.execute(f'ALTER TABLE {table} ADD COLUMN "{c}"')
+            for stmt in _INDEXES:
+                self._conn.execute(stmt)
+
+    # -------- writes --------
+
+    def add(self, table: str, row: Dict[str, Any]) -> None:
+        """Buffer one row; unknown keys are kept as JSON in `extra`."""
+        cols = TABLE_COLUMNS[table]
+        extra = {k: v for k, v in row.items() if k not in cols}
+        values = tuple(row.get(c) for c in cols) + (json.dumps(extra, default=str) if extra else None,)
+        with self._lock:
+            self._pending[table].append(values)
+
+    def flush(self) -> int:
+        """Write all buffered rows in a single transaction. Returns rows written."""
+        with self._lock:
+            batches = {t: rows for t, rows in self._pending.items() if rows}
+            if not batches:
+                return 0
+            self._pending = {t: [] for t in TABLE_COLUMNS}
+            written = 0
+            self._conn.execute("BEGIN")
+            try:
+                for table, rows in batches.items():
+                    cols = TABLE_COLUMNS[table]
+                    placeholders = ", ".join("?" * (len(cols) + 1))
+                    col_sql = ", ".join(f'"{c}"' for c in cols)
+                    self._conn.executemany(
+                        f"INSERT INTO {table} ({col_sql}, extra) VALUES ({placeholders})", rows
+                    )
+                    written += len(rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return written
+
+    # -------- reads --------
+
+    @staticmethod
+    def _row_dict(r: sqlite3.Row) -> Dict[str, Any]:
+        d = dict(r)
+        d.pop("id", None)
+        extra = d.pop("extra", None)
+        if extra:
+            d.update(json.loads(extra))
+        return d
+
+    def recent(self, table: str, limit: int = 200, symbol: Optional[str] = None,
+               since: Optional[str] = None, until: Optional[str] = None,
+               reason_like: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Newest-first rows, filtered on the indexed columns. Timestamps are 'YYYY-MM-DD HH:MM:SS'."""
+        if table not in TABLE_COLUMNS:
+            raise KeyError(table)
+        clauses, params = [], []
+        if symbol is not None:
+            clauses.append("symbol = ?")
+            params.append(symbol)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if reason_like is not None:
+            clauses.append("reason LIKE ?")
+            params.append(reason_like)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT * FROM {table}{where} ORDER BY timestamp DESC, id DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, int(limit))).fetchall()
+        return [self._row_dict(r) for r in rows]
+
+    def query(self, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(sql, tuple(params)).fetchall()]
+
+    # -------- export --------
+
+    def export_csv(self, table: str, path: str, day: Optional[str] = None) -> int:
+        """
+        Write `table` (optionally one 'YYYY-MM-DD' day) as CSV with the same
+        column layout as today's per-date files; extra keys are appended.
+        """
+        clauses, params = "", ()
+        if day is not None:
+            clauses, params = " WHERE timestamp >= ? AND timestamp < ?", (day, day + "~")
+        with self._lock:
+            rows = [self._row_dict(r) for r in
+                    self._conn.execute(f"SELECT * FROM {table}{clauses} ORDER BY id", params).fetchall()]
+        cols = list(TABLE_COLUMNS[table])
+        for r in rows:
+            cols.extend(k for k in r if k not in cols)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=cols)
+            w.writeheader()
+            w.writerows(rows)
+        return len(rows)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
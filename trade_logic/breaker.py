@@ -0,0 +1,132 @@
+"""
+Per-symbol execution circuit breakers.
+
+Order results are classified by retcode. Consecutive failures of one class
+open that symbol's breaker for an exponentially growing backoff, so a symbol
+that is closed, off quotes or out of margin stops costing a trade-server
+round-trip (and a rejection row) every cycle:
+
+    closed ──(threshold failures)──> open ──(backoff elapsed)──> half-open
+       ^                               ^                            │
+       └──────── probe succeeds ───────┴──── probe fails (2x) ──────┘
+
+A half-open breaker lets orders through as probes; the first result decides.
+
+    breakers = CircuitBreakers()
+    if breakers.allow("EURUSD"):
+        res = terminal.order_send(req)
+        breakers.record("EURUSD", res.retcode if res else None)
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+# MT5 trade server return codes (MetaTrader5.TRADE_RETCODE_*)
+RETCODE_REQUOTE = 10004
+RETCODE_PLACED = 10008
+RETCODE_DONE = 10009
+RETCODE_DONE_PARTIAL = 10010
+
+SUCCESS_RETCODES = frozenset({RETCODE_PLACED, RETCODE_DONE, RETCODE_DONE_PARTIAL})
+
+_RETCODE_CLASS = {
+    10017: "market_closed",   # TRADE_DISABLED
+    10018: "market_closed",   # MARKET_CLOSED
+    10044: "market_closed",   # CLOSE_ONLY
+    10021: "off_quotes",      # PRICE_OFF
+    10019: "no_money",        # NO_MONEY
+    10014: "invalid",         # INVALID_VOLUME
+    10015: "invalid",         # INVALID_PRICE
+    10030: "invalid",         # INVALID_FILL
+    10034: "invalid",         # LIMIT_VOLUME
+    10040: "invalid",         # LIMIT_POSITIONS
+}
+
+# class -> (consecutive failures that open the breaker, first backoff in seconds)
+DEFAULT_POLICY: Mapping[str, Tuple[int, float]] = {
+    "market_closed": (1, 300.0),
+    "off_quotes": (2, 30.0),
+    "no_money": (1, 120.0),
+    "invalid": (2, 600.0),
+    "transient": (3, 10.0),   # requotes, timeouts, connection, no result (not local throttling)
+}
+
+
+def retcode_class(retcode: Optional[int]) -> Optional[str]:
+    """None for success, else the failure class used by the breaker policy."""
+    if retcode in SUCCESS_RETCODES:
+        return None
+    return _RETCODE_CLASS.get(retcode, "transient")
+
+
+@dataclass
+class BreakerState:
+    state: str = "closed"          # closed | open | half_open
+    failures: int = 0              # consecutive failures of `last_class`
+    last_class: Optional[str] = None
+    last_retcode: Optional[int] = None
+    trips: int = 0                 # times opened since the last success
+    reopen_at: float = 0.0
+
+    def as_dict(self, now: float) -> dict:
+        return {"state": self.state, "class": self.last_class, "retcode": self.last_retcode,
+                "failures": self.failures, "trips": self.trips,
+                "retry_in": round(max(0.0, self.reopen_at - now), 1) if self.state == "open" else 0.0}
+
+
+class CircuitBreakers:
+    def __init__(self, policy: Mapping[str, Tuple[int, float]] = DEFAULT_POLICY, *,
+                 max_backoff: float = 3600.0, enabled: bool = True,
+                 clock: Callable[[], float] = time.monotonic):
+        self.policy = dict(policy)
+        self.max_backoff = float(max_backoff)
+        self.enabled = enabled
+        self._clock = clock
+        self._states: Dict[str, BreakerState] = {}
+
+    def state(self, symbol: str) -> BreakerState:
+        return self._states.get(symbol) or BreakerState()
+
+    def allow(self, symbol: str) -> bool:
+        """May an order for `symbol` go out now? Moves an expired open breaker to half-open."""
+        st = self._states.get(symbol)
+        if not self.enabled or st is None or st.state != "open":
+            return True
+        if self._clock() >= st.reopen_at:
+            st.state = "half_open"
+            return True
+        return False
+
+    def record(self, symbol: str, retcode: Optional[int]) -> None:
+        """Feed one order result (None = no result from the terminal)."""
+        klass = retcode_class(retcode)
+        if not self.enabled:
+            return
+        if klass is None:
+            self._states.pop(symbol, None)
+            return
+        st = self._states.setdefault(symbol, BreakerState())
+        st.failures = st.failures + 1 if klass == st.last_class else 1
+        st.last_class, st.last_retcode = klass, retcode
+        threshold, base = self.policy.get(klass, self.policy["transient"])
+        if st.state == "half_open" or st.failures >= threshold:
+            st.trips += 1
+            st.state = "open"
+            st.reopen_at = self._clock() + min(self.max_backoff, base * 2 ** (st.trips - 1))
+
+    def label(self, symbol: str) -> str:
+        """Short text for decision rows: '', 'open (no_money, 95s)', 'half-open'."""
+        st = self._states.get(symbol)
+        if st is None or st.state == "closed":
+            return ""
+        if st.state == "half_open":
+            return "half-open"
+        return f"open ({st.last_class}, {max(0.0, st.reopen_at - self._clock()):.0f}s)"
+
+    def snapshot(self) -> dict:
+        """Non-closed breakers, for the cycle payload."""
+        now = self._clock()
+        return {s: st.as_dict(now) for s, st in self._states.items() if st.state != "closed"}
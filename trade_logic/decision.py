@@ -0,0 +1,273 @@
+"""
+Vectorized decision stage.
+
+Turns the consolidated exposure of every symbol into target / delta / gate
+vectors in one pass:
+
+    target = ±current_net * multiplier          (sign from follow_position)
+    delta  = floor_to_min_lot(target - current_pos)
+    gate   = too small | trend blocked | over max position | pending
+
+Rounding and gating match the per-row loop it replaces
+(`utils.round_down_to_step`, then "Delta too small" → trend → max position),
+so results are identical; only order sends remain per symbol.
+
+`lot_rounding="joint"` instead picks, for all legs together, the multiple of
+each leg's min lot just inside or just past the raw delta so the sub-lot
+remainders left unhedged net out per currency (see `joint_round`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from config.snapshot import ROUNDING_MODES
+
+# gate codes, in evaluation order
+PENDING = 0
+TOO_SMALL = 1
+TREND_BLOCKED = 2
+OVER_MAX_POSITION = 3
+
+
+@dataclass
+class DecisionBatch:
+    """Struct-of-arrays result; index i refers to the i-th symbol."""
+    symbols: List[str]
+    current_net: np.ndarray
+    current_pos: np.ndarray
+    min_lot: np.ndarray
+    target: np.ndarray
+    delta: np.ndarray
+    gate: np.ndarray
+    residual: np.ndarray    # lots left unhedged by rounding (0 for trend/max-position gated legs)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def reason(self, i: int) -> str:
+        g = self.gate[i]
+        if g == TOO_SMALL:
+            return f"Delta too small: {self.delta[i]:.2f}"
+        if g == TREND_BLOCKED:
+            return "Trade conditions not met"
+        if g == OVER_MAX_POSITION:
+            return "Exceeds max position size"
+        return "Initialized"
+
+
+@dataclass(slots=True)
+class DecisionRow:
+    """
+    One leg's decision as emitted by the cycle: raw values only. The GUIs
+    format at render time; the recorders read the same objects. `pnl` is the
+    symbol's open profit from the cycle's position read, taken before the
+    cycle's own orders, so a fill shows up one cycle later.
+    """
+    symbol: str
+    current_net: float
+    current_position: float
+    target_position: float
+    delta_position: float
+    trend_signal: str
+    trend_strength: float | None
+    rsi: float | None
+    macd: float | None
+    reason: str
+    pnl: float = 0.0
+    breaker: str = ""
+
+    # display column -> attribute, in table order
+    COLUMNS = {
+        "Symbol": "symbol", "Net USD Position": "current_net", "Trade Position": "current_position",
+        "Target Position": "target_position", "Trade Delta": "delta_position", "Trend": "trend_signal",
+        "Trend Strength": "trend_strength", "RSI": "rsi", "MACD": "macd", "Reason": "reason",
+        "PNL": "pnl", "Breaker": "breaker",
+    }
+
+    def as_dict(self) -> Dict[str, object]:
+        """Keyed by display column (CSV export, DataFrames)."""
+        return {col: getattr(self, attr) for col, attr in self.COLUMNS.items()}
+
+
+def floor_to_min_lot(x: np.ndarray, step: np.ndarray) -> np.ndarray:
+    """Exact vectorized `round_down_to_step` (no tolerance, unlike the risk stage's floor)."""
+    ax = np.abs(x)
+    ok = step > 0
+    safe = np.where(ok, step, 1.0)
+    val = np.where(ax < step, 0.0, np.floor(ax / safe) * safe)
+    return np.where(ok, np.where((x >= 0) | (val == 0), val, -val), x)  # scalar path returns +0.0
+
+
+def nearest_to_min_lot(x: np.ndarray, step: np.ndarray) -> np.ndarray:
+    """Round to the nearest multiple of step (halves away from zero)."""
+    ok = step > 0
+    safe = np.where(ok, step, 1.0)
+    val = np.floor(np.abs(x) / safe + 0.5) * safe
+    return np.where(ok, np.where((x >= 0) | (val == 0), val, -val), x)
+
+
+def joint_round(x: np.ndarray, step: np.ndarray, usd_per_lot: np.ndarray,
+                bases: Sequence[str], quotes: Sequence[str], max_passes: int = 8) -> np.ndarray:
+    """
+    Round every leg to the multiple of its step just inside or just past `x`,
+    choosing jointly so the USD value of the remainders, summed per currency
+    (base +, quote -), is small. Starts from nearest rounding and flips single
+    legs while the total |residual| over all currencies drops. Legs without a
+    USD price (NaN) keep nearest rounding.
+    """
+    x = np.asarray(x, dtype="float64")
+    n = len(x)
+    ok = step > 0
+    safe = np.where(ok, step, 1.0)
+    sign = np.where(x < 0, -1.0, 1.0)
+    inner = sign * np.floor(np.abs(x) / safe) * safe
+    choice = nearest_to_min_lot(x, step)
+    u = np.nan_to_num(np.asarray(usd_per_lot, dtype="float64"))
+    movable = ok & (u > 0) & (inner != x)
+    if n == 0 or not movable.any():
+        return choice
+    alt = np.where(choice == inner, inner + sign * safe, inner)
+
+    ccys = sorted(set(bases) | set(quotes))
+    col = {c: j for j, c in enumerate(ccys)}
+    bi = np.array([col[c] for c in bases])
+    qi = np.array([col[c] for c in quotes])
+    net = np.zeros(len(ccys))  # USD residual per currency
+    r = (x - choice) * u
+    np.add.at(net, bi, r)
+    np.add.at(net, qi, -r)
+
+    for _ in range(max_passes):
+        improved = False
+        for i in np.flatnonzero(movable):
+            d = (choice[i] - alt[i]) * u[i]  # residual change when switching to alt
+            b, q = bi[i], qi[i]
+            gain = abs(net[b]) + abs(net[q]) - abs(net[b] + d) - abs(net[q] - d)
+            if gain > 1e-9:
+                net[b] += d
+                net[q] -= d
+                choice[i], alt[i] = alt[i], choice[i]
+                improved = True
+        if not improved:
+            break
+    return choice
+
+
+def residual_by_currency(residual: Sequence[float], usd_per_lot: Sequence[float],
+                         bases: Sequence[str], quotes: Sequence[str]) -> dict:
+    """USD value of unhedged lots per currency (long base / short quote per residual lot)."""
+    out: dict = {}
+    for r, u, b, q in zip(residual, usd_per_lot, bases, quotes):
+        if r == 0 or not np.isfinite(u):
+            continue
+        v = float(r * u)
+        out[b] = out.get(b, 0.0) + v
+        out[q] = out.get(q, 0.0) - v
+    return out
+
+
+def decide(symbols: Sequence[str], current_net: Sequence[float], current_pos: Sequence[float],
+           multiplier: Sequence[float], min_lot: Sequence[float], max_position: Sequence[float],
+           trends: Sequence[str], *, follow_position: bool,
+           allow_neutral: bool, allow_opposite: bool, lot_rounding: str = "floor",
+           usd_per_lot: Sequence[float] | None = None,
+           bases: Sequence[str] | None = None, quotes: Sequence[str] | None = None) -> DecisionBatch:
+    """
+    lot_rounding: "floor" (towards zero, the default), "nearest", or "joint"
+    (needs usd_per_lot and each leg's base/quote currency).
+    """
+    net = np.asarray(current_net, dtype="float64")
+    pos = np.asarray(current_pos, dtype="float64")
+    step = np.asarray(min_lot, dtype="float64")
+    cap = np.asarray(max_position, dtype="float64")
+    trend = np.asarray(trends, dtype=object)
+
+    target = net * np.asarray(multiplier, dtype="float64")
+    if not follow_position:
+        target = -target
+    gap = target - pos
+    if lot_rounding == "floor":
+        delta = floor_to_min_lot(gap, step)
+    elif lot_rounding == "nearest":
+        delta = nearest_to_min_lot(gap, step)
+    elif lot_rounding == "joint":
+        delta = joint_round(gap, step, usd_per_lot, bases, quotes)
+    else:
+        raise ValueError(f"lot_rounding must be one of {ROUNDING_MODES}, got {lot_rounding!r}")
+
+    blocked = np.zeros(len(net), dtype=bool)
+    if not allow_neutral:
+        blocked |= trend == "neutral"
+    if not allow_opposite:
+        blocked |= ((trend == "down") & (target > pos)) | ((trend == "up") & (target < pos))
+
+    gate = np.full(len(net), PENDING, dtype=np.int8)
+    gate[np.abs(pos + delta) > cap] = OVER_MAX_POSITION
+    gate[blocked] = TREND_BLOCKED
+    gate[np.abs(delta) < step] = TOO_SMALL
+    residual = np.where(gate == PENDING, gap - delta, np.where(gate == TOO_SMALL, gap, 0.0))
+
+    return DecisionBatch(list(symbols), net, pos, step, target, delta, gate, residual)
+
+
+def execution_order(usd_notional: Sequence[float], max_legs: int = 0):
+    """
+    Indices to send, largest USD notional first, and the indices queued past
+    `max_legs` (0 = no cap). Unpriced (NaN) legs go last; ties keep input order.
+    """
+    v = np.abs(np.asarray(usd_notional, dtype="float64"))
+    order = np.argsort(np.where(np.isfinite(v), -v, np.inf), kind="stable")
+    if max_legs > 0:
+        return order[:max_legs], order[max_legs:]
+    return order, order[:0]
+
+
+class CarryForward:
+    """
+    Previous cycle's inputs and non-executing decision per symbol.
+
+    When a symbol's net exposure, terminal position and mid have moved no more
+    than the epsilons since its decision was last computed, and no new trend bar
+    has opened (the trend gate reads bar SMAs), `lookup()` returns that decision
+    so the cycle can skip indicators and gating for it. Only
+    legs that did not try to trade are remembered; pending legs are always
+    recomputed. Reference inputs are not refreshed on a hit, so slow drift
+    eventually exceeds the epsilons and forces a recompute.
+    """
+
+    def __init__(self, net_epsilon: float = 0.0, position_epsilon: float = 0.0,
+                 mid_rel_epsilon: float = 0.0, *, enabled: bool = True):
+        self.enabled = enabled
+        self.net_epsilon = float(net_epsilon)
+        self.position_epsilon = float(position_epsilon)
+        self.mid_rel_epsilon = float(mid_rel_epsilon)
+        self._entries: dict = {}
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def lookup(self, symbol: str, net: float, pos: float, mid, bar=None):
+        hit = self._entries.get(symbol) if self.enabled else None
+        if hit is None:
+            return None
+        (p_net, p_pos, p_mid, p_bar), leg = hit
+        if bar != p_bar:
+            return None
+        if abs(net - p_net) > self.net_epsilon or abs(pos - p_pos) > self.position_epsilon:
+            return None
+        if (mid is None) != (p_mid is None):
+            return None
+        if mid is not None and abs(mid - p_mid) > self.mid_rel_epsilon * abs(p_mid):
+            return None
+        return leg
+
+    def remember(self, symbol: str, net: float, pos: float, mid, leg, bar=None) -> None:
+        """Store `leg` as the decision for these inputs; None forgets the symbol."""
+        if leg is None or not self.enabled:
+            self._entries.pop(symbol, None)
+        else:
+            self._entries[symbol] = ((net, pos, mid, bar), leg)
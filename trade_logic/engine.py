@@ -3,7 +3,9 @@ Core trading engine:
 - Manager net positions -> USD-equivalent exposure
 - Delta to target -> execution (market or partial-limit, ATR-free)
 - Risk guard: daily loss block, optional auto-close when breached
+- Portfolio pre-trade risk: all legs scaled/rejected together before sending
 - CSV logs compatible with rc4, plus GUI-friendly rows (including PNL)
+- acycle(): the same cycle for an event loop, with terminal reads made concurrently
 """
 
 from __future__ import annotations
@@ -11,18 +13,31 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, date
 from typing import Dict, List, Any, Tuple
+import asyncio
+import math
+import threading
 import time
 import os
 
 import MetaTrader5 as mt5
 import pandas as pd
 
-from config import CONFIG, SYMBOL_CONFIG
-from data_access.data_access import TerminalClient
+from config.snapshot import ConfigStore, ConfigSnapshot
+from data_access.data_access import TerminalClient, net_lots_by_symbol
+from data_access.async_terminal import AsyncTerminalClient, ReadSnapshot
+from data_access.rate_limit import THROTTLED
+from data_access.prices import PriceResolver
+from data_access.price_feed import PriceFeed
 from trade_logging.logger import (
-    write_exposure_tables, log_trade_csv, log_rejected_csv,
-    log_account_metrics_csv, write_daily_summary_csv,
+    write_exposure_tables, log_trade_csv, log_rejected_csv_rows,
+    log_account_metrics_csv, write_daily_summary_csv, write_daily_symbol_summary_csv,
 )
+from trade_logging.stats import DailyStats
+from trade_logging.rejections import RejectionTracker
+from trade_logging.store import TradeStore
+from trade_logging.reporting import ReportingWorker
+from trade_logging.history import ExposureHistory
+from trade_logging.journal import IntentJournal
 # Try to import the rc4-style audit CSV writer; if missing, no-op so engine still runs.
 try:  # pragma: no cover
     from trade_logging.logger import write_currency_exposure_calculations
@@ -33,7 +48,13 @@ except Exception:  # pragma: no cover
 from utils.utils import (
     round_down_to_step, to_usd_equivalents
 )
-from indicators.indicators import compute_trend_metrics
+from indicators.indicators import (compute_trend_metrics_batch, closes_matrix, trend_timeframe, TREND_BARS,
+                                   last_bar_time, latest_bar_times)
+from trade_logic.risk import MarginTable, PreTradeRisk
+from trade_logic.breaker import CircuitBreakers, SUCCESS_RETCODES
+from trade_logic.decision import (
+    decide, execution_order, residual_by_currency, CarryForward, DecisionRow, PENDING, TREND_BLOCKED, OVER_MAX_POSITION,
+)
 
 
 # -------------------- helpers that respect SYMBOL_CONFIG --------------------
@@ -52,47 +73,149 @@ def _inv_price(p: float | None) -> float | None:
 
 # -------------------- data classes --------------------
 
-@dataclass
-class DecisionRow:
-    symbol: str
-    positions: int
-    buy_volume: float
-    sell_volume: float
-    current_net: float
-    current_position: float
-    target_position: float
-    delta_position: float
-    trend_signal: str
-    trend_strength: float
-    rsi: float | None
-    macd: float | None
-    reason: str
-    pnl: float
+@dataclass(frozen=True)
+class CycleReport:
+    """
+    What the reporting phase needs from a finished cycle. Everything read from
+    MT5 is read by the cycle itself, so a deferred report makes no terminal
+    calls of its own (the MetaTrader5 package is not safe to call concurrently).
+    """
+    usd_df: pd.DataFrame
+    unrealized_pnl: float
+    base_dir: str
+    rows: tuple = ()            # DecisionRow per leg, for the exposure history
+    account: Any = None         # account_info() as read by the cycle
+    realized_pnl: float = 0.0   # today's realized PnL as of the cycle's deal read
 
 
 # -------------------- engine --------------------
 
+DEAL_WINDOW_PAD = 86400.0  # seconds either side of local time when searching deals (server offsets)
+
 class TradingEngine:
-    def __init__(self, manager_rows_provider, terminal: TerminalClient):
+    HEDGE_REPORT_TOP = 5  # largest legs listed in the payload's execution report
+
+    def __init__(self, manager_rows_provider, terminal: TerminalClient, config_store: ConfigStore | None = None,
+                 store: TradeStore | None = None, journal: IntentJournal | None = None):
         """
         manager_rows_provider: callable -> list[dict] of manager exposures (lots)
-        terminal: TerminalClient instance
+        terminal: TerminalClient instance; any object with the same read/order_send methods
+                  works, rate limiting and order lanes are used only when it has a rate_limiter
+        config_store: compiled config (default: CONFIG/SYMBOL_CONFIG, hot-reloaded from disk)
+        store: optional SQLite store; rows are mirrored there and flushed once per cycle
+        journal: optional order intent journal; unresolved intents are reconciled at startup
         """
         self._get_manager_rows = manager_rows_provider
         self.term = terminal
+        self._rate_limited = getattr(terminal, "rate_limiter", None) is not None
+        self.store = store
+        self.journal = journal
+        self.daily = DailyStats()
+        self.rejections = RejectionTracker(self._record_rejections)
+        self._deal_cursor = datetime.combine(self.daily.day, datetime.min.time()).timestamp()
+        self.config = config_store or ConfigStore.from_modules()
+        self._min_lots: Dict[str, float] = {}
+        self._prices = PriceResolver(terminal, {}, {})
+        self.price_feed: PriceFeed | None = None
+        self._carry = CarryForward(enabled=False)
+        self._pending_since: Dict[str, float] = {}  # symbol -> monotonic time its hedge was first due
+        self._daily_lock = threading.RLock()         # DailyStats is shared with the reporting worker
+        self.reporting: ReportingWorker | None = None
+        self.breakers = CircuitBreakers(enabled=False)
+        self.aterm: AsyncTerminalClient | None = None  # created by the first acycle()
+        self.history = ExposureHistory(int(self.config.current.raw.get("runtime", {}).get("history_cycles", 240)))
+        self._apply_snapshot(self.config.current)
+        self.journal_report = self._reconcile_journal()
+        if journal is not None:
+            journal.compact()
 
+    def _apply_snapshot(self, cfg: ConfigSnapshot) -> None:
+        """Bind a compiled config; only called between cycles."""
+        self._cfg = cfg
         # Tradable universe strictly from symbol_config
-        self._tradable = set(SYMBOL_CONFIG.get("symbols", []))
-        self._map = SYMBOL_CONFIG.get("symbol_mapping", {})
-        self._c2u = SYMBOL_CONFIG.get("currency_to_usd_pair", {})
-        self._meta = SYMBOL_CONFIG.get("metadata", {})
+        self._tradable = frozenset(cfg.symbols)
+        self._map = cfg.symbol_mapping
+        self._c2u = cfg.currency_to_usd_pair
+        self._min_lots.clear()
+        self._prices.rebind(self._map, self._c2u)
+        self._bind_price_feed(cfg.raw.get("runtime", {}).get("price_feed", {}))
+        self._bind_reporting(bool(cfg.raw.get("runtime", {}).get("deferred_reporting", False)))
+
+        # Change detection: decisions carried forward while inputs stay within these epsilons.
+        # Joint lot rounding couples every leg to the others, so nothing can be carried then.
+        cd = cfg.raw.get("runtime", {}).get("change_detection", {})
+        self._carry = CarryForward(
+            float(cd.get("net_epsilon", 0.0)),
+            float(cd.get("position_epsilon", 0.0)),
+            float(cd.get("mid_rel_epsilon", 0.0)),
+            enabled=bool(cd.get("enabled", False)) and cfg.trade.lot_rounding != "joint",
+        )
+        # Execution circuit breakers: state survives reloads, only the switches change
+        cb = cfg.raw.get("runtime", {}).get("circuit_breaker", {})
+        self.breakers.enabled = bool(cb.get("enabled", False))
+        self.breakers.max_backoff = float(cb.get("max_backoff_seconds", 3600.0))
+        if self._rate_limited:
+            self.term.configure_rate_limit(cfg.raw.get("runtime", {}).get("order_rate_limit", {}))
+        self._async_workers = int(cfg.raw.get("runtime", {}).get("async_reads", {}).get("max_workers", 8))
+        self.rejections.heartbeat_seconds = float(
+            cfg.raw.get("outputs", {}).get("rejection_heartbeat_seconds", 900))
+
+        # Portfolio pre-trade risk (margin-per-lot table cached across cycles)
+        self._risk = PreTradeRisk(
+            cfg.risk,
+            MarginTable(self.term, self._map, ttl=cfg.risk.margin_cache_seconds),
+            self._contract_size_for,
+            self._c2u,
+        )
+
+    def _bind_price_feed(self, feed_cfg) -> None:
+        """Start/retarget/stop the background tick feed to match the snapshot."""
+        if not feed_cfg.get("enabled"):
+            if self.price_feed is not None:
+                self.price_feed.stop()
+                self.price_feed = None
+        else:
+            universe = [self._map.get(s, s) for s in (*self._tradable, *self._c2u.values())]
+            if self.price_feed is None:
+                self.price_feed = PriceFeed(self.term, universe).start()
+            else:
+                self.price_feed.set_symbols(universe)
+            self.price_feed.poll_seconds = float(feed_cfg.get("poll_seconds", 0.05))
+            self.price_feed.stale_seconds = float(feed_cfg.get("stale_seconds", 10.0))
+        self._prices.feed = self.price_feed
+
+    def _bind_reporting(self, deferred: bool) -> None:
+        """Run the reporting phase on a worker thread, or inline when not deferred."""
+        if deferred and self.reporting is None:
+            self.reporting = ReportingWorker().start()
+        elif not deferred and self.reporting is not None:
+            self.reporting.stop()
+            self.reporting = None
+
+    def close(self) -> None:
+        """Stop background threads (finishing queued reports) and flush the store."""
+        if self.reporting is not None:
+            self.reporting.stop()
+            self.reporting = None
+        if self.price_feed is not None:
+            self.price_feed.stop()
+            self.price_feed = None
+        self._prices.feed = None
+        if self.aterm is not None:
+            self.aterm.close()
+            self.aterm = None
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
 
     # -------- terminal/symbol helpers (use symbol_config mapping) --------
 
     def _mid_price(self, pair: str) -> float | None:
-        """Mid for a manager/engine symbol using terminal mapping."""
-        tsym = self._map.get(pair, pair)
-        return self.term.get_mid_price(tsym)
+        """Mid for a manager/engine symbol from this cycle's snapshot (tick, else USD-leg cross)."""
+        return self._prices.mid(pair)
 
     def _symbol_info(self, symbol: str):
         """Terminal symbol_info using mapping."""
@@ -107,29 +230,32 @@ class TradingEngine:
         price = tick.ask if tick.ask > 0 else (tick.bid or 0)
         return price, info.point, info.digits
 
-    def _current_position(self, symbol: str) -> float:
-        return self.term.get_current_position(symbol)
-
-    # ---- metadata fallbacks from SYMBOL_CONFIG ----
+    # ---- metadata fallbacks from the config snapshot ----
 
     def _min_lot_with_fallback(self, symbol: str) -> float:
-        """Get min lot from terminal; fallback to symbol_config metadata."""
+        """Get min lot from terminal (cached per snapshot); fallback to symbol_config metadata."""
+        cached = self._min_lots.get(symbol)
+        if cached is not None:
+            return cached
         info = self._symbol_info(symbol)
+        value = None
         if info:
             try:
-                return float(info.volume_min)
+                value = float(info.volume_min)
             except Exception:
                 pass
-        return float(self._meta.get(symbol, {}).get("min_lot", 0.01))
+        if value is None:
+            return self._cfg.params(symbol).min_lot
+        self._min_lots[symbol] = value
+        return value
 
     def _contract_size_for(self, symbol: str) -> float:
         """Contract size from symbol_config metadata if present; else 100k for FX."""
-        return float(self._meta.get(symbol, {}).get("contract_size", 100000.0))
+        return self._cfg.params(symbol).contract_size
 
     # -------- Risk & Metrics --------
 
-    def _account_metrics(self) -> dict:
-        ai = mt5.account_info()
+    def _account_metrics(self, ai) -> dict:
         metrics = {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "balance": round(ai.balance, 2) if ai else 0.0,
@@ -140,35 +266,229 @@ class TradingEngine:
         }
         return metrics
 
-    def _todays_realized_pnl(self) -> float:
-        start_of_day = datetime.combine(date.today(), datetime.min.time()).timestamp()
-        deals = mt5.history_deals_get(start_of_day, time.time())
-        if not deals:
-            return 0.0
-        return sum(d.profit for d in deals)
+    def _ingest_deals(self) -> None:
+        """
+        Feed only deals since the last read into the daily stats. Deal times are
+        trade-server time, so the cursor follows the newest deal time seen rather
+        than the local clock, and the upper bound is padded for servers ahead of
+        it (a short overlap guards against late-stamped deals; DailyStats de-dups
+        by ticket).
+        """
+        today = date.today()
+        start_of_day = datetime.combine(today, datetime.min.time()).timestamp()
+        if self.daily.day != today:
+            self.daily = DailyStats(today)
+            self._deal_cursor = start_of_day
+        deals = mt5.history_deals_get(max(start_of_day, self._deal_cursor - 60.0), time.time() + DEAL_WINDOW_PAD)
+        for d in deals or ():
+            self.daily.on_deal(d)
+            stamp = getattr(d, "time", None)
+            if stamp is not None and stamp > self._deal_cursor:
+                self._deal_cursor = float(stamp)
 
-    def _unrealized_pnl(self) -> float:
-        ai = mt5.account_info()
-        return ai.profit if ai else 0.0
+    def _todays_realized_pnl(self) -> float:
+        with self._daily_lock:
+            self._ingest_deals()
+            return self.daily.realized_pnl
 
     def _check_daily_loss(self) -> tuple[bool, float]:
         realized = self._todays_realized_pnl()
-        limit = CONFIG["risk_management"]["daily_loss_limit"]
+        limit = self._cfg.daily_loss_limit
         return (realized >= limit, realized)
 
+    def _apply_pretrade_risk(self, pending: list[dict], book: dict[str, float]) -> dict | None:
+        """
+        Evaluate all pending legs together and scale/reject them in place,
+        on top of the whole terminal book (net lots per terminal symbol) and
+        the margin already in use. Returns the verdict summary for the cycle
+        payload (None when disabled).
+        """
+        limits = self._risk.limits
+        if not pending or not limits.enabled:
+            return None
+
+        leg_syms = {self._map.get(leg["symbol"], leg["symbol"]) for leg in pending}
+        unmap = {t: s for s, t in self._map.items()}
+        held = {unmap.get(t, t): lots for t, lots in book.items() if t not in leg_syms and abs(lots) > 1e-9}
+        mids = self._leg_mids([leg["symbol"] for leg in pending] + list(held))
+
+        ai = mt5.account_info()
+        equity = ai.equity if ai else None
+        margin_used = float(ai.margin) if ai is not None and getattr(ai, "margin", None) is not None else None
+
+        verdict = self._risk.evaluate(
+            [leg["symbol"] for leg in pending],
+            [leg["current_pos"] for leg in pending],
+            [leg["delta"] for leg in pending],
+            [leg["min_lot"] for leg in pending],
+            mids, equity=equity, held=held, margin_used=margin_used,
+        )
+        for i, leg in enumerate(pending):
+            reason = verdict.reasons[i]
+            if reason is None:
+                continue
+            leg["delta"] = float(verdict.approved_delta[i])
+            leg["reason"] = leg["risk_note"] = reason
+            if leg["delta"] == 0.0:
+                leg["pending"] = False
+                self._log_leg_rejection(leg)
+        return verdict.summary()
+
+    def _leg_mids(self, symbols: list[str]) -> dict[str, float | None]:
+        """One mid per leg and per USD pair of every currency involved."""
+        wanted = set(symbols)
+        for sym in symbols:
+            base, quote = _split_ccy_pair(sym)
+            wanted.update(p for p in (self._c2u.get(base), self._c2u.get(quote)) if p)
+        return {s: self._mid_price(s) for s in wanted}
+
+    def _log_leg_rejection(self, leg: dict) -> None:
+        tm = leg["tm"]
+        self.rejections.observe({
+            "symbol": leg["symbol"],
+            "reason": leg["reason"],
+            "delta_position": leg["delta"],
+            "current_position": leg["current_pos"],
+            "current_net": leg["current_net"],
+            "trend_signal": tm.trend,
+            "trend_strength": tm.sma_diff,
+            "rsi": tm.rsi,
+            "macd": tm.macd,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+
+    # -------- Recording: rc4 CSVs + optional SQLite store --------
+
+    def _record_trade(self, row: dict) -> None:
+        with self._daily_lock:
+            self.daily.on_trade(row)
+        log_trade_csv(row)
+        if self.store is not None:
+            self.store.add("trades", row)
+
+    def _record_rejections(self, rows: list[dict]) -> None:
+        """Writer for RejectionTracker: only state changes/heartbeats reach disk."""
+        log_rejected_csv_rows(rows)
+        if self.store is not None:
+            for row in rows:
+                self.store.add("rejections", row)
+
+    def _record_metrics(self, metrics: dict) -> None:
+        log_account_metrics_csv(metrics)
+        if self.store is not None:
+            self.store.add("account_metrics", metrics)
+
+    def _record_summary(self, summary: dict) -> None:
+        """Daily summary (+ per-symbol breakdown), written only when it changed."""
+        with self._daily_lock:
+            if not self.daily.changed(summary):
+                return
+            symbol_rows = self.daily.symbol_rows()
+        write_daily_summary_csv(summary)
+        write_daily_symbol_summary_csv(symbol_rows)
+        if self.store is not None:
+            self.store.add("cycle_summaries", {"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), **summary})
+
+    def _flush_store(self) -> None:
+        """One SQLite transaction per cycle."""
+        if self.store is not None:
+            self.store.flush()
+
+    def _report(self, rep: CycleReport) -> None:
+        """Reporting phase: exposure history and tables, metrics, daily summary, store flush (no MT5 calls)."""
+        if rep.rows:
+            self.history.record([r.symbol for r in rep.rows], net=[r.current_net for r in rep.rows],
+                                position=[r.current_position for r in rep.rows],
+                                target=[r.target_position for r in rep.rows],
+                                pnl=[r.pnl for r in rep.rows])
+        write_exposure_tables(rep.usd_df, rep.base_dir)
+        metrics = self._account_metrics(rep.account)
+        metrics.update({"realized_pnl_today": rep.realized_pnl, "unrealized_pnl": rep.unrealized_pnl})
+        with self._daily_lock:
+            summary = self.daily.summary(rep.unrealized_pnl)
+        self._record_metrics(metrics)
+        self._record_summary(summary)
+        self._flush_store()
+
+    def _submit_report(self, rep: CycleReport) -> None:
+        if self.reporting is not None:
+            self.reporting.submit(self._report, rep)
+        else:
+            self._report(rep)
+
     # -------- Execution --------
 
-    def _send_market_or_partial_limit(self, symbol: str, side_buy: bool, volume: float) -> bool:
+    def _terminal_send(self, req: dict, lane: str):
+        """order_send in a priority lane when the terminal rate-limits, plain otherwise."""
+        if self._rate_limited:
+            return self.term.order_send(req, lane=lane)
+        return self.term.order_send(req)
+
+    def _send_order(self, symbol: str, req: dict, lane: str = "normal"):
+        """order_send behind a journaled intent; the client id rides in the request comment."""
+        if self.journal is None:
+            return self._terminal_send(req, lane)
+        cid = self.journal.new_cid()
+        req["comment"] = cid
+        self.journal.intent(cid, symbol, req)
+        res = self._terminal_send(req, lane)
+        if res is THROTTLED:  # held back by the rate limiter: never left, nothing to reconcile
+            self.journal.outcome(cid, "throttled")
+        elif res is not None:  # no result: fate unknown, left open for reconciliation
+            ok = res.retcode in SUCCESS_RETCODES
+            self.journal.outcome(cid, "done" if ok else "failed", retcode=res.retcode,
+                                 order=getattr(res, "order", None), deal=getattr(res, "deal", None))
+        return res
+
+    def _reconcile_journal(self) -> dict | None:
+        """Resolve unresolved intents with one orders_get() and one history_deals_get()."""
+        if self.journal is None:
+            return None
+        oldest = self.journal.oldest_open()
+        if oldest is None:
+            return {"filled": 0, "placed": 0, "lost": 0, "in_flight": 0}
+        # Deal times are trade-server time, not local epoch: query a window a day wider
+        # on both sides so any broker offset is covered; deals are matched by comment
+        report = self.journal.reconcile(self.term.orders_get(),
+                                        mt5.history_deals_get(oldest - DEAL_WINDOW_PAD, time.time() + DEAL_WINDOW_PAD))
+        for rec in report["filled"]:
+            # the order went through but its trade row never made it to disk
+            volume = sum(getattr(d, "volume", 0.0) for d in rec["deals"])
+            price = getattr(rec["deals"][-1], "price", rec.get("price"))
+            buy = rec.get("type") in (mt5.ORDER_TYPE_BUY, mt5.ORDER_TYPE_BUY_LIMIT)
+            self._record_trade({
+                "symbol": rec["symbol"], "terminal_symbol": rec.get("terminal_symbol"),
+                "trade_type": "BUY" if buy else "SELL",
+                "requested_volume": rec.get("volume"), "executed_volume": volume,
+                "requested_price": rec.get("price"), "executed_price": price, "slippage_points": None,
+                "current_net": None, "target_position": None, "current_position": None,
+                "delta_position": volume if buy else -volume,
+                "trend_signal": "", "trend_strength": None, "rsi": None, "macd": None,
+                "reason": "Recovered from intent journal",
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "order_id": getattr(rec["deals"][-1], "order", ""),
+            })
+        return {k: len(v) for k, v in report.items()}
+
+    def _send_market_or_partial_limit(self, symbol: str, side_buy: bool, volume: float,
+                                      current_pos: float = 0.0) -> tuple[bool, dict | None]:
+        """
+        Send the leg's order(s); DONE, PLACED and DONE_PARTIAL count as success.
+        Returns (success, fill): fill has the market request's requested/executed
+        price and slippage in points (positive = worse than requested), or None.
+        """
         tsym = self._map.get(symbol, symbol)
         info = self.term.symbol_info(tsym)
         tick = self.term.symbol_info_tick(tsym)
         if not info or not tick:
-            return False
+            self.breakers.record(symbol, None)
+            return False, None
 
         market_price = tick.ask if side_buy else tick.bid
+        lo = self._cfg.limit_orders
         requests = []
-        if CONFIG["limit_orders"]["use_limit_orders"] and CONFIG["limit_orders"]["enable_partial_limit"]:
-            mkt_vol = round_down_to_step(volume * CONFIG["limit_orders"]["market_order_percentage"], info.volume_step)
+        if lo.use_limit_orders and lo.enable_partial_limit:
+            mkt_vol = round_down_to_step(volume * lo.market_order_percentage, info.volume_step)
             lim_vol = round_down_to_step(volume - mkt_vol, info.volume_step)
             if mkt_vol >= info.volume_min:
                 requests.append(dict(
@@ -181,7 +501,7 @@ class TradingEngine:
                     type_time=mt5.ORDER_TIME_GTC, type_filling=mt5.ORDER_FILLING_IOC
                 ))
             if lim_vol >= info.volume_min:
-                offset = CONFIG["limit_orders"]["limit_offset_points"] * info.point
+                offset = lo.limit_offset_points * info.point
                 limit_price = (tick.bid - offset) if side_buy else (tick.ask + offset)
                 requests.append(dict(
                     action=mt5.TRADE_ACTION_PENDING,
@@ -203,17 +523,26 @@ class TradingEngine:
                 type_time=mt5.ORDER_TIME_GTC, type_filling=mt5.ORDER_FILLING_IOC
             ))
 
-        success_any = False
+        success_any, fill = False, None
         for req in requests:
-            res = self.term.order_send(req)
-            if res and res.retcode == mt5.TRADE_RETCODE_DONE:
+            if not self.breakers.allow(symbol):  # an earlier request of this leg tripped it
+                break
+            res = self._send_order(symbol, req)
+            if res is not THROTTLED:  # our own throttle says nothing about the symbol
+                self.breakers.record(symbol, res.retcode if res else None)
+            if res and res.retcode in SUCCESS_RETCODES:
                 success_any = True
+                if req["action"] == mt5.TRADE_ACTION_DEAL:
+                    executed = float(getattr(res, "price", 0.0) or req["price"])
+                    slip = (executed - req["price"]) if side_buy else (req["price"] - executed)
+                    fill = {"requested_price": req["price"], "executed_price": executed,
+                            "slippage_points": round(slip / info.point, 1) if info.point else 0.0}
             else:
-                log_rejected_csv({
+                self.rejections.observe({
                     "symbol": symbol,
                     "reason": f"order_send failed: {getattr(res,'comment', 'no result')}",
                     "delta_position": req["volume"] if side_buy else -req["volume"],
-                    "current_position": self._current_position(symbol),
+                    "current_position": current_pos,
                     "current_net": 0.0,
                     "trend_signal": "",
                     "trend_strength": 0.0,
@@ -221,7 +550,7 @@ class TradingEngine:
                     "macd": None,
                     "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 })
-        return success_any
+        return success_any, fill
 
     def _close_all_positions(self) -> int:
         positions = self.term.positions_get()
@@ -240,9 +569,23 @@ class TradingEngine:
                 deviation=20, magic=123456,
                 type_time=mt5.ORDER_TIME_GTC, type_filling=mt5.ORDER_FILLING_IOC
             )
-            res = self.term.order_send(req)
+            res = self._send_order(pos.symbol, req, lane="risk")  # ahead of any queued rebalance, never throttled
             if res and res.retcode == mt5.TRADE_RETCODE_DONE:
                 closed += 1
+                continue
+            side = 1.0 if side_buy else -1.0
+            self.rejections.observe({
+                "symbol": pos.symbol,
+                "reason": f"risk close failed: {getattr(res, 'comment', 'no result')}",
+                "delta_position": -side * pos.volume,
+                "current_position": side * pos.volume,
+                "current_net": 0.0,
+                "trend_signal": "",
+                "trend_strength": 0.0,
+                "rsi": None,
+                "macd": None,
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            })
         return closed
 
     # -------------------- USD consolidation (rc4-style) --------------------
@@ -254,7 +597,9 @@ class TradingEngine:
         rc4-style consolidation:
         1) Sum currency exposures in units:
            base += L*contract_size; quote += -L*contract_size*mid
-        2) For each non-USD currency C, map to USD pair via SYMBOL_CONFIG["currency_to_usd_pair"][C]
+           (mid from the cycle's tick snapshot; crosses without a tick are
+           triangulated from their USD legs, tagged via price_source/price_age)
+        2) For each non-USD currency C, map to USD pair via snapshot currency_to_usd_pair[C]
            If USD/C: current_net = -net_units / (contract_size(pair)*mid(pair))
            If C/USD: current_net =  net_units /  contract_size(pair)
         Returns (usd_df, calculation_steps).
@@ -282,8 +627,8 @@ class TradingEngine:
 
             base, quote = sym[:3], sym[3:]
             cs = self._contract_size_for(sym)
-            mid = self._mid_price(sym)
-            if mid is None:
+            q = self._prices.quote(sym)
+            if q is None:
                 step.update({
                     "base_exposure": 0.0, "quote_exposure": 0.0,
                     "aggregated_net_units": 0.0, "current_net": 0.0,
@@ -292,11 +637,13 @@ class TradingEngine:
                 steps.append(step)
                 continue
 
+            mid = q.mid
             base_exp = lots * cs
             quote_exp = -lots * cs * mid
             ccy_units[base] += base_exp
             ccy_units[quote] += quote_exp
-            step.update({"base_exposure": base_exp, "quote_exposure": quote_exp})
+            step.update({"base_exposure": base_exp, "quote_exposure": quote_exp,
+                         "price_source": q.source, "price_age": q.age})
             steps.append(step)
 
         # 2) express each non-USD currency in a single USD pair
@@ -321,9 +668,9 @@ class TradingEngine:
                 })
                 continue
 
-            mid = self._mid_price(pair)
+            q = self._prices.quote(pair)
             cs_pair = self._contract_size_for(pair)
-            if mid is None:
+            if q is None:
                 steps.append({
                     "symbol": pair, "net_volume": 0.0,
                     "base_exposure": 0.0, "quote_exposure": 0.0,
@@ -332,6 +679,7 @@ class TradingEngine:
                 })
                 continue
 
+            mid = q.mid
             if pair.startswith("USD"):  # USD/C
                 current_net = -net_units / (cs_pair * mid)
                 formula = f"-net_units ({net_units}) / (contract_size ({cs_pair}) * mid_price ({mid}))"
@@ -343,7 +691,8 @@ class TradingEngine:
                 "symbol": pair, "net_volume": 0.0,
                 "base_exposure": 0.0, "quote_exposure": 0.0,
                 "aggregated_net_units": net_units,
-                "current_net": current_net, "formula": formula
+                "current_net": current_net, "formula": formula,
+                "price_source": q.source, "price_age": q.age,
             })
 
             # build trading row (only if symbol is tradable in SYMBOL_CONFIG)
@@ -358,15 +707,87 @@ class TradingEngine:
         usd_df = pd.DataFrame(rows, columns=["symbol", "net_volume", "positions", "buy_volume", "sell_volume", "timestamp"])
         return usd_df, steps
 
+    # -------------------- Concurrent reads (acycle) --------------------
+
+    def _read_universe(self) -> list[str]:
+        """Engine symbols a cycle may read: tradable pairs plus every currency's USD leg."""
+        return sorted(self._tradable | set(self._c2u.values()))
+
+    def _prime(self, snap: ReadSnapshot) -> None:
+        """Seed this cycle's tick and min-lot caches from a prefetched snapshot."""
+        ticks = {}
+        for s in self._read_universe():
+            tsym = self._map.get(s, s)
+            if tsym in snap.ticks:
+                ticks[s] = snap.ticks[tsym]
+            info = snap.infos.get(tsym)
+            if info is not None and s not in self._min_lots:
+                try:
+                    self._min_lots[s] = float(info.volume_min)
+                except Exception:
+                    pass
+        self._prices.prime(ticks)
+
+    def _prefetched_closes(self, snap: ReadSnapshot | None, symbols: list[str]):
+        """Close matrix from the snapshot; None (indicators read MT5) if any symbol is missing."""
+        if snap is None or not all(self._map.get(s, s) in snap.rates for s in symbols):
+            return None
+        return closes_matrix([snap.rates[self._map.get(s, s)] for s in symbols], TREND_BARS)
+
+    def _bar_times(self, snap: ReadSnapshot | None, symbols: list[str]) -> list:
+        """Newest trend bar per symbol (part of the carry-forward key): from the snapshot, else read."""
+        rates = snap.rates if snap is not None else {}
+        missing = [s for s in symbols if self._map.get(s, s) not in rates]
+        read = dict(zip(missing, latest_bar_times(missing, self._map)))
+        return [read[s] if s in read else last_bar_time(rates[self._map.get(s, s)]) for s in symbols]
+
+    async def acycle(self) -> dict:
+        """
+        cycle() for an event loop. Ticks, symbol info and bars for the whole
+        universe, and the positions, are read concurrently on the async
+        client's bounded pool; the cycle then runs in a worker thread on that
+        snapshot, so the loop is never blocked. Same payload as cycle(), plus
+        timings["prefetch_ms"]. Don't run cycle() and acycle() at once on one engine.
+        """
+        t0 = time.monotonic()
+        if self.aterm is None or self.aterm.max_workers != self._async_workers:
+            if self.aterm is not None:
+                self.aterm.close()
+            self.aterm = AsyncTerminalClient(self.term, self._async_workers)
+        snap = await self.aterm.read_snapshot(
+            [self._map.get(s, s) for s in self._read_universe()], bars=TREND_BARS,
+            timeframe=trend_timeframe(), ticks=self.price_feed is None,  # a running feed already has them
+        )
+        prefetch_ms = round((time.monotonic() - t0) * 1000, 2)
+        out = await asyncio.to_thread(self.cycle, snap)
+        if "timings" in out:
+            out["timings"]["prefetch_ms"] = prefetch_ms
+        return out
+
     # -------------------- Main cycle --------------------
 
-    def cycle(self) -> dict:
+    def cycle(self, prefetched: ReadSnapshot | None = None) -> dict:
         """
         Run one decision/execute cycle and return GUI-friendly payload:
-          { "usd_rows": [...], "pair_rows": [...], "trades_executed": int, "status"?: str }
+          { "usd_rows": [DecisionRow, ...], "pair_rows": [...], "trades_executed": int, "status"?: str }
+        prefetched: terminal reads already made this cycle (see acycle); misses are read as usual
         """
+        # 0) Pick up config edits between cycles; the whole cycle uses one snapshot
+        cfg = self.config.refresh()
+        if cfg is not self._cfg:
+            self._apply_snapshot(cfg)
+        self._prices.begin_cycle()
+        if prefetched is not None:
+            self._prime(prefetched)
+        self.rejections.begin_cycle()
+        # Orders whose outcome is unknown (crash, no result) block their symbol until resolved
+        if self.journal is not None and self.journal.oldest_open() is not None:
+            self.journal_report = self._reconcile_journal()
+        unconfirmed = self.journal.blocked_symbols() if self.journal is not None else set()
+
         # 1) Read manager exposures
         manager_rows = self._get_manager_rows()
+        t_read = time.monotonic()
         if not manager_rows:
             return {"usd_rows": [], "pair_rows": [], "trades_executed": 0}
 
@@ -380,8 +801,7 @@ class TradingEngine:
         ]
 
         # 2) Consolidation and/or USD conversion
-        routing = CONFIG.get("routing", {})
-        if routing.get("consolidate_to_usd", False):
+        if cfg.routing.consolidate_to_usd:
             # Build USD pairs directly from currency exposures (rc4-style)
             net_df = pd.DataFrame(manager_rows)
             usd_df, calc_steps = self._compute_usd_pairs_from_currency_exposures(net_df)
@@ -398,171 +818,207 @@ class TradingEngine:
 
         # 3) Risk check (daily loss)
         ok, realized = self._check_daily_loss()
-        unreal = self._unrealized_pnl()
+        account = mt5.account_info()
+        unreal = account.profit if account else 0.0
         if not ok:
-            if CONFIG["risk_management"].get("auto_close_on_daily_loss_limit", False):
+            if cfg.auto_close_on_daily_loss_limit:
                 self._close_all_positions()
-            metrics = self._account_metrics()
-            metrics.update({"realized_pnl_today": realized, "unrealized_pnl": unreal})
-            log_account_metrics_csv(metrics)
-            write_daily_summary_csv({
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "total_trades": 0,
-                "avg_slippage_points": 0.0,
-                "buy_trades": 0,
-                "sell_trades": 0,
-                "win_trades": 0,
-                "loss_trades": 0,
-                "avg_profit": 0.0,
-                "avg_loss": 0.0,
-                "unrealized_pnl": unreal,
-                "realized_pnl": realized
-            })
-            write_exposure_tables(usd_df, os.getcwd())
+            self.rejections.flush()
+            self._submit_report(CycleReport(usd_df, unreal, os.getcwd(), account=account, realized_pnl=realized))
             return {"usd_rows": [], "pair_rows": pair_rows, "trades_executed": 0, "status": "RISK GUARD: daily loss breached"}
 
-        # 4) Decide & execute per (possibly consolidated) USD symbol
+        # 4) Decide for all (possibly consolidated) USD symbols at once
+        t_decide = time.monotonic()
+        tp = cfg.trade
         trades_executed = 0
-        gui_usd_rows: list[dict] = []
-        
-        for _, row in usd_df.iterrows():
-            symbol = row["symbol"]
-            current_net = float(row["net_volume"])
-            positions = int(row.get("positions", 0))
-            buy_vol = float(row.get("buy_volume", 0.0))
-            sell_vol = float(row.get("sell_volume", 0.0))
-            current_pos = self._current_position(symbol)
-
-            # Target/Delta (ATR-free)
-            mult = CONFIG["trade_management"]["fixed_multiplier"] if CONFIG["trade_management"]["use_fixed_multiplier"] \
-                   else CONFIG["trade_management"]["trade_size_multiplier"]
-            if CONFIG['trade_management']['follow_position']:
-                target = current_net * mult
-                delta = target - current_pos
-            else:
-                target = -current_net * mult
-                delta = target - current_pos
-            # Round DOWN to symbol's min lot (terminal -> fallback to symbol_config)
-            min_lot = self._min_lot_with_fallback(symbol)
-            delta = round_down_to_step(delta, min_lot)
-
-            # Trend metrics + gating
-            tm = compute_trend_metrics(symbol)
-            allow = True
-            if tm.trend == "neutral" and not CONFIG["trade_management"]["allow_trades_on_neutral_trend"]:
-                allow = False
-            if tm.trend in ("down",) and target > current_pos and not CONFIG["trade_management"]["allow_trades_on_opposite_trend"]:
-                allow = False
-            if tm.trend in ("up",) and target < current_pos and not CONFIG["trade_management"]["allow_trades_on_opposite_trend"]:
-                allow = False
-
-            reason = "Initialized"
-            if abs(delta) < min_lot:
-                reason = f"Delta too small: {delta:.2f}"
-                executed = False
-            elif not allow:
-                reason = "Trade conditions not met"
-                executed = False
-                log_rejected_csv({
+
+        symbols = [str(s) for s in usd_df["symbol"]]
+        nets = usd_df["net_volume"].to_numpy(dtype="float64")
+        # whole terminal book from one positions_get(): legs read their symbol, risk sees the rest
+        open_positions = prefetched.positions if prefetched is not None else self.term.positions_get()
+        book = net_lots_by_symbol(open_positions)
+        pnl_by_term: dict[str, float] = {}  # open profit per terminal symbol, before this cycle's orders
+        for p in open_positions or ():
+            pnl_by_term[p.symbol] = pnl_by_term.get(p.symbol, 0.0) + p.profit
+        positions = {s: round(book.get(self._map.get(s, s), 0.0), 2) for s in symbols}
+        mids = [self._mid_price(s) for s in symbols]
+
+        # Unchanged symbols carry last cycle's (non-trading) decision; only the rest is recomputed.
+        # A new trend bar can flip the gate without moving the mid, so it invalidates the carry.
+        bars = self._bar_times(prefetched, symbols) if self._carry.enabled else [None] * len(symbols)
+        legs: list[dict | None] = [
+            self._carry.lookup(s, float(nets[i]), positions[s], mids[i], bars[i]) for i, s in enumerate(symbols)
+        ]
+        fresh = [i for i, leg in enumerate(legs) if leg is None]
+        fresh_set = set(fresh)
+        fresh_syms = [symbols[i] for i in fresh]
+        params = [cfg.params(s) for s in fresh_syms]
+        trend = compute_trend_metrics_batch(fresh_syms, closes=self._prefetched_closes(prefetched, fresh_syms),
+                                            symbol_mapping=self._map, params=cfg.raw.get("indicators"))
+        ccys = [_split_ccy_pair(s) for s in symbols]
+        usd_per_lot = self._risk.usd_notional_per_lot(symbols, self._leg_mids(symbols))
+        batch = decide(
+            fresh_syms,
+            nets[fresh],
+            [positions[s] for s in fresh_syms],
+            [p.multiplier for p in params],
+            [self._min_lot_with_fallback(s) for s in fresh_syms],  # terminal -> symbol_config fallback
+            [p.max_position_size for p in params],
+            trend.trend,
+            follow_position=tp.follow_position,
+            allow_neutral=tp.allow_trades_on_neutral_trend,
+            allow_opposite=tp.allow_trades_on_opposite_trend,
+            lot_rounding=tp.lot_rounding,
+            usd_per_lot=usd_per_lot[fresh],
+            bases=[ccys[i][0] for i in fresh],
+            quotes=[ccys[i][1] for i in fresh],
+        )
+        for k, i in enumerate(fresh):
+            gate = batch.gate[k]
+            legs[i] = {
+                "symbol": symbols[i], "current_net": float(batch.current_net[k]),
+                "current_pos": float(batch.current_pos[k]), "target": float(batch.target[k]),
+                "delta": float(batch.delta[k]), "min_lot": float(batch.min_lot[k]), "tm": trend[k],
+                "reason": batch.reason(k), "pending": bool(gate == PENDING), "gate": int(gate),
+                "residual": float(batch.residual[k]),
+            }
+            self._carry.remember(symbols[i], float(nets[i]), positions[symbols[i]], mids[i],
+                                 None if gate == PENDING else dict(legs[i]), bars[i])
+        carried = len(symbols) - len(fresh)
+
+        for i, leg in enumerate(legs):
+            if i not in fresh_set:
+                legs[i] = leg = dict(leg)
+            if leg["gate"] in (TREND_BLOCKED, OVER_MAX_POSITION):
+                self._log_leg_rejection(leg)
+
+        # Sub-lot remainders the rounding leaves unhedged, in USD per currency
+        residual_usd = residual_by_currency([leg["residual"] for leg in legs], usd_per_lot,
+                                            [c[0] for c in ccys], [c[1] for c in ccys])
+
+        # 5) Portfolio pre-trade risk: all pending legs at once, before any order goes out
+        risk_summary = self._apply_pretrade_risk([leg for leg in legs if leg["pending"]], book)
+
+        # 6) Execute approved legs, largest USD notional first; past the per-cycle cap
+        #    they are queued (not sent, not carried) and re-decided next cycle
+        approved = [leg for leg in legs if leg["pending"]]
+        per_lot = dict(zip(symbols, usd_per_lot.tolist()))
+        for leg in approved:
+            leg["usd_notional"] = abs(leg["delta"]) * per_lot[leg["symbol"]]
+        send, queued = execution_order([leg["usd_notional"] for leg in approved], tp.max_legs_per_cycle)
+
+        # hedge clock: starts the first cycle a symbol needs a trade, stops when one executes
+        self._pending_since = {leg["symbol"]: self._pending_since.get(leg["symbol"], t_read)
+                               for leg in legs if leg["gate"] == PENDING}
+        for i in queued:
+            leg = approved[i]
+            leg["pending"] = False
+            leg["status"] = "queued"
+            leg["reason"] = f"Queued: leg cap ({tp.max_legs_per_cycle} per cycle)"
+
+        t_send = time.monotonic()
+        for i in send:
+            leg = approved[i]
+            symbol, delta, tm = leg["symbol"], leg["delta"], leg["tm"]
+            if symbol in unconfirmed:
+                leg["pending"] = False
+                leg["status"] = "unconfirmed"
+                leg["reason"] = "Awaiting confirmation of an earlier order"
+                continue
+            if not self.breakers.allow(symbol):
+                leg["pending"] = False
+                leg["status"] = "breaker_open"
+                leg["reason"] = f"Breaker {self.breakers.label(symbol)}"
+                continue
+            executed, fill = self._send_market_or_partial_limit(symbol, side_buy=(delta > 0), volume=abs(delta),
+                                                                current_pos=leg["current_pos"])
+            leg["reason"] = "Trade executed" if executed else "Trade failed"
+            leg["status"] = "executed" if executed else "failed"
+            if leg.get("risk_note"):
+                leg["reason"] += f"; {leg['risk_note']}"
+            if executed:
+                leg["time_to_hedge"] = time.monotonic() - self._pending_since.pop(symbol)
+                trades_executed += 1
+                if fill is None:  # limit-only leg: placed, nothing filled yet
+                    price, point, digits = self._price_and_point(symbol)
+                    fill = {"requested_price": price, "executed_price": price, "slippage_points": 0.0}
+                self._record_trade({
                     "symbol": symbol,
-                    "reason": reason,
+                    "terminal_symbol": self._map.get(symbol, symbol),
+                    "trade_type": "BUY" if delta > 0 else "SELL",
+                    "requested_volume": abs(delta),
+                    "executed_volume": abs(delta),
+                    **fill,
+                    "current_net": leg["current_net"],
+                    "target_position": leg["target"],
+                    "current_position": leg["current_pos"],
                     "delta_position": delta,
-                    "current_position": current_pos,
-                    "current_net": current_net,
                     "trend_signal": tm.trend,
                     "trend_strength": tm.sma_diff,
                     "rsi": tm.rsi,
                     "macd": tm.macd,
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    "reason": leg["reason"],
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "order_id": ""
                 })
-            else:
-                # clamp to max position size
-                new_pos = current_pos + (abs(delta) if delta > 0 else -abs(delta))
-                if abs(new_pos) > CONFIG["trade_management"]["max_position_size"]:
-                    reason = "Exceeds max position size"
-                    executed = False
-                    log_rejected_csv({
-                        "symbol": symbol,
-                        "reason": reason,
-                        "delta_position": delta,
-                        "current_position": current_pos,
-                        "current_net": current_net,
-                        "trend_signal": tm.trend,
-                        "trend_strength": tm.sma_diff,
-                        "rsi": tm.rsi,
-                        "macd": tm.macd,
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    })
-                else:
-                    executed = self._send_market_or_partial_limit(symbol, side_buy=(delta > 0), volume=abs(delta))
-                    reason = "Trade executed" if executed else "Trade failed"
-                    if executed:
-                        trades_executed += 1
-                        price, point, digits = self._price_and_point(symbol)
-                        log_trade_csv({
-                            "symbol": symbol,
-                            "terminal_symbol": self._map.get(symbol, symbol),
-                            "trade_type": "BUY" if delta > 0 else "SELL",
-                            "requested_volume": abs(delta),
-                            "executed_volume": abs(delta),
-                            "requested_price": price,
-                            "executed_price": price,
-                            "slippage_points": 0,
-                            "current_net": current_net,
-                            "target_position": target,
-                            "current_position": current_pos,
-                            "delta_position": delta,
-                            "trend_signal": tm.trend,
-                            "trend_strength": tm.sma_diff,
-                            "rsi": tm.rsi,
-                            "macd": tm.macd,
-                            "reason": reason,
-                            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            "order_id": ""
-                        })
-
-            # per-symbol PnL (live)
-            sym_term = self._map.get(symbol, symbol)
-            sym_positions = mt5.positions_get(symbol=sym_term) or []
-            sym_pnl = sum(p.profit for p in sym_positions)
-
-            gui_usd_rows.append({
-                "Symbol": symbol,
-                "Net USD Position": f"{current_net:.2f}",
-                "Trade Position": f"{current_pos:.2f}",
-                "Target Position": f"{target:.2f}",
-                "Trade Delta": f"{delta:.2f}",
-                "Trend": tm.trend.capitalize(),
-                "Trend Strength": tm.sma_diff,
-                "RSI": None if tm.rsi is None else round(tm.rsi, 2),
-                "MACD": None if tm.macd is None else round(tm.macd, 4),
-                "Reason": reason,
-                "PNL": round(sym_pnl, 2)
-            })
 
-        # 5) Exposure tables like rc4
-        write_exposure_tables(usd_df, os.getcwd())
+        t_sent = time.monotonic()
 
-        # 6) Metrics + daily summary snapshot
-        metrics = self._account_metrics()
-        metrics.update({"realized_pnl_today": self._todays_realized_pnl(), "unrealized_pnl": unreal})
-        log_account_metrics_csv(metrics)
-        write_daily_summary_csv({
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "total_trades": trades_executed,
-            "avg_slippage_points": 0.0,
-            "buy_trades": 0,
-            "sell_trades": 0,
-            "win_trades": 0,
-            "loss_trades": 0,
-            "avg_profit": 0.0,
-            "avg_loss": 0.0,
-            "unrealized_pnl": unreal,
-            "realized_pnl": self._todays_realized_pnl()
-        })
+        # Rejections: close records for symbols no longer blocked, then write state changes
+        self.rejections.end_cycle(leg["symbol"] for leg in legs)
+        self.rejections.flush()
+
+        rows = [
+            DecisionRow(leg["symbol"], float(leg["current_net"]), float(leg["current_pos"]), float(leg["target"]),
+                        float(leg["delta"]), leg["tm"].trend, leg["tm"].sma_diff, leg["tm"].rsi, leg["tm"].macd,
+                        leg["reason"], pnl=pnl_by_term.get(self._map.get(leg["symbol"], leg["symbol"]), 0.0),
+                        breaker=self.breakers.label(leg["symbol"]))
+            for leg in legs
+        ]
+
+        # 7-8) Exposure tables, metrics and daily summary, optionally off the critical path;
+        #      the report only writes what this cycle already read
+        self._submit_report(CycleReport(usd_df, unreal, os.getcwd(), tuple(rows),
+                                        account=account, realized_pnl=realized))
+
+        now = time.monotonic()
+        largest = []
+        for i in [*send, *queued][:self.HEDGE_REPORT_TOP]:
+            leg = approved[i]
+            tth = leg.get("time_to_hedge")
+            largest.append({
+                "symbol": leg["symbol"],
+                "usd_notional": round(leg["usd_notional"], 2) if math.isfinite(leg["usd_notional"]) else None,
+                "delta": leg["delta"],
+                "status": leg["status"],
+                "time_to_hedge": None if tth is None else round(tth, 3),
+                "waiting": None if tth is not None else round(now - self._pending_since[leg["symbol"]], 3),
+            })
+        execution = {"approved": len(approved), "sent": len(send), "queued": len(queued), "largest": largest}
+
+        timings = {
+            "decide_to_send_ms": round((t_send - t_decide) * 1000, 2),
+            "send_ms": round((t_sent - t_send) * 1000, 2),
+            "read_to_sent_ms": round((t_sent - t_read) * 1000, 2),
+            "cycle_ms": round((time.monotonic() - t_read) * 1000, 2),
+        }
 
         return {
-            "usd_rows": gui_usd_rows,
+            "usd_rows": rows,
             "pair_rows": pair_rows,
-            "trades_executed": trades_executed
+            "trades_executed": trades_executed,
+            "carried_legs": carried,
+            "risk": risk_summary,
+            "execution": execution,
+            "residual_usd": {c: round(v, 2) for c, v in sorted(residual_usd.items(), key=lambda kv: -abs(kv[1]))
+                             if abs(v) >= 0.005},
+            "timings": timings,
+            "breakers": self.breakers.snapshot(),
+            "order_rate": self.term.rate_limiter.stats() if self._rate_limited else None,
+            "journal": self.journal_report,
+            "reporting": self.reporting.stats() if self.reporting is not None else None,
+            "derived_prices": {s: {"mid": q.mid, "source": q.source, "age": q.age}
+                               for s, q in self._prices.derived().items()},
+            "stale_prices": (self.price_feed.table.stale(self.price_feed.stale_seconds)
+                             if self.price_feed is not None else []),
         }
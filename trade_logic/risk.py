@@ -0,0 +1,261 @@
+"""
+Portfolio-level pre-trade risk stage.
+
+All legs proposed in a cycle are evaluated together, once, before any order
+goes out:
+- projected gross/net USD exposure per currency (from the whole current book,
+  including symbols with no leg this cycle, plus the delta lots)
+- projected margin (margin already in use plus the increase, from a
+  margin-per-lot table cached per symbol)
+- per-currency net caps, portfolio gross cap, margin cap
+
+Legs that increase a breached exposure are scaled down (or rejected) as a
+batch, so risk adds no per-order latency and cannot be bypassed by sending
+orders in a particular sequence. Legs that reduce exposure always pass.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+import time
+
+import numpy as np
+import MetaTrader5 as mt5
+
+# limits are parsed with the rest of the config; re-exported for callers of this module
+from config.snapshot import RiskLimits
+
+
+# -------------------- margin table --------------------
+
+class MarginTable:
+    """
+    Margin-per-lot (account currency) cached per symbol.
+    Uses terminal `order_calc_margin` once per symbol per `ttl` seconds; falls
+    back to USD notional / account leverage when the terminal can't answer.
+    """
+
+    def __init__(self, terminal, symbol_map: Mapping[str, str], ttl: float = 3600.0):
+        self.term = terminal
+        self._map = symbol_map
+        self.ttl = float(ttl)
+        self._cache: Dict[str, tuple[float, float]] = {}  # symbol -> (margin_per_lot, ts)
+
+    def _leverage(self) -> float:
+        try:
+            ai = self.term.account_info()
+            lev = float(getattr(ai, "leverage", 0) or 0)
+            return lev if lev > 0 else 100.0
+        except Exception:
+            return 100.0
+
+    def per_lot(self, symbols: Sequence[str], prices: np.ndarray, usd_notional_per_lot: np.ndarray) -> np.ndarray:
+        now = time.time()
+        out = np.empty(len(symbols), dtype="float64")
+        leverage = None
+        for i, sym in enumerate(symbols):
+            hit = self._cache.get(sym)
+            if hit is not None and now - hit[1] < self.ttl:
+                out[i] = hit[0]
+                continue
+            val = None
+            try:
+                val = self.term.order_calc_margin(mt5.ORDER_TYPE_BUY, self._map.get(sym, sym), 1.0, float(prices[i]))
+            except Exception:
+                val = None
+            if not val or not np.isfinite(val) or val <= 0:
+                if leverage is None:
+                    leverage = self._leverage()
+                val = float(usd_notional_per_lot[i]) / leverage if np.isfinite(usd_notional_per_lot[i]) else 0.0
+            self._cache[sym] = (float(val), now)
+            out[i] = val
+        return out
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+
+
+# -------------------- result --------------------
+
+@dataclass
+class RiskVerdict:
+    """Struct-of-arrays result; index i refers to the i-th evaluated leg."""
+    symbols: List[str]
+    scale: np.ndarray
+    approved_delta: np.ndarray
+    reasons: List[Optional[str]]
+    currency_net_usd: Dict[str, float]
+    currency_gross_usd: Dict[str, float]
+    gross_usd: float
+    projected_margin: float
+
+    def summary(self) -> dict:
+        return {
+            "currency_net_usd": {k: round(v, 2) for k, v in self.currency_net_usd.items()},
+            "currency_gross_usd": {k: round(v, 2) for k, v in self.currency_gross_usd.items()},
+            "gross_usd": round(self.gross_usd, 2),
+            "projected_margin": round(self.projected_margin, 2),
+            "scaled_legs": int(np.sum((self.scale < 1.0) & (self.approved_delta != 0))),
+            "rejected_legs": int(sum(1 for r in self.reasons if r and r.startswith("Risk: rejected"))),
+        }
+
+
+def _floor_to_step(x: np.ndarray, step: np.ndarray) -> np.ndarray:
+    """Vectorized utils.round_down_to_step (sign-preserving floor, tolerant of 1.9999… products)."""
+    ax = np.abs(x)
+    safe = np.where(step > 0, step, 1.0)
+    units = np.floor(ax / safe + 1e-9) * safe
+    val = np.where(step > 0, np.where(ax < step, 0.0, units), ax)
+    return np.where(x >= 0, val, -val)
+
+
+# -------------------- evaluator --------------------
+
+class PreTradeRisk:
+    def __init__(self, limits: RiskLimits, margin_table: MarginTable,
+                 contract_size_fn: Callable[[str], float],
+                 currency_to_usd_pair: Mapping[str, str]):
+        self.limits = limits
+        self.margins = margin_table
+        self._cs = contract_size_fn
+        self._c2u = currency_to_usd_pair
+
+    @staticmethod
+    def _usd_rates(ccys: Sequence[str], mids: Mapping[str, Optional[float]],
+                   c2u: Mapping[str, str], legs: Sequence[str]) -> np.ndarray:
+        """USD value of one unit of each currency; NaN when no route to USD is priced."""
+        rates = np.full(len(ccys), np.nan)
+        for j, c in enumerate(ccys):
+            if c == "USD":
+                rates[j] = 1.0
+                continue
+            candidates = [c2u.get(c)] + [s for s in legs if s in (c + "USD", "USD" + c)]
+            for pair in candidates:
+                mid = mids.get(pair) if pair else None
+                if mid and mid > 0:
+                    rates[j] = mid if pair.startswith(c) else 1.0 / mid
+                    break
+        return rates
+
+    def usd_notional_per_lot(self, symbols: Sequence[str], mids: Mapping[str, Optional[float]]) -> np.ndarray:
+        """USD notional of one lot (base side) per symbol; NaN when the base has no priced route to USD."""
+        syms = [str(s).upper() for s in symbols]
+        bases = [s[:3] for s in syms]
+        rates = self._usd_rates(bases, mids, self._c2u, syms)
+        cs = np.array([self._cs(s) for s in syms], dtype="float64")
+        return cs * rates
+
+    def evaluate(self, symbols: Sequence[str], current_pos: Sequence[float], deltas: Sequence[float],
+                 min_lots: Sequence[float], mids: Mapping[str, Optional[float]],
+                 equity: Optional[float] = None, held: Optional[Mapping[str, float]] = None,
+                 margin_used: Optional[float] = None) -> RiskVerdict:
+        """
+        held: net lots of positions in symbols without a leg here (the rest of
+        the book); they count towards every cap but are never scaled.
+        margin_used: account margin in use now; projected margin is this, less
+        what reducing legs free, plus what increasing legs add. Without it,
+        margin is re-estimated from the margin table for the whole book.
+        """
+        held = {s: float(v) for s, v in (held or {}).items() if v}
+        n = len(symbols)
+        syms = [str(s).upper() for s in symbols] + [str(s).upper() for s in held]
+        m = len(syms)
+        cur = np.concatenate([np.asarray(current_pos, dtype="float64"), np.fromiter(held.values(), float, len(held))])
+        dlt = np.concatenate([np.asarray(deltas, dtype="float64"), np.zeros(len(held))])
+        step = np.asarray(min_lots, dtype="float64")
+        proj = cur + dlt
+
+        bases = [s[:3] for s in syms]
+        quotes = [s[3:6] if len(s) >= 6 else "USD" for s in syms]
+        ccys = sorted(set(bases) | set(quotes))
+        col = {c: j for j, c in enumerate(ccys)}
+        px = np.array([mids.get(s) or np.nan for s in syms], dtype="float64")
+        cs = np.array([self._cs(s) for s in syms], dtype="float64")
+
+        # units per lot, legs x currencies: base +cs, quote -cs*mid
+        A = np.zeros((m, len(ccys)))
+        A[np.arange(m), [col[b] for b in bases]] += cs
+        A[np.arange(m), [col[q] for q in quotes]] -= cs * np.nan_to_num(px)
+
+        rates = self._usd_rates(ccys, mids, self._c2u, syms)
+        rates_z = np.nan_to_num(rates)
+        usd_per_lot = A * rates_z                     # signed USD per lot, per currency
+        notional = np.abs(cs * rates_z[[col[b] for b in bases]])  # USD notional per lot (base side)
+
+        net_proj = proj @ usd_per_lot
+        gross_ccy = np.abs(proj[:, None] * usd_per_lot).sum(axis=0)
+        gross_proj = float(np.sum(np.abs(proj) * notional))
+
+        scale = np.ones(m)
+        binding: List[Optional[str]] = [None] * m
+
+        def _apply(leg_scale: np.ndarray, mask: np.ndarray, label: str):
+            tighter = mask & (leg_scale < scale)
+            for i in np.nonzero(tighter)[0]:
+                binding[i] = label
+            np.minimum(scale, np.where(mask, leg_scale, 1.0), out=scale)
+
+        # --- per-currency net caps ---
+        caps = np.array([np.inf if c == "USD" else self.limits.currency_cap(c) for c in ccys])
+        contrib = dlt[:, None] * usd_per_lot          # USD delta per leg per currency
+        sgn = np.sign(net_proj)
+        adverse = (contrib * sgn) > 0
+        breached = (np.abs(net_proj) > caps) & np.isfinite(rates)
+        if breached.any():
+            adverse_sum = np.where(adverse, contrib * sgn, 0.0).sum(axis=0)
+            base = np.abs(net_proj) - adverse_sum
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ccy_scale = np.clip((caps - base) / adverse_sum, 0.0, 1.0)
+            for j in np.nonzero(breached)[0]:
+                _apply(np.full(m, ccy_scale[j]), adverse[:, j], f"{ccys[j]} net cap")
+
+        # --- portfolio gross + margin caps (apply to risk-increasing legs) ---
+        increasing = np.abs(proj) > np.abs(cur) + 1e-12
+        inc_lots = np.where(increasing, np.abs(proj) - np.abs(cur), 0.0)
+        freed_lots = np.clip(np.abs(cur) - np.abs(proj), 0.0, None)
+
+        def _portfolio_cap(per_lot: np.ndarray, cap: Optional[float], label: str,
+                           in_use: Optional[float] = None) -> float:
+            inc = float(np.sum(inc_lots * per_lot))
+            if in_use is None:
+                existing = float(np.sum(np.abs(proj) * per_lot)) - inc
+            else:
+                existing = max(0.0, float(in_use) - float(np.sum(freed_lots * per_lot)))
+            total = existing + inc
+            if cap is None or total <= cap or not increasing.any():
+                return total
+            s = 0.0 if inc <= 0 else min(1.0, max(0.0, (cap - existing) / inc))
+            _apply(np.full(m, s), increasing, label)
+            return total
+
+        _portfolio_cap(notional, self.limits.max_gross_usd_exposure, "gross cap")
+
+        margin_cap = self.limits.max_projected_margin
+        if self.limits.max_margin_pct_of_equity is not None and equity:
+            pct_cap = float(equity) * self.limits.max_margin_pct_of_equity
+            margin_cap = pct_cap if margin_cap is None else min(margin_cap, pct_cap)
+        margin_per_lot = self.margins.per_lot(syms, np.nan_to_num(px), notional)
+        projected_margin = _portfolio_cap(margin_per_lot, margin_cap, "margin cap", margin_used)
+
+        scale, dlt = scale[:n], dlt[:n]
+        approved = np.where(scale < 1.0, _floor_to_step(dlt * scale, step), dlt)
+        reasons: List[Optional[str]] = []
+        for i in range(n):
+            if binding[i] is None:
+                reasons.append(None)
+            elif approved[i] == 0.0:
+                reasons.append(f"Risk: rejected ({binding[i]})")
+            else:
+                reasons.append(f"Risk: scaled {scale[i]:.2f} ({binding[i]})")
+
+        return RiskVerdict(
+            symbols=list(symbols),
+            scale=scale,
+            approved_delta=approved,
+            reasons=reasons,
+            currency_net_usd={c: float(net_proj[j]) for j, c in enumerate(ccys) if np.isfinite(rates[j])},
+            currency_gross_usd={c: float(gross_ccy[j]) for j, c in enumerate(ccys) if np.isfinite(rates[j])},
+            gross_usd=gross_proj,
+            projected_margin=projected_margin,
+        )
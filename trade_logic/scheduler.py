@@ -0,0 +1,108 @@
+"""
+Deadline-based cycle scheduler.
+
+Cycles start on a fixed grid (t0, t0 + period, t0 + 2*period, ...) instead
+of `period` seconds after the previous cycle finished, so the real period
+does not stretch by the cycle's duration. A cycle that runs past the next
+tick is handled by the overrun policy:
+
+    skip       drop the missed ticks, resume at the next future tick
+    coalesce   run one catch-up cycle now for all missed ticks, then resume on the grid
+    immediate  run every missed tick back-to-back until caught up
+
+Cycles longer than `budget` (default: one period) are counted as over budget;
+a running cycle is never interrupted.
+
+    sched = CycleScheduler(120, policy="skip")
+    while True:
+        out = sched.step(engine.cycle)
+        time.sleep(sched.delay())
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Optional
+
+OVERRUN_POLICIES = ("skip", "coalesce", "immediate")
+
+
+@dataclass
+class SchedulerMetrics:
+    cycles: int = 0
+    late: int = 0           # cycles that started after their tick
+    skipped: int = 0        # ticks dropped by the skip policy
+    coalesced: int = 0      # ticks merged into a catch-up cycle
+    over_budget: int = 0    # cycles that ran longer than the budget
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    last_lateness: float = 0.0
+    max_lateness: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {k: (round(v, 4) if isinstance(v, float) else v) for k, v in asdict(self).items()}
+
+
+class CycleScheduler:
+    def __init__(self, period: float, *, budget: Optional[float] = None, policy: str = "skip",
+                 late_tolerance: float = 0.05, clock: Callable[[], float] = time.monotonic):
+        """
+        period: seconds between cycle starts
+        budget: seconds a cycle may take before it is counted as over budget (default: period)
+        late_tolerance: start delay (seconds) not counted as late, to absorb timer jitter
+        """
+        if period <= 0:
+            raise ValueError(f"period must be > 0, got {period!r}")
+        if policy not in OVERRUN_POLICIES:
+            raise ValueError(f"overrun policy must be one of {OVERRUN_POLICIES}, got {policy!r}")
+        self.period = float(period)
+        self.budget = float(budget) if budget else self.period
+        self.policy = policy
+        self.late_tolerance = float(late_tolerance)
+        self._clock = clock
+        self._next: Optional[float] = None
+        self.metrics = SchedulerMetrics()
+
+    def delay(self) -> float:
+        """Seconds to wait before the next cycle should start (0 when it is due)."""
+        if self._next is None:
+            return 0.0
+        return max(0.0, self._next - self._clock())
+
+    def step(self, fn: Callable[[], object]):
+        """Run one cycle now and schedule the next tick. Exceptions propagate after accounting."""
+        start = self._clock()
+        if self._next is None:
+            self._next = start
+        scheduled = self._next
+        m = self.metrics
+        m.last_lateness = max(0.0, start - scheduled)
+        if m.last_lateness > self.late_tolerance:
+            m.late += 1
+            m.max_lateness = max(m.max_lateness, m.last_lateness)
+        try:
+            return fn()
+        finally:
+            end = self._clock()
+            m.cycles += 1
+            m.last_duration = end - start
+            m.max_duration = max(m.max_duration, m.last_duration)
+            if m.last_duration > self.budget:
+                m.over_budget += 1
+            self._schedule_after(scheduled, end)
+
+    def _schedule_after(self, scheduled: float, end: float) -> None:
+        nxt = scheduled + self.period
+        if end <= nxt:
+            self._next = nxt
+            return
+        missed = int((end - nxt) // self.period) + 1  # ticks whose start time has passed
+        if self.policy == "skip":
+            self.metrics.skipped += missed
+            self._next = nxt + missed * self.period
+        elif self.policy == "coalesce":
+            self.metrics.coalesced += missed - 1
+            self._next = nxt + (missed - 1) * self.period
+        else:  # immediate
+            self._next = nxt
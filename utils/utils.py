@@ -18,12 +18,13 @@ Notes:
 from __future__ import annotations
 
 import math
-from typing import Callable, List, Tuple
-
-import pandas as pd
+from typing import TYPE_CHECKING, Callable, List, Tuple
 
 from config import CONFIG, SYMBOL_CONFIG
 
+if TYPE_CHECKING:  # annotations only; callers hand in their own DataFrame
+    import pandas as pd
+
 
 # -------------------- Numeric helpers --------------------
 